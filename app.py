@@ -1,6 +1,9 @@
 from src import create_app, socketio
 
+import os
+
 app = create_app()
 
 if __name__ == '__main__':
-    socketio.run(app, debug=True, port=5001)
\ No newline at end of file
+    socketio.run(app, debug=os.environ.get('FLASK_DEBUG', '1') == '1',
+                 host=os.environ.get('HOST', '127.0.0.1'), port=int(os.environ.get('PORT', 5001)))
\ No newline at end of file
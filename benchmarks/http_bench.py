@@ -0,0 +1,266 @@
+"""
+HTTP benchmark for the auth, catalog and watch endpoints.
+
+Drives the Flask app in-process through its test client, so the numbers cover the view, template,
+bcrypt and database cost of each route without the WSGI server. Every database handle the app opens
+goes through a query counter (the DATABASE_FACTORY hook of src.open_database), which gives the
+number of queries per request.
+
+Routes:
+    POST /login                           Valid credentials of the seeded benchmark user.
+    POST /signup                          A new user per request.
+    GET  /videostream/available_movies    The movie catalog.
+    GET  /videostream/watch/<access_code> A valid access code of the seeded movie.
+
+The database is the Postgres configured by PSQL_HOST, PSQL_USER and PSQL_PASSWORD. Pass --load-schema
+on an empty database to create the tables from schema.sql. The benchmark user, movie and access code
+are created on start, and every bench_ user is deleted on exit unless --keep-data is given.
+With --backend memory the app runs on an InMemoryDatabase created from schema.sql instead, which needs
+no server and isolates the application cost from the database round trips.
+
+Usage:
+    python benchmarks/http_bench.py --requests 200 --json http_bench.json
+    python benchmarks/http_bench.py --cold --bcrypt-rounds 4 --json http_bench_cold.json
+    python benchmarks/http_bench.py --backend memory --json http_bench_memory.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BENCH_PASSWORD = 'benchmark-password'
+BENCH_MOVIE_PATH = '/static/movies/bench/master.m3u8'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the auth, catalog and watch endpoints.")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per route (default: 200).")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per route first (default: 10).")
+    parser.add_argument("--routes", default="login,signup,available_movies,watch",
+                        help="Comma separated routes to run (default: login,signup,available_movies,watch).")
+    parser.add_argument("--cold", action="store_true", help="Clear the access code and catalog caches before every request.")
+    parser.add_argument("--bcrypt-rounds", type=int, help="BCRYPT_LOG_ROUNDS for the run (default: the app setting).")
+    parser.add_argument("--backend", choices=("postgres", "memory"), default="postgres",
+                        help="Database the app runs on (default: postgres).")
+    parser.add_argument("--load-schema", action="store_true", help="Create the tables from schema.sql first.")
+    parser.add_argument("--keep-data", action="store_true", help="Keep the bench_ users and their access codes.")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    return parser.parse_args()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class QueryCounter:
+    """
+    Wraps the database handles opened by the app and counts the queries they run.
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.queries = 0
+
+    def __call__(self):
+        return CountingDatabase(self.factory(), self)
+
+
+class CountingDatabase:
+    def __init__(self, database, counter):
+        self.database = database
+        self.counter = counter
+
+    def execute_query(self, query, params=None, **kwargs):
+        self.counter.queries += 1
+        return self.database.execute_query(query, params, **kwargs)
+
+    def execute_prepared(self, name, query, params=None, **kwargs):
+        self.counter.queries += 1
+        return self.database.execute_prepared(name, query, params, **kwargs)
+
+    def commit(self):
+        self.database.commit()
+
+    def rollback(self):
+        self.database.rollback()
+
+    def close(self):
+        self.database.close()
+
+
+def load_schema(database):
+    with open(os.path.join(ROOT, 'schema.sql')) as f:
+        database.execute_query(f.read(), fetch=None)
+    database.commit()
+
+
+def seed(app, open_database):
+    """
+    Creates the benchmark user, a movie if the table is empty, and a valid access code.
+
+    Returns:
+        tuple: The username and the access code.
+    """
+    from src.CodeManage import CodeManage
+    from src.DBMS import DBMS
+
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+
+    with app.app_context():
+        db = DBMS(open_database())
+        statement, user = db.register_user(username, BENCH_PASSWORD)
+
+        if statement is False:
+            sys.exit(f"Could not create the benchmark user: {user}")
+
+        movie = db.database.execute_query("SELECT movie_id FROM movies LIMIT 1", fetch='one')
+
+        if movie is None:
+            movie = db.database.execute_query(
+                "INSERT INTO movies (movie_title, movie_path, movie_thumbnail) VALUES (%s, %s, %s) RETURNING movie_id",
+                ('Benchmark', BENCH_MOVIE_PATH, ''), fetch='one')
+            db.database.commit()
+
+        db.close_connection()
+
+        with CodeManage(open_database()) as code_manager:
+            statement, access_code = code_manager.generate_access_code(json.loads(user)['user_id'], movie[0],
+                                                                       datetime.utcnow() + timedelta(days=1))
+
+    if statement is False:
+        sys.exit("Could not create the benchmark access code.")
+
+    return username, access_code
+
+
+def cleanup(app, open_database):
+    with app.app_context():
+        database = open_database()
+        database.execute_query(
+            "DELETE FROM access_codes WHERE user_id IN (SELECT user_id FROM users WHERE username LIKE 'bench\\_%')", fetch=None)
+        database.execute_query("DELETE FROM users WHERE username LIKE 'bench\\_%'", fetch=None)
+        database.commit()
+        database.close()
+
+
+def run_route(request, count, warmup, counter, reset):
+    for index in range(warmup):
+        reset()
+        request(f"w{index}")
+
+    latencies = []
+    statuses = {}
+    queries = counter.queries
+
+    started = time.perf_counter()
+    for index in range(count):
+        reset()
+        request_started = time.perf_counter()
+        status = request(str(index))
+        latencies.append(time.perf_counter() - request_started)
+        statuses[status] = statuses.get(status, 0) + 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        'requests': count,
+        'requests_per_s': round(count / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 3),
+            'p90': round(percentile(latencies, 0.90) * 1000, 3),
+            'p99': round(percentile(latencies, 0.99) * 1000, 3),
+            'mean': round(statistics.fmean(latencies) * 1000, 3),
+        },
+        'db_queries_per_request': round((counter.queries - queries) / count, 2),
+        'status_codes': {str(status): total for status, total in sorted(statuses.items())},
+    }
+
+
+def main():
+    args = parse_args()
+
+    os.environ.setdefault('FLASK_SECRET', 'benchmark')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    if args.bcrypt_rounds is not None:
+        os.environ['BCRYPT_LOG_ROUNDS'] = str(args.bcrypt_rounds)
+
+    from src import create_app, open_database, password_hasher, db_pool
+    from src.DBInterfaces import InMemoryDatabase, PooledPostgresDatabase
+    from src.CodeManage import CodeManage
+    from src.Movies import catalog
+
+    app = create_app()
+
+    if args.backend == 'memory':
+        app.config['DATABASE_FACTORY'] = base_factory = InMemoryDatabase
+        InMemoryDatabase().load_schema(os.path.join(ROOT, 'schema.sql'))
+    else:
+        base_factory = lambda: PooledPostgresDatabase(db_pool)
+
+    counter = QueryCounter(base_factory)
+
+    if args.load_schema and args.backend == 'postgres':
+        with app.app_context():
+            database = open_database()
+            load_schema(database)
+            database.close()
+
+    username, access_code = seed(app, open_database)
+    app.config['DATABASE_FACTORY'] = counter
+
+    def reset():
+        if args.cold:
+            CodeManage.cache.clear()
+            catalog.invalidate()
+
+    client = app.test_client()
+    client.post('/login', data={'username': username, 'password': BENCH_PASSWORD})
+    run_id = uuid.uuid4().hex[:6]
+
+    routes = {
+        'login': lambda i: app.test_client().post('/login', data={'username': username, 'password': BENCH_PASSWORD}).status_code,
+        'signup': lambda i: app.test_client().post('/signup', data={'username': f"bench_{run_id}{i}", 'password1': BENCH_PASSWORD,
+                                                                     'password2': BENCH_PASSWORD}).status_code,
+        'available_movies': lambda i: client.get('/videostream/available_movies').status_code,
+        'watch': lambda i: client.get(f'/videostream/watch/{access_code}').status_code,
+    }
+
+    selected = [route.strip() for route in args.routes.split(',') if route.strip()]
+    unknown = set(selected) - set(routes)
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(sorted(unknown))}")
+
+    try:
+        results = {
+            'meta': {
+                'python': platform.python_version(),
+                'backend': args.backend,
+                'bcrypt_log_rounds': password_hasher.log_rounds,
+                'db_pool_size': app.extensions['db_pool'].max_size,
+                'cold_caches': args.cold,
+                'warmup': args.warmup,
+            },
+            'routes': {name: run_route(routes[name], args.requests, args.warmup, counter, reset) for name in selected},
+        }
+
+    finally:
+        app.config['DATABASE_FACTORY'] = base_factory
+        if not args.keep_data:
+            cleanup(app, open_database)
+
+    print(json.dumps(results, indent=2))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
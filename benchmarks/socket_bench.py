@@ -0,0 +1,187 @@
+"""
+Socket.IO load benchmark for the /StreamManager namespace.
+
+Starts the app in a subprocess and connects ROOMS x CLIENTS python-socketio clients. In every room one
+client sends sync_command at --rate per second while the others send report_current_time, and every
+client measures the fan-out latency of the sync_action it receives.
+
+The socket events never touch the database, so no Postgres is needed.
+
+Usage:
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/socket_bench.py --rooms 10 --clients 10 --duration 20 --json socket_bench.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import socketio
+
+NAMESPACE = '/StreamManager'
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark StreamManager fan-out latency and throughput.")
+    parser.add_argument("--rooms", type=int, default=10, help="Number of rooms (default: 10).")
+    parser.add_argument("--clients", type=int, default=10, help="Clients per room (default: 10).")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load (default: 20).")
+    parser.add_argument("--rate", type=float, default=2, help="sync_command per second per room (default: 2).")
+    parser.add_argument("--report-rate", type=float, default=1, help="report_current_time per second per client (default: 1).")
+    parser.add_argument("--port", type=int, default=5901, help="Port of the app under test (default: 5901).")
+    parser.add_argument("--json", help="Write the results to this JSON file.")
+    return parser.parse_args()
+
+
+def rss_kib(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def start_server(port):
+    env = dict(os.environ, PORT=str(port), FLASK_DEBUG='0', LOG_LEVEL='WARNING')
+    env.setdefault('FLASK_SECRET', 'benchmark')
+    server = subprocess.Popen([sys.executable, "app.py"], cwd=ROOT, env=env)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/socket.io/?EIO=4&transport=polling", timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.terminate()
+    sys.exit("The app did not start.")
+
+
+class BenchClient:
+    lock = threading.Lock()
+
+    def __init__(self, url, room, latencies, counters):
+        self.room = room
+        self.latencies = latencies
+        self.counters = counters
+        self.client = socketio.Client(reconnection=False)
+        self.client.on('sync_action', self.on_sync_action, namespace=NAMESPACE)
+        self.client.connect(url, namespaces=[NAMESPACE], transports=['websocket'])
+        self.client.emit('join', {'session_code': room}, namespace=NAMESPACE)
+
+    def on_sync_action(self, data):
+        sent = data.get('bench_sent')
+        if sent is not None:
+            self.latencies.append(time.perf_counter() - sent)
+        with self.lock:
+            self.counters['received'] += 1
+
+    def emit(self, event, data):
+        self.client.emit(event, dict(data, session_code=self.room), namespace=NAMESPACE)
+        with self.lock:
+            self.counters['sent'] += 1
+
+
+def drive_room(clients, args, stop):
+    sender, others = clients[0], clients[1:]
+    seq = 0
+    next_sync = next_report = time.perf_counter()
+    report_interval = 1 / args.report_rate if args.report_rate else float('inf')
+
+    while not stop.is_set():
+        now = time.perf_counter()
+
+        if now >= next_sync:
+            sender.emit('sync_command', {'action': 'play' if seq % 2 == 0 else 'pause', 'currentTime': float(seq),
+                                         'seq': seq, 'bench_sent': time.perf_counter()})
+            seq += 1
+            next_sync += 1 / args.rate
+
+        if now >= next_report:
+            for client in others:
+                client.emit('report_current_time', {'currentTime': float(seq)})
+            next_report += report_interval
+
+        time.sleep(max(0.0, min(next_sync, next_report) - time.perf_counter()))
+
+
+def main():
+    args = parse_args()
+    url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port)
+
+    try:
+        rss_before = rss_kib(server.pid)
+        latencies = []
+        counters = {'sent': 0, 'received': 0}
+
+        rooms = []
+        for room_index in range(args.rooms):
+            room = f"bench-{room_index}"
+            rooms.append([BenchClient(url, room, latencies, counters) for _ in range(args.clients)])
+
+        connections = args.rooms * args.clients
+        time.sleep(1)
+        rss_after = rss_kib(server.pid)
+
+        stop = threading.Event()
+        drivers = [threading.Thread(target=drive_room, args=(clients, args, stop)) for clients in rooms]
+        started = time.perf_counter()
+        for driver in drivers:
+            driver.start()
+
+        time.sleep(args.duration)
+        stop.set()
+        for driver in drivers:
+            driver.join()
+        time.sleep(1)  # Let the last coalesced relays arrive.
+        elapsed = time.perf_counter() - started
+
+        for clients in rooms:
+            for client in clients:
+                client.client.disconnect()
+
+        results = {
+            'rooms': args.rooms,
+            'clients_per_room': args.clients,
+            'connections': connections,
+            'duration_s': round(elapsed, 3),
+            'events_sent': counters['sent'],
+            'events_received': counters['received'],
+            'events_per_s': round((counters['sent'] + counters['received']) / elapsed, 1),
+            'fanout_latency_ms': {
+                'p50': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+                'p99': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+                'mean': round(statistics.fmean(latencies) * 1000, 3) if latencies else None,
+            },
+            'server_rss_kib': {'idle': rss_before, 'connected': rss_after},
+            'memory_per_connection_kib': round((rss_after - rss_before) / connections, 2),
+        }
+
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(json.dumps(results, indent=2))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
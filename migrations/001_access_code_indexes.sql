@@ -0,0 +1,16 @@
+-- Indexes for the access_codes table.
+--
+-- (user_id, expires_at) serves the per-user live code count ("user_id = $1 AND expires_at > now()") as a
+-- range scan, and also every lookup by user_id alone, so no separate user_id index is needed.
+-- movie_id backs the foreign key, so deleting or updating a movie does not scan the table.
+-- expires_at serves the expiry purge ("expires_at <= now() LIMIT n").
+--
+-- A partial index on unexpired codes ("WHERE expires_at > now()") is not possible: index predicates
+-- must be immutable and now() is not. The purge keeps expired rows few instead, so the full indexes
+-- stay close to the size a partial one would have.
+--
+-- On a large, busy table, run these by hand with CREATE INDEX CONCURRENTLY instead; the migrate
+-- command runs inside a transaction, where CONCURRENTLY is not allowed.
+CREATE INDEX IF NOT EXISTS access_codes_user_id_expires_at_idx ON access_codes (user_id, expires_at);
+CREATE INDEX IF NOT EXISTS access_codes_movie_id_idx ON access_codes (movie_id);
+CREATE INDEX IF NOT EXISTS access_codes_expires_at_idx ON access_codes (expires_at);
@@ -0,0 +1,9 @@
+-- Revoked signed access tokens (ACCESS_CODE_MODE=signed).
+--
+-- Tokens are verified without a query, so revoking one records its nonce here until it expires.
+-- Workers reload the unexpired nonces every ACCESS_TOKEN_REVOCATION_REFRESH seconds, and the expired
+-- access code purge also deletes the expired rows.
+CREATE TABLE IF NOT EXISTS revoked_access_tokens (
+    nonce VARCHAR(32) PRIMARY KEY,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
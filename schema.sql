@@ -23,4 +23,15 @@ CREATE TABLE access_codes (
     user_id UUID REFERENCES users(user_id),
     created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT (NOW() AT TIME ZONE 'UTC'),
     expires_at TIMESTAMP WITH TIME ZONE
-);
\ No newline at end of file
+);
+
+-- Access code lookups by user, movie and expiry. See migrations/001_access_code_indexes.sql.
+CREATE INDEX IF NOT EXISTS access_codes_user_id_expires_at_idx ON access_codes (user_id, expires_at);
+CREATE INDEX IF NOT EXISTS access_codes_movie_id_idx ON access_codes (movie_id);
+CREATE INDEX IF NOT EXISTS access_codes_expires_at_idx ON access_codes (expires_at);
+
+-- Revoked signed access tokens, kept until the token expires. See migrations/002_revoked_access_tokens.sql.
+CREATE TABLE IF NOT EXISTS revoked_access_tokens (
+    nonce VARCHAR(32) PRIMARY KEY,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
@@ -1,69 +1,334 @@
+import argparse
+import json
 import os
 import subprocess
 import sys
+import tempfile
 
 
-print("Installing Python Dependencies...")
-subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+# Rendition ladder: height -> encoding settings. Width follows the source aspect ratio.
+LADDER = {
+    1080: {'video_bitrate': '5000k', 'audio_bitrate': '192k', 'profile': 'high', 'level': '4.0'},
+    720: {'video_bitrate': '2800k', 'audio_bitrate': '128k', 'profile': 'high', 'level': '3.1'},
+    480: {'video_bitrate': '1400k', 'audio_bitrate': '128k', 'profile': 'main', 'level': '3.0'},
+    360: {'video_bitrate': '800k', 'audio_bitrate': '96k', 'profile': 'main', 'level': '3.0'},
+    144: {'video_bitrate': '95k', 'audio_bitrate': '64k', 'profile': 'baseline', 'level': '3.0'},
+}
+DEFAULT_LADDER = "1080,720,480,360,144"
+SEGMENT_SECONDS = 10
+COMPLETE_MARKER = ".complete"
 
-movie_path = input("Enter the path to your movie: ")
+# ffprobe profile name -> (profile_idc, constraint flags) for the RFC 6381 avc1 codecs string.
+H264_PROFILES = {
+    'Baseline': (0x42, 0x00),
+    'Constrained Baseline': (0x42, 0xE0),
+    'Main': (0x4D, 0x40),
+    'High': (0x64, 0x00),
+}
+AAC_OBJECT_TYPES = {
+    'LC': 2,
+    'HE-AAC': 5,
+    'HE-AACv2': 29,
+}
 
-print("Converting video to HLS format...")
-movie_name = os.path.basename(movie_path).replace(".mp4", "")
 
-movie_dir = os.path.join("src/static/movies", movie_name)
-os.makedirs(movie_dir, exist_ok=True)
+def parse_args():
+    parser = argparse.ArgumentParser(description="Install dependencies and convert a movie to an HLS ABR ladder.")
+    parser.add_argument("movie_path", nargs="?", help="Path to the mp4 movie to convert.")
+    parser.add_argument("--ladder", default=DEFAULT_LADDER,
+                        help=f"Comma separated rendition heights, from {sorted(LADDER)} (default: {DEFAULT_LADDER}).")
+    parser.add_argument("--force", action="store_true", help="Re-encode renditions that already completed.")
+    parser.add_argument("--skip-install", action="store_true", help="Do not install the Python dependencies.")
+    parser.add_argument("--master-only", action="store_true", help="Only regenerate master.m3u8 from the encoded renditions.")
+    return parser.parse_args()
 
-low_dir = os.path.join(movie_dir, "low")
-high_dir = os.path.join(movie_dir, "high")
-
-os.makedirs(low_dir, exist_ok=True)
-os.makedirs(high_dir, exist_ok=True)
 
 def get_movie_resolution(movie_path):
     result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0', movie_path], capture_output=True, text=True)
     resolution = result.stdout.strip()
     return resolution
 
-movie_resolution = get_movie_resolution(movie_path)
-print(f"Converting video to HLS format ({movie_resolution})...")
-
-def convert_to_resolution(movie_path, output_resolution, output_path):
-    subprocess.call([
-        'ffmpeg', '-i', movie_path,
-        '-vf', f'scale={output_resolution}',
-        '-c:v', 'libx264', '-profile:v', 'high', '-level', '4.0', '-b:v', '5000k',
-        '-c:a', 'aac', '-b:a', '192k',
-        '-start_number', '0',
-        '-hls_time', '10',
-        '-hls_list_size', '0',
-        '-f', 'hls', output_path
-    ])
-
-output_path = f'src/static/movies/{movie_name}/high/output.m3u8'
-convert_to_resolution(movie_path, movie_resolution, output_path)
-
-print("Converting video to HLS format (144p)...")
-subprocess.call([
-    'ffmpeg', '-i', movie_path,
-    '-c:v', 'libx264', '-profile:v', 'baseline', '-level', '3.0', '-b:v', '95k',
-    '-c:a', 'aac', '-b:a', '64k',
-    '-s', '256x144',
-    '-start_number', '0',
-    '-hls_time', '10',
-    '-hls_list_size', '0',
-    '-f', 'hls', f'src/static/movies/{movie_name}/low/output.m3u8'
-])
-
-print("Creating HLS master.m3u8 file...")
-with open(f"src/static/movies/{movie_name}/master.m3u8", 'a+') as f:
-    text = """#EXTM3U
-#EXT-X-STREAM-INF:BANDWIDTH=4000000,AVERAGE-BANDWIDTH=4000000,RESOLUTION=1920x1080,CODECS="avc1.640028,mp4a.40.2"
-high/output.m3u8
-#EXT-X-STREAM-INF:BANDWIDTH=500000,AVERAGE-BANDWIDTH=500000,RESOLUTION=256x144,CODECS="avc1.42001E,mp4a.40.2"
-low/output.m3u8"""
-    f.write(text)
-
-print("Installation completed successfully!")
-print(f"Movie files can be found in src/static/movies/{movie_name}")
-print(f"SQL Query Template: INSERT INTO movies (movie_title, movie_path, movie_thumbnail) VALUES ('<movie_title>', '/static/movies/{movie_name}/master.m3u8', '/static/movies/input/<thumbnail>');")
+
+def get_movie_duration(movie_path):
+    result = subprocess.run(['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', movie_path], capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def has_audio(movie_path):
+    result = subprocess.run(['ffprobe', '-v', 'error', '-select_streams', 'a:0', '-show_entries', 'stream=index', '-of', 'csv=p=0', movie_path], capture_output=True, text=True)
+    return bool(result.stdout.strip())
+
+
+def select_renditions(ladder, source_height):
+    """
+    Returns the ladder heights to encode, highest first, skipping the ones that would upscale the source.
+    The lowest rendition is always kept so every movie has at least one variant.
+    """
+    heights = sorted({int(height) for height in ladder.split(",")}, reverse=True)
+
+    unknown = [height for height in heights if height not in LADDER]
+    if unknown:
+        sys.exit(f"Unknown ladder heights: {unknown}. Available: {sorted(LADDER)}")
+
+    selected = [height for height in heights if height <= source_height]
+    return selected or heights[-1:]
+
+
+def rendition_dir(movie_dir, height):
+    return os.path.join(movie_dir, f"{height}p")
+
+
+def completed_renditions(movie_dir):
+    """
+    Returns the heights of every rendition of the movie that finished encoding, highest first,
+    whatever ladder the current run was given.
+    """
+    heights = []
+
+    for name in os.listdir(movie_dir):
+        if name.endswith("p") and name[:-1].isdigit() and os.path.exists(os.path.join(movie_dir, name, COMPLETE_MARKER)):
+            heights.append(int(name[:-1]))
+
+    return sorted(heights, reverse=True)
+
+
+def build_ffmpeg_command(movie_path, movie_dir, heights, audio):
+    """
+    Builds one ffmpeg invocation that decodes the source once and splits it into every pending rendition.
+    Keyframes are forced on segment boundaries so the renditions stay switchable for ABR.
+    """
+    split_outputs = "".join(f"[v{index}]" for index in range(len(heights)))
+    filters = [f"[0:v]split={len(heights)}{split_outputs}"]
+    filters += [f"[v{index}]scale=-2:{height}[v{index}out]" for index, height in enumerate(heights)]
+
+    command = [
+        'ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y',
+        '-i', movie_path,
+        '-filter_complex', ";".join(filters),
+        '-progress', 'pipe:1',
+    ]
+
+    for index, height in enumerate(heights):
+        settings = LADDER[height]
+        output_dir = rendition_dir(movie_dir, height)
+
+        command += ['-map', f'[v{index}out]']
+        if audio:
+            command += ['-map', '0:a:0', '-c:a', 'aac', '-b:a', settings['audio_bitrate']]
+
+        command += [
+            '-c:v', 'libx264', '-profile:v', settings['profile'], '-level', settings['level'],
+            '-b:v', settings['video_bitrate'], '-maxrate', settings['video_bitrate'],
+            '-bufsize', f"{2 * int(settings['video_bitrate'][:-1])}k",
+            '-force_key_frames', f'expr:gte(t,n_forced*{SEGMENT_SECONDS})',
+            '-start_number', '0',
+            '-hls_time', str(SEGMENT_SECONDS),
+            '-hls_list_size', '0',
+            '-hls_segment_filename', os.path.join(output_dir, 'output%d.ts'),
+            '-f', 'hls', os.path.join(output_dir, 'output.m3u8'),
+        ]
+
+    return command
+
+
+def run_with_progress(command, duration):
+    """
+    Runs ffmpeg and prints its progress, parsed from the -progress key=value stream.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+
+    for line in process.stdout:
+        key, _, value = line.strip().partition("=")
+
+        if key in ("out_time_us", "out_time_ms") and duration and value.isdigit():
+            percent = min(100.0, int(value) / 1_000_000 / duration * 100)
+            print(f"\rEncoding... {percent:5.1f}%", end="", flush=True)
+        elif key == "progress" and value == "end":
+            print(f"\rEncoding... 100.0%")
+
+    return process.wait()
+
+
+def read_media_playlist(playlist_path):
+    """
+    Returns the (duration, segment file) pairs listed in an HLS media playlist, none if it does not exist.
+    """
+    segments = []
+    duration = None
+
+    if not os.path.exists(playlist_path):
+        return segments
+
+    with open(playlist_path) as f:
+        for line in f:
+            line = line.strip()
+
+            if line.startswith("#EXTINF:"):
+                duration = float(line[len("#EXTINF:"):].split(",")[0])
+            elif line and not line.startswith("#") and duration is not None:
+                segments.append((duration, line))
+                duration = None
+
+    return segments
+
+
+def codecs_string(streams):
+    """
+    Builds the RFC 6381 CODECS attribute from ffprobe stream metadata.
+    """
+    codecs = []
+
+    for stream in streams:
+        if stream.get('codec_name') == 'h264':
+            profile_idc, constraints = H264_PROFILES.get(stream.get('profile'), (0x64, 0x00))
+            codecs.append(f"avc1.{profile_idc:02X}{constraints:02X}{int(stream.get('level', 40)):02X}")
+        elif stream.get('codec_name') == 'aac':
+            codecs.append(f"mp4a.40.{AAC_OBJECT_TYPES.get(stream.get('profile'), 2)}")
+
+    return ",".join(codecs)
+
+
+def probe_rendition(output_dir):
+    """
+    Measures an encoded rendition: peak and average segment bitrate, resolution, codecs and frame rate.
+    Returns None when the rendition has no playlist or segments yet.
+    """
+    playlist_path = os.path.join(output_dir, 'output.m3u8')
+    segments = read_media_playlist(playlist_path)
+
+    if not segments:
+        return None
+
+    total_bits = 0
+    total_duration = 0.0
+    peak = 0
+
+    for duration, segment in segments:
+        bits = os.path.getsize(os.path.join(output_dir, segment)) * 8
+        total_bits += bits
+        total_duration += duration
+        if duration > 0:
+            peak = max(peak, bits / duration)
+
+    result = subprocess.run([
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'stream=codec_type,codec_name,profile,level,width,height,avg_frame_rate',
+        '-of', 'json', os.path.join(output_dir, segments[0][1])
+    ], capture_output=True, text=True, check=True)
+    streams = json.loads(result.stdout).get('streams', [])
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), {})
+
+    numerator, _, denominator = video.get('avg_frame_rate', '0/1').partition('/')
+    frame_rate = float(numerator) / float(denominator or 1) if float(denominator or 1) else 0.0
+
+    return {
+        'bandwidth': int(peak),
+        'average_bandwidth': int(total_bits / total_duration) if total_duration else int(peak),
+        'resolution': f"{video.get('width')}x{video.get('height')}" if video else None,
+        'codecs': codecs_string(streams),
+        'frame_rate': frame_rate,
+    }
+
+
+def write_master_playlist(movie_dir):
+    """
+    Writes master.m3u8 from every completed rendition of the movie, so re-encoding part of the ladder
+    keeps the other variants. The file is replaced atomically, so re-running setup never leaves a half
+    written or duplicated playlist behind.
+    """
+    print("Creating HLS master.m3u8 file...")
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-INDEPENDENT-SEGMENTS"]
+
+    for height in completed_renditions(movie_dir):
+        metadata = probe_rendition(rendition_dir(movie_dir, height))
+
+        if metadata is None:
+            print(f"Skipping {height}p in master.m3u8, no segments found.")
+            continue
+
+        attributes = [f"BANDWIDTH={metadata['bandwidth']}", f"AVERAGE-BANDWIDTH={metadata['average_bandwidth']}"]
+        if metadata['resolution']:
+            attributes.append(f"RESOLUTION={metadata['resolution']}")
+        if metadata['frame_rate']:
+            attributes.append(f"FRAME-RATE={metadata['frame_rate']:.3f}")
+        if metadata['codecs']:
+            attributes.append(f'CODECS="{metadata["codecs"]}"')
+
+        lines.append(f"#EXT-X-STREAM-INF:{','.join(attributes)}")
+        lines.append(f"{height}p/output.m3u8")
+
+    fd, temp_path = tempfile.mkstemp(dir=movie_dir, prefix=".master.", suffix=".m3u8")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, os.path.join(movie_dir, "master.m3u8"))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def main():
+    args = parse_args()
+
+    if not args.skip_install and not args.master_only:
+        print("Installing Python Dependencies...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+
+    movie_path = args.movie_path or input("Enter the path to your movie: ")
+    movie_name = os.path.basename(movie_path).replace(".mp4", "")
+    movie_dir = os.path.join("src/static/movies", movie_name)
+
+    if args.master_only:
+        if not os.path.isdir(movie_dir):
+            sys.exit(f"No encoded renditions found in {movie_dir}, run setup without --master-only first.")
+
+        write_master_playlist(movie_dir)
+        print(f"Wrote {movie_dir}/master.m3u8")
+        return
+
+    print("Converting video to HLS format...")
+    os.makedirs(movie_dir, exist_ok=True)
+
+    movie_resolution = get_movie_resolution(movie_path)
+    source_height = int(movie_resolution.split("x")[1])
+    heights = select_renditions(args.ladder, source_height)
+
+    pending = []
+    for height in heights:
+        output_dir = rendition_dir(movie_dir, height)
+        os.makedirs(output_dir, exist_ok=True)
+
+        if not args.force and os.path.exists(os.path.join(output_dir, COMPLETE_MARKER)):
+            print(f"Skipping {height}p, already encoded.")
+        else:
+            pending.append(height)
+
+    if pending:
+        # A rendition being rewritten is incomplete until ffmpeg succeeds, even if an earlier run finished it.
+        for height in pending:
+            marker = os.path.join(rendition_dir(movie_dir, height), COMPLETE_MARKER)
+            if os.path.exists(marker):
+                os.remove(marker)
+
+        print(f"Converting video to HLS format ({movie_resolution} -> {', '.join(f'{height}p' for height in pending)})...")
+        command = build_ffmpeg_command(movie_path, movie_dir, pending, has_audio(movie_path))
+
+        if run_with_progress(command, get_movie_duration(movie_path)) != 0:
+            sys.exit("ffmpeg failed, re-run setup to resume the unfinished renditions.")
+
+        for height in pending:
+            open(os.path.join(rendition_dir(movie_dir, height), COMPLETE_MARKER), 'w').close()
+
+    write_master_playlist(movie_dir)
+
+    print("Installation completed successfully!")
+    print(f"Movie files can be found in src/static/movies/{movie_name}")
+    print(f"SQL Query Template: INSERT INTO movies (movie_title, movie_path, movie_thumbnail) VALUES ('<movie_title>', '/static/movies/{movie_name}/master.m3u8', '/static/movies/input/<thumbnail>');")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+from src.DBMS import DBMS
+from src.Logger import get_logger, log_event
+from src import get_db, open_database
+
+from collections import namedtuple
+from datetime import datetime, timezone
+import base64, binascii, hashlib, hmac, logging, os, secrets, struct, time, uuid
+
+logger = get_logger('AccessTokens')
+
+AccessToken = namedtuple('AccessToken', ('movie_id', 'user_id', 'expires_at', 'nonce'))
+
+
+class AccessTokens:
+    """
+    Issues and verifies self-contained access codes signed with a key derived from the app's SECRET_KEY.
+
+    A token packs a version byte, the movie_id, the expiry in Unix seconds, the issuing user_id and a
+    random nonce, followed by the first 16 bytes of their HMAC-SHA256. Base64url encoded it is always
+    64 characters long, longer than any code the access_codes table can hold, so both kinds of code
+    share the /videostream/watch/<access_code> links. Verifying costs one HMAC and no database query.
+
+    Revoked nonces are kept in memory and reloaded from the revoked_access_tokens table at most once
+    every revocation_refresh seconds.
+
+    Attributes:
+        revocation_refresh (float): Seconds between reloads of the revoked nonces.
+
+    Methods:
+        init_app(app): Derives the signing key from the app's SECRET_KEY.
+        is_token(access_code): Whether a code is a signed token rather than a stored code.
+        issue(movie_id, user_id, expires_at): Returns a new signed token.
+        verify(token): Checks the signature, expiry and revocation of a token.
+        revoke(token): Revokes a token until it expires.
+    """
+    LENGTH: int = 64
+
+    __FORMAT = struct.Struct('>BII16s7s')
+    __VERSION: int = 1
+    __SIGNATURE_SIZE: int = 16
+
+    def __init__(self, revocation_refresh: float = 30.0):
+        """
+        Initializes an AccessTokens without a key; init_app must be called before use.
+
+        Args:
+            revocation_refresh (float, optional): Seconds between reloads of the revoked nonces (default: 30).
+        """
+        self.revocation_refresh = revocation_refresh
+        self._key = None
+        self._revoked = frozenset()
+        self._loaded_at = None
+
+    def init_app(self, app):
+        """
+        Derives the signing key from SECRET_KEY and reads ACCESS_TOKEN_REVOCATION_REFRESH.
+
+        Args:
+            app (Flask): The application.
+        """
+        self._key = hmac.new(app.config['SECRET_KEY'].encode('utf-8'), b'videostream access tokens', hashlib.sha256).digest()
+        self.revocation_refresh = float(os.environ.get('ACCESS_TOKEN_REVOCATION_REFRESH', self.revocation_refresh))
+        app.extensions['access_tokens'] = self
+
+    def is_token(self, access_code: str) -> bool:
+        return len(access_code) == self.LENGTH
+
+    def issue(self, movie_id: int, user_id: str, expires_at: datetime) -> str:
+        """
+        Returns a new signed token.
+
+        Args:
+            movie_id (int): ID of the movie the token opens.
+            user_id (str): UUID of the user issuing it.
+            expires_at (datetime): Expiry; naive datetimes are taken as UTC.
+
+        Returns:
+            str: The token.
+        """
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+        payload = self.__FORMAT.pack(self.__VERSION, movie_id, int(expires_at.timestamp()), uuid.UUID(user_id).bytes,
+                                     secrets.token_bytes(7))
+        return base64.urlsafe_b64encode(payload + self.__sign(payload)).decode('ascii')
+
+    def verify(self, token: str) -> tuple:
+        """
+        Checks a token's signature in constant time, then its expiry and revocation.
+
+        Args:
+            token (str): The token to check.
+
+        Returns:
+            tuple: True and the AccessToken if the token is valid, False and an error message otherwise.
+        """
+        statement, claims = self.__decode(token)
+
+        if statement is False:
+            return False, claims
+
+        if claims.expires_at <= datetime.now(timezone.utc):
+            return False, "Access code has expired."
+
+        if claims.nonce in self.__revoked():
+            return False, "Access code has been revoked."
+
+        return True, claims
+
+    def revoke(self, token: str) -> bool:
+        """
+        Revokes a token until it expires. Other workers honor it after their next reload.
+
+        Args:
+            token (str): The token to revoke.
+
+        Returns:
+            bool: True if the token is authentic and was revoked, False otherwise.
+        """
+        statement, claims = self.__decode(token)
+
+        if statement is False:
+            return False
+
+        db = DBMS(open_database())
+
+        try:
+            if not db.revoke_access_token(claims.nonce, claims.expires_at):
+                return False
+        finally:
+            db.close_connection()
+
+        self._revoked = self._revoked | {claims.nonce}
+        return True
+
+    def __decode(self, token: str) -> tuple:
+        try:
+            raw = base64.urlsafe_b64decode(token.encode('ascii'))
+        except (binascii.Error, UnicodeEncodeError, ValueError):
+            return False, "Access code does not exist!"
+
+        payload, signature = raw[:self.__FORMAT.size], raw[self.__FORMAT.size:]
+
+        if len(signature) != self.__SIGNATURE_SIZE or not hmac.compare_digest(signature, self.__sign(payload)):
+            return False, "Access code does not exist!"
+
+        version, movie_id, expires_at, user_id, nonce = self.__FORMAT.unpack(payload)
+
+        if version != self.__VERSION:
+            return False, "Access code does not exist!"
+
+        return True, AccessToken(movie_id, str(uuid.UUID(bytes=user_id)), datetime.fromtimestamp(expires_at, timezone.utc), nonce.hex())
+
+    def __sign(self, payload: bytes) -> bytes:
+        if self._key is None:
+            raise RuntimeError("AccessTokens.init_app must be called before issuing or verifying tokens.")
+
+        return hmac.new(self._key, payload, hashlib.sha256).digest()[:self.__SIGNATURE_SIZE]
+
+    def __revoked(self) -> frozenset:
+        now = time.monotonic()
+
+        if self._loaded_at is not None and now - self._loaded_at < self.revocation_refresh:
+            return self._revoked
+
+        statement, nonces = DBMS(get_db()).fetch_revoked_access_tokens()
+
+        if statement is False:  # Keep the last known set rather than failing every check.
+            log_event(logger, logging.WARNING, 'revocations_stale', error=repr(nonces))
+        else:
+            self._revoked = frozenset(nonces)
+
+        self._loaded_at = now
+        return self._revoked
+
+
+access_tokens = AccessTokens()
@@ -1,11 +1,18 @@
 from flask import Blueprint, render_template, flash, redirect, url_for, session, request
 
-from src.DBInterfaces import PostgresDatabase
 from src.DBMS import DBMS
-from src import login_required
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
+from src import login_required, get_db
+
+import logging
+
+logger = get_logger('Auth')
 
 auth = Blueprint('auth', __name__)
 
+attempts = registry.counter('videostream_auth_attempts_total', 'Sign-in and sign-up attempts, by action and outcome.', ('action', 'result'))
+
 
 @auth.route("/login", methods=["GET", "POST"])
 def login():
@@ -23,9 +30,9 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
 
-        db = DBMS(PostgresDatabase())
-        statement, user = db.login_user(username, password)
-        db.close_connection()
+        statement, user = DBMS(get_db()).login_user(username, password)
+        log_event(logger, logging.DEBUG, 'login', username=username, success=statement)
+        attempts.inc(labels=('login', 'success' if statement is True else 'failure'))
 
         if statement is True:
             session['logged_in'] = True
@@ -66,9 +73,9 @@ def sign_up():
             flash("Password must be at least 7 characters.", category='danger')
 
         else:
-            db = DBMS(PostgresDatabase())
-            statement, data = db.register_user(username, password1)
-            db.close_connection()
+            statement, data = DBMS(get_db()).register_user(username, password1)
+            log_event(logger, logging.DEBUG, 'signup', username=username, success=statement)
+            attempts.inc(labels=('signup', 'success' if statement is True else 'failure'))
 
             if statement is True:
                 session['logged_in'] = True
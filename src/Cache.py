@@ -0,0 +1,117 @@
+from collections import OrderedDict
+import threading, time
+
+
+class TTLCache:
+    """
+    A bounded in-process cache with least-recently-used eviction and a time-to-live per entry.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept.
+        ttl (float): Default time-to-live of an entry, in seconds.
+
+    Methods:
+        get(key, default=None): Returns a live entry or the default.
+        set(key, value, ttl=None): Stores an entry for ttl seconds.
+        pop(key): Removes an entry.
+        clear(): Removes every entry.
+        stats(): Returns the hit, miss and eviction counters.
+    """
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        """
+        Initializes a new, empty TTLCache.
+
+        Args:
+            max_size (int, optional): Maximum number of entries (default: 1024).
+            ttl (float, optional): Default time-to-live in seconds (default: 60).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key if it has not expired.
+
+        Args:
+            key: The cache key.
+            default (optional): Value returned on a miss (default: None).
+
+        Returns:
+            The cached value, or the default on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        """
+        Stores a value, evicting the least recently used entry when the cache is full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl (float, optional): Time-to-live in seconds (default: the cache ttl).
+        """
+        ttl = self.ttl if ttl is None else ttl
+
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key):
+        """
+        Removes an entry if it is present.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The number of hits, misses, evictions and the current size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+        }
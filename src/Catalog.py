@@ -0,0 +1,141 @@
+from datetime import timezone
+import hashlib, os, time
+
+from src.DBMS import DBMS
+from src import get_db
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def templates_version(directory: str = TEMPLATES_DIR) -> str:
+    """
+    Returns the APP_VERSION setting, or a digest of the template files when it is not set, so pages
+    validated against the catalog's ETag change when the app is upgraded.
+
+    Args:
+        directory (str, optional): The templates directory (default: src/templates).
+
+    Returns:
+        str: The version.
+    """
+    version = os.environ.get('APP_VERSION')
+
+    if version:
+        return version
+
+    digest = hashlib.sha1()
+
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(name.encode('utf-8') + b'\0' + f.read())
+
+    return digest.hexdigest()
+
+
+class MovieCatalog:
+    """
+    In-memory copy of the movies table, versioned by its row count and latest created_at.
+
+    The table is loaded once and served from memory. At most once every refresh_interval seconds a
+    cheap version query is run; the full table is only reloaded when that version changes.
+
+    Attributes:
+        refresh_interval (float): Seconds between version checks.
+        app_version (str): Version of the pages rendering the catalog, mixed into the ETag.
+        etag (str): Strong ETag of the cached catalog, None before the first load.
+        last_modified (datetime): Latest created_at of the cached catalog, None if unknown.
+
+    Methods:
+        get(): Returns the cached movies, reloading them if the table changed.
+        find(movie_id): Returns one movie of the catalog.
+        invalidate(): Forces a version check on the next get().
+    """
+    def __init__(self, refresh_interval: float = 30.0, app_version: str = ''):
+        """
+        Initializes an empty MovieCatalog.
+
+        Args:
+            refresh_interval (float, optional): Seconds between version checks (default: 30).
+            app_version (str, optional): Version of the pages rendering the catalog (default: '').
+        """
+        self.refresh_interval = refresh_interval
+        self.app_version = app_version
+        self.etag = None
+        self.last_modified = None
+        self._movies = None
+        self._by_id = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    def get(self) -> tuple:
+        """
+        Returns the movies, from memory when the cached copy is still current.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the fetch result and the list of movies,
+                   or an error message if the movies could not be loaded.
+        """
+        now = time.monotonic()
+
+        if self._movies is not None and now - self._checked_at < self.refresh_interval:
+            return True, self._movies
+
+        db = DBMS(get_db())
+        statement, version = db.fetch_movies_version()
+
+        if statement is False:
+            return False, version
+
+        if self._movies is not None and version == self._version:
+            self._checked_at = now
+            return True, self._movies
+
+        statement, movies = db.fetch_movies()
+
+        if statement is False:
+            return False, movies
+
+        self.__store(movies, version, now)
+        return True, movies
+
+    def find(self, movie_id: int) -> tuple:
+        """
+        Returns one movie of the catalog, refreshed like get().
+
+        Args:
+            movie_id (int): The ID of the movie.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the result and the Movie,
+                   or an error message if the movie does not exist or the catalog could not be loaded.
+        """
+        statement, movies = self.get()
+
+        if statement is False:
+            return False, movies
+
+        movie = self._by_id.get(movie_id)
+
+        if movie is None:
+            return False, "Movie does not exist!"
+
+        return True, movie
+
+    def invalidate(self):
+        """
+        Forces a version check on the next get().
+        """
+        self._checked_at = 0.0
+
+    def __store(self, movies: list, version: tuple, now: float):
+        _, latest = version
+
+        self.etag = hashlib.sha1((self.app_version + repr(movies)).encode('utf-8')).hexdigest()
+        self.last_modified = latest.replace(tzinfo=timezone.utc) if latest is not None else None
+        self._movies = movies
+        self._by_id = {movie.movie_id: movie for movie in movies}
+        self._version = version
+        self._checked_at = now
+
+
+catalog = MovieCatalog(refresh_interval=float(os.environ.get('CATALOG_REFRESH_INTERVAL', 30)), app_version=templates_version())
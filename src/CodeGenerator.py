@@ -0,0 +1,86 @@
+from collections import deque
+import os, secrets, string, threading
+
+DEFAULT_ALPHABET = string.ascii_letters + string.digits
+MAX_LENGTH = 50  # access_codes.code_id is a VARCHAR(50).
+
+
+class CodeGenerator:
+    """
+    Generates uniformly random access codes from the operating system's CSPRNG.
+
+    Codes are made in batches: one secrets.token_bytes call is mapped onto the alphabet with
+    bytes.translate, dropping the bytes that would bias the result (those at or above the largest
+    multiple of the alphabet size below 256), and split into codes that are handed out one at a time.
+    The pending batch is discarded in forked children, so workers never share codes.
+
+    Attributes:
+        length (int): Characters per code.
+        alphabet (str): The characters codes are drawn from.
+        batch_size (int): Codes generated per refill.
+
+    Methods:
+        generate(): Returns a new random code.
+    """
+    def __init__(self, length: int = 10, alphabet: str = DEFAULT_ALPHABET, batch_size: int = 256):
+        """
+        Initializes the generator.
+
+        Args:
+            length (int, optional): Characters per code, at most 50 (default: 10).
+            alphabet (str, optional): Distinct ASCII characters codes are drawn from (default: letters and digits).
+            batch_size (int, optional): Codes generated per refill (default: 256).
+
+        Raises:
+            ValueError: If the length or the alphabet is invalid.
+        """
+        if not 1 <= length <= MAX_LENGTH:
+            raise ValueError(f"Access code length must be between 1 and {MAX_LENGTH}, got {length}.")
+
+        if len(alphabet) < 2 or len(set(alphabet)) != len(alphabet) or not alphabet.isascii():
+            raise ValueError("Access code alphabet must hold at least 2 distinct ASCII characters.")
+
+        self.length = length
+        self.alphabet = alphabet
+        self.batch_size = max(1, batch_size)
+
+        self._limit = 256 - 256 % len(alphabet)
+        self._table = bytes(ord(alphabet[byte % len(alphabet)]) for byte in range(256))
+        self._rejected = bytes(range(self._limit, 256))
+        self._codes = deque()
+        self._lock = threading.Lock()
+
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._codes.clear)
+
+    def generate(self) -> str:
+        """
+        Returns a new random code, refilling the batch when it is used up.
+
+        Returns:
+            str: The access code.
+        """
+        with self._lock:
+            if not self._codes:
+                self.__refill()
+
+            return self._codes.popleft()
+
+    def __refill(self):
+        needed = self.batch_size * self.length
+        text = b''
+
+        while len(text) < needed:
+            # Draw enough bytes that, on average, one call survives the rejection.
+            missing = needed - len(text)
+            text += secrets.token_bytes(missing * 256 // self._limit + 16).translate(self._table, self._rejected)
+
+        text = text[:needed].decode('ascii')
+        self._codes.extend(text[i:i + self.length] for i in range(0, needed, self.length))
+
+
+code_generator = CodeGenerator(
+    length=int(os.environ.get('ACCESS_CODE_LENGTH', 10)),
+    alphabet=os.environ.get('ACCESS_CODE_ALPHABET') or DEFAULT_ALPHABET,
+    batch_size=int(os.environ.get('ACCESS_CODE_BATCH_SIZE', 256))
+)
@@ -1,77 +1,183 @@
-from src.DBMS import DBMS
+from src.DBMS import DBMS, Stream, CODE_EXISTS
 
-from src.DBInterfaces import PostgresDatabase
-from datetime import datetime
+from src.DBInterfaces import DatabaseInterface
+from src.AccessTokens import access_tokens
+from src.Cache import TTLCache
+from src.Catalog import catalog
+from src.CodeGenerator import code_generator
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
+from src import get_db
+from datetime import datetime, timezone
 
-import random, string
+import logging, os
+
+logger = get_logger('CodeManage')
+
+codes_generated = registry.counter('videostream_access_codes_generated_total', 'Access codes generated.')
+code_collisions = registry.counter('videostream_access_code_collisions_total', 'Generated access codes that already existed.')
+code_checks = registry.counter('videostream_access_code_checks_total', 'Access code checks, by result and source.', ('result', 'source'))
 
 
 class CodeManage:
     """
     Class responsible for managing access codes for movies.
+
+    Validation results are kept in a process-wide TTLCache shared by every instance. A valid code is
+    cached until ACCESS_CODE_CACHE_TTL elapses or the code expires, whichever comes first; unknown and
+    expired codes are cached for ACCESS_CODE_NEGATIVE_TTL seconds.
+
+    With ACCESS_CODE_MODE=signed, new codes are signed tokens (see AccessTokens) that are never stored.
+    Tokens are recognized and verified in either mode, so links handed out before a switch keep working.
+
+    The database is only opened when a check misses the cache, on the app context's shared handle unless
+    one is given. Call close() when done with an instance that was given its own handle.
     """
 
-    __SIZE: int = 10
+    MODE: str = os.environ.get('ACCESS_CODE_MODE', 'database')
+
+    __MAX_ATTEMPTS: int = 5
+    __NEGATIVE_TTL: float = float(os.environ.get('ACCESS_CODE_NEGATIVE_TTL', 5))
 
-    def __init__(self) -> None:
+    cache = TTLCache(
+        max_size=int(os.environ.get('ACCESS_CODE_CACHE_SIZE', 4096)),
+        ttl=float(os.environ.get('ACCESS_CODE_CACHE_TTL', 300))
+    )
+
+    def __init__(self, database: DatabaseInterface = None) -> None:
         """
         Constructor for the CodeManage class.
+
+        Args:
+            database (DatabaseInterface, optional): The database to use (default: the app context's, see get_db()).
         """
-        self.db = DBMS(PostgresDatabase())
+        self._database = database
+        self._db = None
 
-    def __del__(self):
+    @property
+    def db(self) -> DBMS:
         """
-        Destructor for the CodeManage class.
+        The DBMS of this instance, created on first use.
         """
-        self.db.close_connection()
+        if self._db is None:
+            self._db = DBMS(self._database or get_db())
 
-    def __generate_random_code(self) -> str:
-        """
-        Generates a random access code.
+        return self._db
 
-        Returns:
-            str: Randomly generated access code.
+    def close(self):
         """
-        chars = string.ascii_letters + string.digits
-        return ''.join(random.choice(chars) for _ in range(self.__SIZE))
-    
-    def generate_access_code(self, user_id: str, movie_id: int, expiration_date: datetime) -> str or None:
+        Closes the database handle, if one was opened. Closing the shared handle is a no-op.
+        """
+        if self._db is not None:
+            self._db.close_connection()
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def generate_access_code(self, user_id: str, movie_id: int, expiration_date: datetime) -> tuple:
         """
         Generates an access code for a specific user and movie.
 
+        In signed mode the code is a signed token for a movie of the catalog, and nothing is written.
+        Otherwise codes come from code_generator. A code that already exists is replaced by a fresh one, up to
+        5 attempts, so code creation does not fail as the keyspace fills up.
+
         Args:
             user_id (str): ID of the user.
             movie_id (int): ID of the movie.
             expiration_date (datetime): Expiration date of the access code.
 
         Returns:
-            str or None: Generated access code if successful, None otherwise.
+            tuple: True and the generated access code if successful, otherwise False and the reason given by
+                   DBMS.insert_access_code, e.g. LIVE_CODE_LIMIT, or an error message.
         """
-        random_code = self.__generate_random_code()
+        if self.MODE == 'signed':
+            statement, movie = catalog.find(movie_id)
+
+            if statement is False:
+                return False, movie
+
+            codes_generated.inc()
+            return True, access_tokens.issue(movie_id, user_id, expiration_date)
+
+        for _ in range(self.__MAX_ATTEMPTS):
+            random_code = code_generator.generate()
+            statement, data = self.db.insert_access_code(random_code, movie_id, user_id, expiration_date)
 
-        if self.db.insert_access_code(random_code, movie_id, user_id, expiration_date):
-            return random_code
-        else:
-            return
+            if statement is True:
+                self.cache.pop(random_code)
+                codes_generated.inc()
+                return True, random_code
+
+            if data != CODE_EXISTS:
+                return False, data
+
+            code_collisions.inc()
+            log_event(logger, logging.WARNING, 'access_code_collision', length=code_generator.length)
+
+        return False, CODE_EXISTS
     
-    def check_access_code(self, access_code: str) -> bool:
+    def check_access_code(self, access_code: str) -> tuple:
         """
-        Checks if an access code is valid.
+        Checks if an access code is valid, answering from the cache when possible.
+
+        A cache miss costs one query, which also checks expiry on the database clock and fetches the movie path.
+        Signed tokens are verified without a query, and their movie path comes from the catalog.
 
         Args:
             access_code (str): Access code to check.
 
         Returns:
-            bool: True if the access code is valid, False otherwise.
+            tuple: True and the Stream the code opens if it is valid, False and an error message otherwise.
         """
-        statement, data = self.db.fetch_access_code(access_code)
+        if access_tokens.is_token(access_code):
+            return self.__check_token(access_code)
+
+        cached = self.cache.get(access_code)
+
+        if cached is not None:
+            code_checks.inc(labels=('valid' if cached[0] else 'invalid', 'cache'))
+            return cached
+
+        statement, data = self.db.fetch_stream(access_code)
 
         if statement is False:
+            if isinstance(data, str):  # Database errors are not cached.
+                self.cache.set(access_code, (False, data), ttl=self.__NEGATIVE_TTL)
+                code_checks.inc(labels=('invalid', 'database'))
+            else:
+                code_checks.inc(labels=('error', 'database'))
             return False, data
 
-        expiration = data[4].replace(tzinfo=None)
+        result = True, data
+        # The database decided validity; the local clock only bounds how long the answer is reused.
+        remaining = (data.expires_at - datetime.now(timezone.utc)).total_seconds()
+        self.cache.set(access_code, result, ttl=min(self.cache.ttl, remaining))
+        code_checks.inc(labels=('valid', 'database'))
+        return result
+
+    def __check_token(self, token: str) -> tuple:
+        statement, claims = access_tokens.verify(token)
+
+        if statement is True:
+            statement, movie = catalog.find(claims.movie_id)
+
+            if statement is True:
+                code_checks.inc(labels=('valid', 'token'))
+                return True, Stream(token, claims.movie_id, movie.movie_path, claims.expires_at)
+
+            claims = movie
+
+        code_checks.inc(labels=('invalid', 'token'))
+        return False, claims
 
-        if expiration < datetime.utcnow():
-            return False, "Access code has expired."
 
-        return True, data
+registry.callback_counter('videostream_access_code_cache_hits_total', 'Access code cache hits.', lambda: CodeManage.cache.stats()['hits'])
+registry.callback_counter('videostream_access_code_cache_misses_total', 'Access code cache misses.', lambda: CodeManage.cache.stats()['misses'])
+registry.callback_counter('videostream_access_code_cache_evictions_total', 'Access code cache entries evicted to stay within its size.',
+                          lambda: CodeManage.cache.stats()['evictions'])
+registry.gauge('videostream_access_code_cache_entries', 'Entries in the access code cache.', function=lambda: CodeManage.cache.stats()['size'])
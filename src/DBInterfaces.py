@@ -1,7 +1,11 @@
 import psycopg2
+import psycopg2.extensions
 
+from eventlet.semaphore import Semaphore
+from eventlet.hubs import trampoline
 from abc import ABC, abstractmethod
-import os
+from datetime import datetime, timezone
+import functools, os, re, sqlite3, time
 
 
 class DatabaseInterface(ABC):
@@ -22,6 +26,23 @@ class DatabaseInterface(ABC):
         """
         pass
 
+    def execute_prepared(self, name, query, params=None, **kwargs):
+        """
+        Executes a query the database may keep prepared under the given name.
+
+        Backends without server-side prepared statements run it as a plain query.
+
+        Args:
+            name (str): A name unique to this query text.
+            query (str): The SQL query to execute.
+            params (tuple, optional): The parameters to be passed to the query.
+            **kwargs: Passed to execute_query, e.g. fetch.
+
+        Returns:
+            The result of execute_query.
+        """
+        return self.execute_query(query, params, **kwargs)
+
     @abstractmethod
     def commit(self):
         """
@@ -29,6 +50,12 @@ class DatabaseInterface(ABC):
         """
         pass
 
+    def rollback(self):
+        """
+        Discards the uncommitted changes. Backends without transactions do nothing.
+        """
+        pass
+
     @abstractmethod
     def close(self):
         """
@@ -37,6 +64,74 @@ class DatabaseInterface(ABC):
         pass
 
 
+class PreparingConnection(psycopg2.extensions.connection):
+    """
+    A psycopg2 connection that remembers which statements were prepared on its server session.
+
+    Attributes:
+        prepared (set): Names of the statements prepared on this connection.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def connect_postgres() -> PreparingConnection:
+    """
+    Opens a Postgres connection using the environment variables for host, user, and password.
+
+    Returns:
+        PreparingConnection: The new connection.
+    """
+    return psycopg2.connect(
+        host=os.environ['PSQL_HOST'],
+        user=os.environ['PSQL_USER'],
+        password=os.environ['PSQL_PASSWORD'],
+        connection_factory=PreparingConnection
+    )
+
+
+def eventlet_wait_callback(connection, timeout=None):
+    """
+    A psycopg2 wait callback that waits for the connection's socket on the eventlet hub.
+
+    psycopg2 normally blocks in C while Postgres works on a query, which freezes every greenlet of the
+    process. With this callback installed the connection is driven in non-blocking mode, and each time
+    it would block the calling greenlet yields to the hub until the socket is ready.
+
+    Args:
+        connection (psycopg2.extensions.connection): The connection being waited on.
+        timeout (float, optional): Unused; psycopg2 passes it for compatibility.
+
+    Raises:
+        psycopg2.OperationalError: If the connection reports an unknown poll state.
+    """
+    while True:
+        state = connection.poll()
+
+        if state == psycopg2.extensions.POLL_OK:
+            return
+        elif state == psycopg2.extensions.POLL_READ:
+            trampoline(connection.fileno(), read=True)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            trampoline(connection.fileno(), write=True)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state!r}")
+
+
+def use_green_io(enabled: bool = True):
+    """
+    Makes every psycopg2 connection of the process cooperative with eventlet, or blocking again.
+
+    The wait callback is process-wide, so it applies to pooled and unpooled connections alike and to
+    connections already open. Transactions, server-side prepared statements and commits work unchanged.
+
+    Args:
+        enabled (bool, optional): Whether to install eventlet_wait_callback or remove it (default: True).
+    """
+    psycopg2.extensions.set_wait_callback(eventlet_wait_callback if enabled else None)
+
+
 class PostgresDatabase(DatabaseInterface):
     """
     A class representing a Postgres database.
@@ -47,19 +142,18 @@ class PostgresDatabase(DatabaseInterface):
     Methods:
         __init__(): Initializes the PostgresDatabase object.
         execute_query(query, params=None, fetch='all' or 'one' or None): Executes a query on the database.
+        execute_prepared(name, query, params=None, fetch='all' or 'one' or None): Executes a server-side prepared query.
         commit(): Commits the changes made to the database.
         close(): Closes the connection to the database.
     """
+    __PLACEHOLDER = re.compile(r'%s')
+
     def __init__(self):
         """
         Initializes a new instance of the DBInterfaces class.
         Establishes a connection to the PostgreSQL database using the environment variables for host, user, and password.
         """
-        self.connection = psycopg2.connect(
-            host=os.environ['PSQL_HOST'],
-            user=os.environ['PSQL_USER'],
-            password=os.environ['PSQL_PASSWORD']
-        )
+        self.connection = connect_postgres()
 
     def execute_query(self, query, params=None, fetch='all'):
         """
@@ -82,14 +176,609 @@ class PostgresDatabase(DatabaseInterface):
             elif fetch is None:
                 return True
 
+    def execute_prepared(self, name, query, params=None, fetch='all'):
+        """
+        Executes a query as a server-side prepared statement.
+
+        The statement is prepared once per connection and executed with EXECUTE afterwards, so Postgres
+        skips parsing and planning on repeated calls. Connections that cannot remember their prepared
+        statements run the query as a plain one.
+
+        Args:
+            name (str): A name unique to this query text.
+            query (str): The SQL query to execute, with %s placeholders.
+            params (tuple, optional): The parameters to be passed to the query (default: None).
+            fetch (str, optional): Specifies whether to fetch 'all' rows, 'one' last row, or None and return True. (default: 'all').
+
+        Returns:
+            list or tuple or bool: The result of the query execution.
+        """
+        prepared = getattr(self.connection, 'prepared', None)
+
+        if prepared is None:
+            return self.execute_query(query, params, fetch=fetch)
+
+        if name not in prepared:
+            numbered = iter(range(1, query.count('%s') + 1))
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"PREPARE {name} AS {self.__PLACEHOLDER.sub(lambda _: f'${next(numbered)}', query)}")
+            prepared.add(name)
+
+        arguments = f"({', '.join(['%s'] * len(params))})" if params else ''
+        return self.execute_query(f"EXECUTE {name}{arguments}", params, fetch=fetch)
+
     def commit(self):
         """
         Commits the changes made to the Postgres database.
         """
         self.connection.commit()
 
+    def rollback(self):
+        """
+        Rolls back the current transaction of the Postgres database.
+        """
+        self.connection.rollback()
+
     def close(self):
         """
         Closes the connection to the Postgres database.
         """
         self.connection.close()
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no pooled connection becomes available within the checkout timeout.
+    """
+    pass
+
+
+class ConnectionPool:
+    """
+    A bounded pool of Postgres connections shared by every request of the process.
+
+    Checkout waits on an eventlet semaphore, so a greenlet waiting for a free connection yields
+    to the hub instead of blocking the socket events running on the same worker.
+
+    Attributes:
+        max_size (int): Maximum number of connections opened at the same time.
+        timeout (float): Seconds to wait for a free connection before raising PoolTimeout.
+        max_idle (float): Seconds an idle connection is kept before it is closed.
+        health_check_interval (float): Idle seconds after which a connection is pinged before reuse.
+
+    Methods:
+        init_app(app): Configures the pool from the environment and registers it on the app.
+        checkout(): Borrows a connection from the pool.
+        checkin(connection): Returns a borrowed connection to the pool.
+        stats(): Returns the pool usage and wait metrics.
+        close(): Closes every idle connection.
+    """
+    def __init__(self, max_size: int = 10, timeout: float = 10.0, max_idle: float = 300.0,
+                 health_check_interval: float = 30.0, connect=None):
+        """
+        Initializes a new, empty connection pool.
+
+        Args:
+            max_size (int, optional): Maximum number of open connections (default: 10).
+            timeout (float, optional): Checkout timeout in seconds (default: 10).
+            max_idle (float, optional): Idle seconds before a connection is evicted (default: 300).
+            health_check_interval (float, optional): Idle seconds before a connection is pinged on checkout (default: 30).
+            connect (callable, optional): Factory for new connections (default: psycopg2 using the PSQL_* environment variables).
+        """
+        self._connect = connect or connect_postgres
+        self._idle = []
+        self._size = 0
+        self.configure(max_size, timeout, max_idle, health_check_interval)
+        self._metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'evicted': 0,
+            'health_check_failures': 0,
+        }
+
+    def configure(self, max_size: int, timeout: float, max_idle: float, health_check_interval: float):
+        """
+        Sets the pool limits. Must be called before the first checkout.
+
+        Args:
+            max_size (int): Maximum number of open connections.
+            timeout (float): Checkout timeout in seconds.
+            max_idle (float): Idle seconds before a connection is evicted.
+            health_check_interval (float): Idle seconds before a connection is pinged on checkout.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self._semaphore = Semaphore(max_size)
+
+    def init_app(self, app):
+        """
+        Configures the pool from the DB_POOL_* environment variables and registers it on the app.
+
+        Queries wait for Postgres on the eventlet hub unless DB_GREEN_IO is 0, see use_green_io.
+
+        Args:
+            app (Flask): The Flask application.
+        """
+        self.configure(
+            max_size=int(os.environ.get('DB_POOL_SIZE', self.max_size)),
+            timeout=float(os.environ.get('DB_POOL_TIMEOUT', self.timeout)),
+            max_idle=float(os.environ.get('DB_POOL_MAX_IDLE', self.max_idle)),
+            health_check_interval=float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', self.health_check_interval))
+        )
+        app.extensions['db_pool'] = self
+        use_green_io(os.environ.get('DB_GREEN_IO', '1') != '0')
+
+    def checkout(self):
+        """
+        Borrows a connection from the pool, waiting cooperatively if all of them are in use.
+
+        Returns:
+            psycopg2.extensions.connection: A healthy connection.
+
+        Raises:
+            PoolTimeout: If no connection is available within the checkout timeout.
+        """
+        if not self._semaphore.acquire(blocking=False):
+            started = time.monotonic()
+            acquired = self._semaphore.acquire(timeout=self.timeout)
+            waited = time.monotonic() - started
+
+            self._metrics['waits'] += 1
+            self._metrics['wait_time_total'] += waited
+            self._metrics['wait_time_max'] = max(self._metrics['wait_time_max'], waited)
+
+            if not acquired:
+                self._metrics['timeouts'] += 1
+                raise PoolTimeout(f"No database connection available after {self.timeout} seconds.")
+
+        self._metrics['checkouts'] += 1
+
+        try:
+            self.__evict_idle()
+
+            while self._idle:
+                connection, last_used = self._idle.pop()
+                if self.__is_healthy(connection, time.monotonic() - last_used):
+                    return connection
+                self.__discard(connection)
+                self._metrics['health_check_failures'] += 1
+
+            connection = self._connect()
+            self._size += 1
+            self._metrics['created'] += 1
+            return connection
+
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    def checkin(self, connection):
+        """
+        Returns a borrowed connection to the pool, rolling back any transaction left open.
+
+        Args:
+            connection (psycopg2.extensions.connection): The connection to return.
+        """
+        try:
+            if connection.closed:
+                self.__discard(connection)
+                return
+
+            try:
+                if connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                self.__discard(connection)
+                return
+
+            self._idle.append((connection, time.monotonic()))
+            self.__evict_idle()
+
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """
+        Returns the pool usage and wait metrics.
+
+        Returns:
+            dict: Current size, idle and in-use connections, and the cumulative checkout counters.
+        """
+        return dict(
+            self._metrics,
+            size=self._size,
+            idle=len(self._idle),
+            in_use=self._size - len(self._idle),
+            max_size=self.max_size
+        )
+
+    def close(self):
+        """
+        Closes every idle connection in the pool.
+        """
+        while self._idle:
+            connection, _ = self._idle.pop()
+            self.__discard(connection)
+
+    def __is_healthy(self, connection, idle_for: float) -> bool:
+        if connection.closed:
+            return False
+
+        if idle_for < self.health_check_interval:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def __evict_idle(self):
+        now = time.monotonic()
+        keep = []
+
+        for connection, last_used in self._idle:
+            if now - last_used > self.max_idle:
+                self.__discard(connection)
+                self._metrics['evicted'] += 1
+            else:
+                keep.append((connection, last_used))
+
+        self._idle = keep
+
+    def __discard(self, connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+        self._size -= 1
+        self._metrics['closed'] += 1
+
+
+class PooledPostgresDatabase(PostgresDatabase):
+    """
+    A Postgres database whose connection is borrowed from a ConnectionPool instead of opened per instance.
+
+    Attributes:
+        pool (ConnectionPool): The pool the connection is borrowed from.
+        connection (psycopg2.extensions.connection): The borrowed connection, None once returned.
+    """
+    def __init__(self, pool: ConnectionPool):
+        """
+        Borrows a connection from the given pool.
+
+        Args:
+            pool (ConnectionPool): The pool to borrow from.
+        """
+        self.pool = pool
+        self.connection = pool.checkout()
+
+    def close(self):
+        """
+        Returns the connection to the pool. Calling it more than once is a no-op.
+        """
+        if self.connection is not None:
+            self.pool.checkin(self.connection)
+            self.connection = None
+
+
+class UnitOfWork(DatabaseInterface):
+    """
+    A database handle that is opened on first use and shared by everything running in one app context.
+
+    Nothing is opened until the first query, so code paths answered from memory never borrow a
+    connection. The handle belongs to the unit of work: close() is a no-op for its users, and commit()
+    only marks the work as pending. The pending work is committed before the next statement runs, or by
+    flush() or finish(), so back-to-back commits and the last one of a request cost a single COMMIT.
+    A statement that fails rolls back only the work not yet committed, and the connection stays usable
+    for the rest of the request.
+
+    Attributes:
+        database (DatabaseInterface): The opened handle, None until the first query.
+        pending (bool): Whether commit() was called since the last flush.
+
+    Methods:
+        flush(): Commits the pending work.
+        finish(exception=None): Commits, or rolls back after an exception, and releases the handle.
+    """
+    def __init__(self, open_database):
+        """
+        Initializes a unit of work without opening anything.
+
+        Args:
+            open_database (callable): Returns the DatabaseInterface to use on first query.
+        """
+        self._open_database = open_database
+        self.database = None
+        self.pending = False
+
+    def execute_query(self, query, params=None, **kwargs):
+        """
+        Executes a query, opening the handle if needed.
+
+        Args:
+            query (str): The SQL query to execute.
+            params (tuple, optional): The parameters to be passed to the query.
+            **kwargs: Passed to the handle's execute_query, e.g. fetch.
+
+        Returns:
+            The result of the handle's execute_query.
+        """
+        return self.__execute('execute_query', query, params, **kwargs)
+
+    def execute_prepared(self, name, query, params=None, **kwargs):
+        """
+        Executes a prepared query, opening the handle if needed.
+
+        Args:
+            name (str): A name unique to this query text.
+            query (str): The SQL query to execute.
+            params (tuple, optional): The parameters to be passed to the query.
+            **kwargs: Passed to the handle's execute_prepared, e.g. fetch.
+
+        Returns:
+            The result of the handle's execute_prepared.
+        """
+        return self.__execute('execute_prepared', name, query, params, **kwargs)
+
+    def commit(self):
+        """
+        Marks the work as pending; it is committed before the next statement, or by flush() or finish().
+        """
+        if self.database is not None:
+            self.pending = True
+
+    def rollback(self):
+        """
+        Discards the uncommitted and pending work.
+        """
+        if self.database is not None:
+            self.database.rollback()
+
+        self.pending = False
+
+    def close(self):
+        """
+        Does nothing; the handle is released by finish().
+        """
+        pass
+
+    def flush(self):
+        """
+        Commits the pending work, if any.
+        """
+        if self.pending:
+            self.database.commit()
+            self.pending = False
+
+    def finish(self, exception=None):
+        """
+        Commits the pending work, or rolls it back after an exception, and releases the handle.
+
+        Args:
+            exception (Exception, optional): The exception that ended the app context, if any.
+        """
+        if self.database is None:
+            return
+
+        try:
+            if exception is None:
+                self.flush()
+            else:
+                self.rollback()
+        finally:
+            self.database.close()
+            self.database = None
+            self.pending = False
+
+    def __execute(self, method: str, *args, **kwargs):
+        if self.database is None:
+            self.database = self._open_database()
+
+        self.flush()  # Work reported as committed must not be lost if this statement fails.
+
+        try:
+            return getattr(self.database, method)(*args, **kwargs)
+        except Exception:
+            try:
+                self.database.rollback()
+            except Exception:  # A broken connection is discarded when the handle is released.
+                pass
+            raise
+
+
+class InMemoryDatabase(DatabaseInterface):
+    """
+    A SQLite in-memory database that runs the queries DBMS issues, for tests and benchmarks without Postgres.
+
+    Every instance with the same name shares one connection, so handles opened per request see the same
+    data, like connections to one Postgres server. Queries keep their psycopg2 %s placeholders and are
+    translated on the fly. TIMESTAMP columns are stored as naive UTC ISO strings and read back as datetimes,
+    aware ones for TIMESTAMP WITH TIME ZONE, and a now() SQL function returns the current UTC time.
+    Row locks (FOR UPDATE) are dropped, since the shared connection already runs one statement at a time.
+
+    Attributes:
+        name (str): Name of the shared database.
+        connection (sqlite3.Connection): The shared connection, None once this handle is closed.
+
+    Methods:
+        execute_query(query, params=None, fetch='all' or 'one' or None): Executes a query on the database.
+        commit(): Commits the changes made to the database.
+        close(): Releases this handle, rolling back uncommitted changes.
+        load_schema(path='schema.sql'): Creates the tables of a Postgres schema file.
+        load_fixtures(fixtures): Inserts rows given as {table: [row dict, ...]}.
+        drop(name='videostream'): Discards a shared database.
+    """
+    __databases: dict = {}
+
+    # Postgres schema syntax and its SQLite equivalent, applied in order by load_schema.
+    __SCHEMA_REWRITES: tuple = (
+        (re.compile(r'\bSERIAL PRIMARY KEY\b', re.I), 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+        (re.compile(r'\bUUID\b', re.I), 'TEXT'),
+        (re.compile(r'\bTIMESTAMP WITH TIME ZONE\b', re.I), 'PGTIMESTAMPTZ'),
+        (re.compile(r'\bTIMESTAMP(?: WITHOUT TIME ZONE)?\b', re.I), 'PGTIMESTAMP'),
+        (re.compile(r"DEFAULT (?:timezone\('UTC'::text, now\(\)\)|\(NOW\(\) AT TIME ZONE 'UTC'\))", re.I),
+         "DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))"),
+    )
+    __TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?$')
+
+    def __init__(self, name: str = 'videostream'):
+        """
+        Opens a handle on the shared in-memory database, creating it empty on first use.
+
+        Args:
+            name (str, optional): Name of the shared database (default: videostream).
+        """
+        self.name = name
+
+        if name not in self.__databases:
+            self.__databases[name] = self.__connect()
+
+        self.connection = self.__databases[name]
+
+    def execute_query(self, query, params=None, fetch='all'):
+        """
+        Executes a query on the in-memory database.
+
+        Args:
+            query (str): The SQL query to be executed, with %s placeholders.
+            params (tuple, optional): The parameters to be passed to the query (default: None).
+            fetch (str, optional): Specifies whether to fetch 'all' rows, 'one' row, or None and return True. (default: 'all').
+
+        Returns:
+            list or tuple or bool: The result of the query execution.
+        """
+        if params is None:
+            cursor = self.connection.execute(query)
+        else:
+            cursor = self.connection.execute(self.__translate(query), tuple(self.__adapt(value) for value in params))
+
+        try:
+            if fetch == 'all':
+                return [self.__convert_row(row) for row in cursor.fetchall()]
+            elif fetch == 'one':
+                row = cursor.fetchone()
+                return self.__convert_row(row) if row is not None else None
+            elif fetch is None:
+                return True
+        finally:
+            cursor.close()
+
+    def commit(self):
+        """
+        Commits the changes made to the in-memory database.
+        """
+        self.connection.commit()
+
+    def rollback(self):
+        """
+        Rolls back the uncommitted changes made to the in-memory database.
+        """
+        self.connection.rollback()
+
+    def close(self):
+        """
+        Releases this handle. The shared database stays open, minus any uncommitted changes.
+        """
+        if self.connection is None:
+            return
+
+        if self.connection.in_transaction:
+            self.connection.rollback()
+
+        self.connection = None
+
+    def load_schema(self, path: str = 'schema.sql'):
+        """
+        Creates the tables of a Postgres schema file, such as the repository's schema.sql.
+
+        Args:
+            path (str, optional): Path of the schema file (default: schema.sql).
+        """
+        with open(path, 'r') as f:
+            schema = f.read()
+
+        for pattern, replacement in self.__SCHEMA_REWRITES:
+            schema = pattern.sub(replacement, schema)
+
+        self.connection.executescript(schema)
+
+    def load_fixtures(self, fixtures: dict):
+        """
+        Inserts fixture rows and commits them.
+
+        Args:
+            fixtures (dict): Rows to insert per table, e.g. {'users': [{'user_id': ..., 'username': ...}]}.
+        """
+        for table, rows in fixtures.items():
+            for row in rows:
+                columns = ', '.join(row)
+                placeholders = ', '.join(['%s'] * len(row))
+                self.execute_query(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", tuple(row.values()), fetch=None)
+
+        self.commit()
+
+    @classmethod
+    def drop(cls, name: str = 'videostream'):
+        """
+        Discards a shared database, the next handle with this name starts empty.
+
+        Args:
+            name (str, optional): Name of the shared database (default: videostream).
+        """
+        connection = cls.__databases.pop(name, None)
+
+        if connection is not None:
+            connection.close()
+
+    @classmethod
+    def __connect(cls) -> sqlite3.Connection:
+        connection = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.create_function('now', 0, lambda: cls.__adapt(datetime.utcnow()))
+        return connection
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def __translate(query: str) -> str:
+        return re.sub(r'\s+FOR UPDATE\b', '', query, flags=re.I).replace('%s', '?').replace('%%', '%')
+
+    @staticmethod
+    def __adapt(value):
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            return value.isoformat(' ')
+
+        return value
+
+    @classmethod
+    def __convert_row(cls, row: tuple) -> tuple:
+        # Declared columns are converted by sqlite3; this catches expressions such as max(created_at).
+        return tuple(
+            datetime.fromisoformat(value) if isinstance(value, str) and cls.__TIMESTAMP.match(value) else value
+            for value in row
+        )
+
+
+def _convert_timestamp(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode())
+
+
+def _convert_timestamptz(value: bytes) -> datetime:
+    value = datetime.fromisoformat(value.decode())
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+sqlite3.register_converter('PGTIMESTAMP', _convert_timestamp)
+sqlite3.register_converter('PGTIMESTAMPTZ', _convert_timestamptz)
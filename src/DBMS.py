@@ -1,35 +1,68 @@
-from flask_bcrypt import Bcrypt
-
 from src.DBInterfaces import DatabaseInterface
+from src.PasswordHasher import PasswordHasher, HashingQueueFull
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
+from src import password_hasher
+
+from collections import namedtuple
+import uuid, json, logging, os
+
+logger = get_logger('DBMS')
+
+# Rows are returned as named tuples of the selected columns, so callers read them by name.
+User = namedtuple('User', ('user_id', 'username', 'password_hash'))
+Movie = namedtuple('Movie', ('movie_id', 'movie_title', 'movie_path', 'movie_thumbnail'))
+AccessCode = namedtuple('AccessCode', ('code_id', 'movie_id', 'user_id', 'expires_at'))
+Stream = namedtuple('Stream', ('code_id', 'movie_id', 'movie_path', 'expires_at'))
+
+errors = registry.counter('videostream_dbms_errors_total', 'DBMS operations that failed, by method.', ('method',))
+
+# Reasons insert_access_code gives for not inserting a code, besides errors.
+CODE_EXISTS = 'exists'
+LIVE_CODE_LIMIT = 'limit'
+
 
-import uuid, json
+def _log_error(method: str, error: Exception):
+    log_event(logger, logging.ERROR, method, error=repr(error))
+    errors.inc(labels=(method,))
 
 
 class DBMS:
-    def __init__(self, database: DatabaseInterface):
+    MAX_LIVE_CODES_PER_USER: int = int(os.environ.get('MAX_LIVE_CODES_PER_USER', 20))
+
+    def __init__(self, database: DatabaseInterface, hasher: PasswordHasher = None):
         self.database = database
-        self.bcrypt = Bcrypt()
+        self.hasher = hasher or password_hasher
 
     @staticmethod
     def __generate_uuid() -> str:
         return str(uuid.uuid4())
 
-    def __check_user_id(self, user_id: str) -> tuple or None:
+    def __lock_user(self, user_id: str) -> bool:
+        """
+        Locks a user's row until the end of the transaction, so concurrent code inserts for the user run one at a time.
+
+        Args:
+            user_id (str): The user ID to lock.
+
+        Returns:
+            bool: True if the user exists, False otherwise.
+        """
+        query = "SELECT user_id FROM users WHERE user_id = %s FOR UPDATE"
+        return self.database.execute_prepared('lock_user', query, (user_id,), fetch='one') is not None
+
+    def __count_live_codes(self, user_id: str) -> int:
         """
-        Checks if a user ID exists in the database.
+        Counts the unexpired access codes of a user.
 
         Args:
             user_id (str): The user ID to check.
 
         Returns:
-            tuple or None: The user data if the user ID exists, None otherwise.
+            int: The number of live access codes.
         """
-        try:
-            query = "SELECT * FROM users WHERE user_id = %s"
-            return self.database.execute_query(query, (user_id,), fetch='one')
-        except Exception as e:
-            print('[__check_user_id]', e)
-            return
+        query = "SELECT count(*) FROM access_codes WHERE user_id = %s AND expires_at > now()"
+        return self.database.execute_prepared('count_live_codes', query, (user_id,), fetch='one')[0]
 
     def check_username(self, username: str) -> tuple or None:
         """
@@ -39,13 +72,14 @@ class DBMS:
             username (str): The username to check.
 
         Returns:
-            tuple or None: The user data if the username exists, None otherwise.
+            User or None: The user if the username exists, None otherwise.
         """
         try:
-            query = "SELECT * FROM users WHERE username = %s"
-            return self.database.execute_query(query, (username,), fetch='one')
+            query = "SELECT user_id, username, password_hash FROM users WHERE username = %s"
+            row = self.database.execute_prepared('check_username', query, (username,), fetch='one')
+            return User._make(row) if row is not None else None
         except Exception as e:
-            print('[check_username]', e)
+            _log_error('check_username', e)
             return
         
     def login_user(self, username: str, password: str) -> tuple:
@@ -66,18 +100,19 @@ class DBMS:
             if check_username is None:
                 return False, "Username is incorrect!"
             
-            user_id, sql_password_hash = check_username[0], check_username[2]
-
-            if not self.bcrypt.check_password_hash(sql_password_hash, password):
+            if not self.hasher.check_password_hash(check_username.password_hash, password):
                 return False, "Password is incorrect!"
 
             return True, json.dumps({
-                "user_id": user_id,
+                "user_id": check_username.user_id,
                 "user_name": username,
             })
 
+        except HashingQueueFull as e:
+            return False, str(e)
+
         except Exception as e:
-            print('[login_user]', e)
+            _log_error('login_user', e)
             return False, 'e'
         
     def register_user(self, username: str, password: str) -> tuple:
@@ -99,10 +134,10 @@ class DBMS:
                 return False, "Username already exists."
 
             user_id = self.__generate_uuid()
-            password_hash = self.bcrypt.generate_password_hash(password).decode('utf-8')
+            password_hash = self.hasher.generate_password_hash(password)
 
             query = "INSERT INTO users (user_id, username, password_hash) VALUES (%s, %s, %s)"
-            self.database.execute_query(query, (user_id, username, password_hash), fetch=None)
+            self.database.execute_prepared('register_user', query, (user_id, username, password_hash), fetch=None)
             self.database.commit()
 
             return True, json.dumps({
@@ -110,14 +145,21 @@ class DBMS:
                 "user_name": username,
             })
 
+        except HashingQueueFull as e:
+            return False, str(e)
+
         except Exception as e:
-            print('[register_user]', e)
+            _log_error('register_user', e)
             return False, e
         
-    def insert_access_code(self, access_code: str, movie_id: int, user_id: str, expiration_date) -> bool:
+    def insert_access_code(self, access_code: str, movie_id: int, user_id: str, expiration_date) -> tuple:
         """
         Inserts an access code into the database.
 
+        Users already holding MAX_LIVE_CODES_PER_USER unexpired codes cannot get another one until some expire.
+        The user's row is locked before the codes are counted, so concurrent requests cannot both pass the cap.
+        A code that already exists is left untouched, so the caller can retry with another one.
+
         Args:
             access_code (str): The access code to insert.
             movie_id (int): The ID of the movie associated with the access code.
@@ -125,23 +167,34 @@ class DBMS:
             expiration_date: The expiration date of the access code.
 
         Returns:
-            bool: True if the access code is successfully inserted, False otherwise.
+            tuple: True and the access code if it was inserted, otherwise False and CODE_EXISTS if the code already exists,
+                   LIVE_CODE_LIMIT if the user holds too many live codes, or an error message.
         """
         try:
-            check_user = self.__check_user_id(user_id)
-
-            if check_user is None:
-                return False
-            
-            query = "INSERT INTO access_codes (code_id, movie_id, user_id, expires_at) VALUES (%s, %s, %s, %s)"
-            self.database.execute_query(query, (access_code, movie_id, user_id, expiration_date), fetch=None)
+            if not self.__lock_user(user_id):
+                self.database.rollback()
+                return False, "User does not exist!"
+
+            if self.MAX_LIVE_CODES_PER_USER:
+                live_codes = self.__count_live_codes(user_id)
+
+                if live_codes >= self.MAX_LIVE_CODES_PER_USER:
+                    self.database.rollback()
+                    log_event(logger, logging.WARNING, 'live_code_cap', user_id=user_id, live_codes=live_codes)
+                    return False, LIVE_CODE_LIMIT
+
+            query = (
+                "INSERT INTO access_codes (code_id, movie_id, user_id, expires_at) VALUES (%s, %s, %s, %s) "
+                "ON CONFLICT (code_id) DO NOTHING RETURNING code_id"
+            )
+            inserted = self.database.execute_prepared('insert_access_code', query, (access_code, movie_id, user_id, expiration_date), fetch='one')
             self.database.commit()
 
-            return True
-        
+            return (True, access_code) if inserted is not None else (False, CODE_EXISTS)
+
         except Exception as e:
-            print('[insert_access_code]', e)
-            return False
+            _log_error('insert_access_code', e)
+            return False, e
 
     def fetch_access_code(self, access_code: str) -> tuple:
         """
@@ -151,35 +204,167 @@ class DBMS:
             access_code (str): The access code to fetch.
 
         Returns:
-            tuple: A tuple containing a boolean value indicating whether the access code exists and the fetched data.
+            tuple: A tuple containing a boolean value indicating whether the access code exists and the fetched AccessCode.
                    If the access code does not exist, the boolean value will be False and an error message will be returned.
         """
         try:
-            query = "SELECT * FROM access_codes WHERE code_id = %s"
-            sql = self.database.execute_query(query, (access_code,), fetch='one')
+            query = "SELECT code_id, movie_id, user_id, expires_at FROM access_codes WHERE code_id = %s"
+            sql = self.database.execute_prepared('fetch_access_code', query, (access_code,), fetch='one')
+
+            if sql is None:
+                return False, "Access code does not exist!"
+
+            return True, AccessCode._make(sql)
+
+        except Exception as e:
+            _log_error('fetch_access_code', e)
+            return False, e
+
+    def fetch_stream(self, access_code: str) -> tuple:
+        """
+        Validates an access code and fetches the movie it opens, in a single query.
+
+        Expiry is checked by the database against its own clock.
+
+        Args:
+            access_code (str): The access code to validate.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating whether the access code is valid and the fetched Stream,
+                   or an error message if the code does not exist or has expired.
+        """
+        try:
+            query = (
+                "SELECT a.code_id, a.movie_id, m.movie_path, a.expires_at, a.expires_at > now() "
+                "FROM access_codes a JOIN movies m ON m.movie_id = a.movie_id "
+                "WHERE a.code_id = %s"
+            )
+            sql = self.database.execute_prepared('fetch_stream', query, (access_code,), fetch='one')
 
             if sql is None:
                 return False, "Access code does not exist!"
 
-            return True, sql
+            if not sql[4]:
+                return False, "Access code has expired."
+
+            return True, Stream._make(sql[:4])
+
+        except Exception as e:
+            _log_error('fetch_stream', e)
+            return False, e
+
+    def purge_expired_access_codes(self, batch_size: int) -> tuple:
+        """
+        Deletes up to batch_size expired access codes and commits.
+
+        Args:
+            batch_size (int): Maximum number of codes deleted.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the result and the list of deleted codes,
+                   or an error if not.
+        """
+        try:
+            query = (
+                "DELETE FROM access_codes WHERE code_id IN "
+                "(SELECT code_id FROM access_codes WHERE expires_at <= now() LIMIT %s) "
+                "RETURNING code_id"
+            )
+            rows = self.database.execute_prepared('purge_expired_access_codes', query, (batch_size,))
+            self.database.commit()
+
+            return True, [row[0] for row in rows]
+
+        except Exception as e:
+            _log_error('purge_expired_access_codes', e)
+            return False, e
+
+    def revoke_access_token(self, nonce: str, expires_at) -> bool:
+        """
+        Records a signed access token's nonce as revoked until the token expires.
+
+        Args:
+            nonce (str): The token's nonce, in hex.
+            expires_at: The token's expiry, after which the record can be purged.
+
+        Returns:
+            bool: True if the nonce is recorded, False otherwise.
+        """
+        try:
+            query = "INSERT INTO revoked_access_tokens (nonce, expires_at) VALUES (%s, %s) ON CONFLICT (nonce) DO NOTHING"
+            self.database.execute_query(query, (nonce, expires_at), fetch=None)
+            self.database.commit()
+
+            return True
+
+        except Exception as e:
+            _log_error('revoke_access_token', e)
+            return False
+
+    def fetch_revoked_access_tokens(self) -> tuple:
+        """
+        Fetches the nonces of the revoked signed access tokens that have not expired yet.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the fetch result and the list of nonces,
+                   or an error if not.
+        """
+        try:
+            query = "SELECT nonce FROM revoked_access_tokens WHERE expires_at > now()"
+            return True, [row[0] for row in self.database.execute_prepared('fetch_revoked_access_tokens', query)]
+
+        except Exception as e:
+            _log_error('fetch_revoked_access_tokens', e)
+            return False, e
+
+    def purge_expired_revocations(self) -> tuple:
+        """
+        Deletes the revocations of signed access tokens that have expired and commits.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the result and the number of deleted rows,
+                   or an error if not.
+        """
+        try:
+            query = "DELETE FROM revoked_access_tokens WHERE expires_at <= now() RETURNING nonce"
+            rows = self.database.execute_query(query)
+            self.database.commit()
+
+            return True, len(rows)
 
         except Exception as e:
-            print('[fetch_access_code]', e)
+            _log_error('purge_expired_revocations', e)
             return False, e
 
     def fetch_movies(self):
         try:
-            query = "SELECT * FROM movies"
-            sql = self.database.execute_query(query)
+            query = "SELECT movie_id, movie_title, movie_path, movie_thumbnail FROM movies ORDER BY movie_id"
+            sql = self.database.execute_prepared('fetch_movies', query)
             if sql:
-                return True, sql
+                return True, [Movie._make(row) for row in sql]
             else:
                 return False, sql
 
         except Exception as e:
-            print('[fetch_movies]', e)
+            _log_error('fetch_movies', e)
             return False, e
         
+    def fetch_movies_version(self) -> tuple:
+        """
+        Fetches a cheap version stamp of the movies table.
+
+        Returns:
+            tuple: A tuple containing a boolean indicating the fetch result and a (row count, latest created_at) tuple,
+                   or an error message if not.
+        """
+        try:
+            query = "SELECT count(*), max(created_at) FROM movies"
+            return True, tuple(self.database.execute_prepared('fetch_movies_version', query, fetch='one'))
+
+        except Exception as e:
+            _log_error('fetch_movies_version', e)
+            return False, e
+
     def fetch_movie(self, movie_id: int) -> tuple:
         """
         Fetches a specific movie from the database.
@@ -188,19 +373,22 @@ class DBMS:
             movie_id (int): The ID of the movie to fetch.
 
         Returns:
-            tuple: A tuple containing a boolean indicating the fetch result and the movie data
+            tuple: A tuple containing a boolean indicating the fetch result and the Movie
                    if the fetch is successful, or an error message if not.
         """
+        if isinstance(movie_id, int) and not -2 ** 31 <= movie_id < 2 ** 31:  # Outside the SERIAL range the prepared statement accepts.
+            return False, "Movie does not exist."
+
         try:
-            query = "SELECT * FROM movies WHERE movie_id = %s"
-            sql = self.database.execute_query(query, (movie_id,), fetch='one')
+            query = "SELECT movie_id, movie_title, movie_path, movie_thumbnail FROM movies WHERE movie_id = %s"
+            sql = self.database.execute_prepared('fetch_movie', query, (movie_id,), fetch='one')
             if sql:
-                return True, sql
+                return True, Movie._make(sql)
             else:
                 return False, "Movie does not exist."
 
         except Exception as e:
-            print('[fetch_movie]', e)
+            _log_error('fetch_movie', e)
             return False, e
 
     def close_connection(self):
@@ -0,0 +1,173 @@
+from flask import Blueprint
+import click
+
+from src.AccessTokens import access_tokens
+from src.DBMS import DBMS
+from src.CodeManage import CodeManage
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
+from src import open_database, socketio
+
+import glob, logging, os
+
+logger = get_logger('Housekeeping')
+
+housekeeping = Blueprint('housekeeping', __name__, cli_group=None)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+PURGE_INTERVAL = float(os.environ.get('ACCESS_CODE_PURGE_INTERVAL', 0))
+PURGE_BATCH_SIZE = int(os.environ.get('ACCESS_CODE_PURGE_BATCH_SIZE', 1000))
+
+codes_purged = registry.counter('videostream_access_codes_purged_total', 'Expired access codes deleted.')
+
+
+def apply_migrations(directory: str = MIGRATIONS_DIR) -> list:
+    """
+    Applies the migration files not yet recorded in the schema_migrations table, in file name order.
+
+    Each migration runs and is recorded in its own transaction.
+
+    Args:
+        directory (str, optional): The directory holding the *.sql migrations (default: the repository's migrations/).
+
+    Returns:
+        list: The file names of the migrations applied.
+    """
+    database = open_database()
+    applied = []
+
+    try:
+        database.execute_query(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version VARCHAR(255) PRIMARY KEY, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)", fetch=None)
+        database.commit()
+        done = {row[0] for row in database.execute_query("SELECT version FROM schema_migrations")}
+
+        for path in sorted(glob.glob(os.path.join(directory, '*.sql'))):
+            version = os.path.basename(path)
+
+            if version in done:
+                continue
+
+            with open(path, 'r') as f:
+                database.execute_query(f.read(), fetch=None)
+
+            database.execute_query("INSERT INTO schema_migrations (version) VALUES (%s)", (version,), fetch=None)
+            database.commit()
+            applied.append(version)
+            log_event(logger, logging.INFO, 'migration_applied', version=version)
+
+    finally:
+        database.close()
+
+    return applied
+
+
+def purge_expired_codes(batch_size: int = PURGE_BATCH_SIZE, max_batches: int = None, pause: float = 0.0) -> int:
+    """
+    Deletes expired access codes in batches of at most batch_size rows.
+
+    Every batch is its own short transaction on a freshly borrowed connection, so the purge never holds
+    locks or a pooled connection for long, and the deleted codes are dropped from the access code cache.
+    Revocations of signed tokens that have expired are deleted afterwards.
+
+    Args:
+        batch_size (int, optional): Rows deleted per batch (default: ACCESS_CODE_PURGE_BATCH_SIZE or 1000).
+        max_batches (int, optional): Stop after this many batches (default: until no expired code is left).
+        pause (float, optional): Seconds to sleep between batches (default: 0).
+
+    Returns:
+        int: The number of codes deleted.
+    """
+    total = 0
+    batches = 0
+
+    while True:
+        db = DBMS(open_database())
+
+        try:
+            statement, codes = db.purge_expired_access_codes(batch_size)
+        finally:
+            db.close_connection()
+
+        if statement is False:
+            break
+
+        for code in codes:
+            CodeManage.cache.pop(code)
+
+        total += len(codes)
+        batches += 1
+        codes_purged.inc(len(codes))
+
+        if len(codes) < batch_size or (max_batches is not None and batches >= max_batches):
+            break
+
+        if pause:
+            socketio.sleep(pause)
+
+    db = DBMS(open_database())
+
+    try:
+        db.purge_expired_revocations()
+    finally:
+        db.close_connection()
+
+    log_event(logger, logging.INFO, 'purge_expired_codes', deleted=total, batches=batches)
+    return total
+
+
+def start_purge_task(app):
+    """
+    Starts a background task purging expired access codes every ACCESS_CODE_PURGE_INTERVAL seconds.
+    Does nothing when the interval is 0, the default.
+
+    Args:
+        app (Flask): The application, whose context the purge runs in.
+    """
+    if PURGE_INTERVAL <= 0:
+        return
+
+    def run():
+        while True:
+            socketio.sleep(PURGE_INTERVAL)
+
+            with app.app_context():
+                try:
+                    purge_expired_codes(pause=0.1)
+                except Exception as e:
+                    log_event(logger, logging.ERROR, 'purge_expired_codes', error=repr(e))
+
+    socketio.start_background_task(run)
+
+
+@housekeeping.cli.command('migrate')
+def migrate_command():
+    """
+    Applies the pending database migrations.
+    """
+    applied = apply_migrations()
+    click.echo(f"Applied {len(applied)} migration(s): {', '.join(applied)}" if applied else "No pending migrations.")
+
+
+@housekeeping.cli.command('purge-expired-codes')
+@click.option('--batch-size', default=PURGE_BATCH_SIZE, show_default=True, help='Rows deleted per batch.')
+@click.option('--max-batches', type=int, default=None, help='Stop after this many batches.')
+@click.option('--pause', default=0.0, show_default=True, help='Seconds to sleep between batches.')
+def purge_expired_codes_command(batch_size, max_batches, pause):
+    """
+    Deletes expired access codes in bounded batches.
+    """
+    click.echo(f"Deleted {purge_expired_codes(batch_size, max_batches, pause)} expired access code(s).")
+
+
+@housekeeping.cli.command('revoke-access-token')
+@click.argument('token')
+def revoke_access_token_command(token):
+    """
+    Revokes a signed access token until it expires.
+    """
+    if not access_tokens.revoke(token):
+        raise click.ClickException("Not a valid signed access token, or the revocation could not be saved.")
+
+    click.echo("Access token revoked.")
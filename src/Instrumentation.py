@@ -0,0 +1,266 @@
+from flask import g, has_request_context, request
+
+from src.DBInterfaces import DatabaseInterface
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
+
+from collections import deque
+import functools, logging, os, re, threading, time
+
+logger = get_logger('Instrumentation')
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s")
+_WHITESPACE = re.compile(r'\s+')
+
+query_duration = registry.histogram('videostream_db_query_duration_seconds', 'Database query durations, by route or socket event.', ('scope',))
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """
+    Normalizes a query so that executions differing only in their parameters aggregate together.
+
+    Args:
+        query (str): The SQL query.
+
+    Returns:
+        str: The query with collapsed whitespace and literals and placeholders replaced by ?.
+    """
+    return _LITERALS.sub('?', _WHITESPACE.sub(' ', query).strip())
+
+
+def current_scope() -> str:
+    """
+    Names what the running code is serving, used to group the query statistics.
+
+    Returns:
+        str: "socket:<event>" inside a socket event, the URL rule inside a request, "unmatched" for a request
+             no route matched, "background" otherwise. Scopes never contain the request path, so clients
+             cannot create new ones.
+    """
+    if not has_request_context():
+        return 'background'
+
+    event = getattr(request, 'event', None)
+
+    if event is not None:
+        return f"socket:{event['message']}"
+
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+class QueryStats:
+    """
+    Per-scope and per-query statistics of the queries run through InstrumentedDatabase.
+
+    A scope is a route or a socket event (see current_scope). For every scope the number of requests
+    and queries per request are kept, and for every query fingerprint within it the count, errors,
+    rows and the latest durations, from which the p95 is computed. Queries slower than slow_query_ms
+    are logged as slow_query events.
+
+    Attributes:
+        slow_query_ms (float): Duration above which a query is logged, 0 to disable.
+        window (int): Number of latest durations kept per query for the percentiles.
+
+    Methods:
+        init_app(app): Configures the statistics from the environment and registers them on the app.
+        record(query, duration, rows, error=False): Records one query execution.
+        snapshot(): Returns the aggregates as a dictionary.
+        reset(): Clears the aggregates.
+    """
+    def __init__(self, slow_query_ms: float = 100.0, window: int = 1024):
+        """
+        Initializes empty statistics.
+
+        Args:
+            slow_query_ms (float, optional): Slow query threshold in milliseconds (default: 100).
+            window (int, optional): Durations kept per query for the percentiles (default: 1024).
+        """
+        self.slow_query_ms = slow_query_ms
+        self.window = window
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Configures the statistics from the environment and counts the queries of each request.
+
+        Environment:
+            SLOW_QUERY_MS: Slow query threshold in milliseconds, 0 to disable (default: 100).
+
+        Args:
+            app (Flask): The application.
+        """
+        self.slow_query_ms = float(os.environ.get('SLOW_QUERY_MS', self.slow_query_ms))
+        app.extensions['query_stats'] = self
+        app.teardown_request(self.__finish_request)
+
+    def record(self, query: str, duration: float, rows: int, error: bool = False):
+        """
+        Records one query execution.
+
+        Args:
+            query (str): The SQL query.
+            duration (float): Execution time in seconds.
+            rows (int): Number of rows returned.
+            error (bool, optional): Whether the query raised (default: False).
+        """
+        scope = current_scope()
+        key = fingerprint(query)
+
+        with self._lock:
+            stats = self.__scope(scope)['queries'].get(key)
+
+            if stats is None:
+                stats = self._scopes[scope]['queries'][key] = {
+                    'count': 0, 'errors': 0, 'rows': 0, 'total_ms': 0.0, 'durations': deque(maxlen=self.window)
+                }
+
+            stats['count'] += 1
+            stats['errors'] += error
+            stats['rows'] += rows
+            stats['total_ms'] += duration * 1000
+            stats['durations'].append(duration * 1000)
+
+        query_duration.observe(duration, labels=(scope,))
+
+        if has_request_context():
+            g.db_queries = g.get('db_queries', 0) + 1
+
+        if self.slow_query_ms and duration * 1000 >= self.slow_query_ms:
+            log_event(logger, logging.WARNING, 'slow_query', scope=scope, query=key,
+                      duration_ms=round(duration * 1000, 3), rows=rows, error=error)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the aggregates.
+
+        Returns:
+            dict: Per scope, the requests, queries per request and per-query count, errors, rows, mean and p95 in milliseconds.
+        """
+        with self._lock:
+            return {scope: {
+                'requests': stats['requests'],
+                'queries_per_request': round(stats['request_queries'] / stats['requests'], 2) if stats['requests'] else None,
+                'queries': {key: {
+                    'count': query['count'],
+                    'errors': query['errors'],
+                    'rows': query['rows'],
+                    'mean_ms': round(query['total_ms'] / query['count'], 3),
+                    'p95_ms': round(self.__percentile(query['durations'], 0.95), 3),
+                } for key, query in stats['queries'].items()},
+            } for scope, stats in self._scopes.items()}
+
+    def reset(self):
+        """
+        Clears the aggregates.
+        """
+        with self._lock:
+            self._scopes.clear()
+
+    def __scope(self, scope: str) -> dict:
+        stats = self._scopes.get(scope)
+
+        if stats is None:
+            stats = self._scopes[scope] = {'requests': 0, 'request_queries': 0, 'queries': {}}
+
+        return stats
+
+    def __finish_request(self, exception=None):
+        queries = g.pop('db_queries', 0)
+
+        with self._lock:
+            stats = self.__scope(current_scope())
+            stats['requests'] += 1
+            stats['request_queries'] += queries
+
+    @staticmethod
+    def __percentile(values, fraction: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class InstrumentedDatabase(DatabaseInterface):
+    """
+    Wraps a DatabaseInterface and records the fingerprint, duration and row count of every query.
+
+    Attributes:
+        database (DatabaseInterface): The wrapped database.
+        stats (QueryStats): Where the executions are recorded.
+    """
+    def __init__(self, database: DatabaseInterface, stats: QueryStats):
+        """
+        Initializes the wrapper.
+
+        Args:
+            database (DatabaseInterface): The database to wrap.
+            stats (QueryStats): Where the executions are recorded.
+        """
+        self.database = database
+        self.stats = stats
+
+    def execute_query(self, query, params=None, **kwargs):
+        """
+        Executes a query on the wrapped database and records it.
+
+        Args:
+            query (str): The SQL query to execute.
+            params (tuple, optional): The parameters to be passed to the query.
+            **kwargs: Passed to the wrapped execute_query, e.g. fetch.
+
+        Returns:
+            The result of the wrapped execute_query.
+        """
+        return self.__record(self.database.execute_query, query, query, params, **kwargs)
+
+    def execute_prepared(self, name, query, params=None, **kwargs):
+        """
+        Executes a prepared query on the wrapped database and records it.
+
+        Args:
+            name (str): A name unique to this query text.
+            query (str): The SQL query to execute.
+            params (tuple, optional): The parameters to be passed to the query.
+            **kwargs: Passed to the wrapped execute_prepared, e.g. fetch.
+
+        Returns:
+            The result of the wrapped execute_prepared.
+        """
+        return self.__record(self.database.execute_prepared, query, name, query, params, **kwargs)
+
+    def commit(self):
+        """
+        Commits the changes made to the wrapped database.
+        """
+        self.database.commit()
+
+    def rollback(self):
+        """
+        Rolls back the wrapped database.
+        """
+        self.database.rollback()
+
+    def close(self):
+        """
+        Closes the wrapped database.
+        """
+        self.database.close()
+
+    def __record(self, execute, query: str, *args, **kwargs):
+        started = time.perf_counter()
+
+        try:
+            result = execute(*args, **kwargs)
+        except Exception:
+            self.stats.record(query, time.perf_counter() - started, 0, error=True)
+            raise
+
+        self.stats.record(query, time.perf_counter() - started, self.__rows(result))
+        return result
+
+    @staticmethod
+    def __rows(result) -> int:
+        if isinstance(result, list):
+            return len(result)
+
+        return 1 if isinstance(result, tuple) else 0
@@ -0,0 +1,106 @@
+from logging.handlers import QueueHandler, QueueListener
+import logging, json, os, queue, random, sys, atexit
+
+ROOT_LOGGER = 'videostream'
+
+_sample_rates = {}
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a log record as a single JSON line, including the structured fields passed to log_event.
+    """
+    def format(self, record):
+        payload = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'event': getattr(record, 'event', None) or record.getMessage(),
+        }
+        payload.update(getattr(record, 'fields', {}))
+        return json.dumps(payload, default=str)
+
+
+def get_logger(module: str) -> logging.Logger:
+    """
+    Returns the logger of a module, e.g. get_logger('SocketEvents').
+
+    Args:
+        module (str): The module name, used to control its level through LOG_LEVELS.
+
+    Returns:
+        logging.Logger: The module logger.
+    """
+    return logging.getLogger(f'{ROOT_LOGGER}.{module}')
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields):
+    """
+    Logs a structured event.
+
+    Disabled levels return before anything is formatted, and events listed in LOG_SAMPLE_RATES are only
+    logged for the configured fraction of calls, so the call is cheap on hot paths.
+
+    Args:
+        logger (logging.Logger): The module logger.
+        level (int): The logging level, e.g. logging.DEBUG.
+        event (str): The event name, also used as the sampling key.
+        **fields: Structured fields added to the JSON line.
+    """
+    if not logger.isEnabledFor(level):
+        return
+
+    rate = _sample_rates.get(event)
+    if rate is not None and random.random() >= rate:
+        return
+
+    # Payload dicts are copied because the record is formatted later, on the listener thread.
+    fields = {key: dict(value) if isinstance(value, dict) else value for key, value in fields.items()}
+    logger.log(level, event, extra={'event': event, 'fields': fields})
+
+
+def _parse_pairs(value: str) -> dict:
+    pairs = {}
+
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        key, _, setting = item.partition('=')
+        pairs[key.strip()] = setting.strip()
+
+    return pairs
+
+
+def setup_logging():
+    """
+    Configures the videostream loggers from the environment. Calling it again is a no-op.
+
+    Records are put on an in-memory queue and written to stdout as JSON lines by a background thread,
+    so logging never blocks the eventlet hub on a stdout write.
+
+    Environment:
+        LOG_LEVEL: Level of every module (default: INFO).
+        LOG_LEVELS: Per-module levels, e.g. "SocketEvents=DEBUG,DBMS=WARNING".
+        LOG_SAMPLE_RATES: Fraction of events logged per event name, e.g. "sync_command=0.01".
+    """
+    global _listener
+
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    root.propagate = False
+
+    for module, level in _parse_pairs(os.environ.get('LOG_LEVELS', '')).items():
+        get_logger(module).setLevel(level.upper())
+
+    _sample_rates.update({event: float(rate) for event, rate in _parse_pairs(os.environ.get('LOG_SAMPLE_RATES', '')).items()})
@@ -0,0 +1,98 @@
+from eventlet.green import socket
+import socketio
+
+from src.Logger import get_logger, log_event
+
+import atexit, glob, logging, os, pickle, stat, tempfile
+
+
+logger = get_logger('MessageQueue')
+
+
+class UnixSocketManager(socketio.PubSubManager):
+    """
+    A Socket.IO client manager that shares emits between the worker processes of one machine
+    through Unix datagram sockets, without an external message broker.
+
+    Every worker binds a socket named <channel>.<host_id>.sock in the queue directory and publishes
+    each message to every other socket found there. It is meant for tests and single-host
+    deployments; use a Redis or AMQP URL for SOCKETIO_MESSAGE_QUEUE across hosts.
+
+    Messages are pickled, so anyone able to write to the directory could run code in the workers.
+    The directory defaults to a per-user one in the temp dir, is created with mode 0700, and is
+    refused if it is owned by another user or open to the group or others.
+
+    Attributes:
+        directory (str): The directory holding the worker sockets.
+        path (str): The socket this worker listens on.
+    """
+    name = 'unix'
+    MAX_MESSAGE_SIZE: int = 65536
+    DEFAULT_DIRECTORY: str = os.path.join(tempfile.gettempdir(), f'videostream-mq-{os.getuid()}')
+
+    def __init__(self, url: str = 'unix://', channel: str = 'flask-socketio',
+                 write_only: bool = False, logger=None):
+        """
+        Initializes the manager.
+
+        Args:
+            url (str, optional): unix:// URL of the queue directory (default: unix://, a private videostream-mq-<uid> temp dir).
+            channel (str, optional): Channel name, workers only talk to workers on the same channel (default: flask-socketio).
+            write_only (bool, optional): Only publish, never listen (default: False).
+            logger (optional): Logger used by python-socketio.
+
+        Raises:
+            PermissionError: If the directory is not a directory private to the current user.
+        """
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.directory = url[len('unix://'):] or self.DEFAULT_DIRECTORY
+        self.path = os.path.join(self.directory, f'{channel}.{self.host_id}.sock')
+        self._sender = None
+        self.__make_private(self.directory)
+
+    def _publish(self, data):
+        if self._sender is None:
+            self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        message = pickle.dumps(data)
+
+        if len(message) > self.MAX_MESSAGE_SIZE:
+            # The listeners could not read it whole, and sendto may refuse it with EMSGSIZE.
+            log_event(logger, logging.WARNING, 'message_dropped', channel=self.channel, size=len(message))
+            return
+
+        for peer in glob.glob(os.path.join(self.directory, f'{self.channel}.*.sock')):
+            if peer == self.path:
+                continue
+
+            try:
+                self._sender.sendto(message, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker that owned this socket is gone.
+                self.__unlink(peer)
+            except OSError as e:
+                log_event(logger, logging.WARNING, 'message_send_failed', peer=peer, error=str(e))
+
+    def _listen(self):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.__unlink(self.path)
+        listener.bind(self.path)
+        atexit.register(self.__unlink, self.path)
+
+        while True:
+            yield listener.recv(self.MAX_MESSAGE_SIZE)
+
+    @staticmethod
+    def __make_private(directory: str):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise PermissionError(f"Message queue directory {directory} must be a directory owned by this user with mode 0700.")
+
+    @staticmethod
+    def __unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
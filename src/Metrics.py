@@ -0,0 +1,95 @@
+from flask import Blueprint, Response, abort, g, jsonify, request
+
+from src.MetricsRegistry import registry
+from src import query_stats, db_pool, password_hasher
+
+import hmac, os, time
+
+metrics = Blueprint('metrics', __name__)
+
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', '0') == '1'
+
+requests_total = registry.counter('videostream_http_requests_total', 'HTTP requests, by route, method and status.',
+                                  ('route', 'method', 'status'))
+request_duration = registry.histogram('videostream_http_request_duration_seconds', 'HTTP request durations, by route.', ('route',))
+
+for field, help in (('created', 'Database connections opened.'), ('closed', 'Database connections closed.'),
+                    ('checkouts', 'Database connections checked out of the pool.'),
+                    ('waits', 'Checkouts that waited for a free connection.'),
+                    ('timeouts', 'Checkouts that timed out waiting for a free connection.'),
+                    ('evicted', 'Idle database connections closed by the pool.'),
+                    ('health_check_failures', 'Pooled connections discarded by a failed health check.')):
+    registry.callback_counter(f'videostream_db_pool_{field}_total', help, lambda field=field: db_pool.stats()[field])
+
+registry.gauge('videostream_db_pool_connections', 'Pooled database connections, by state.', ('state',),
+               function=lambda: {('idle',): db_pool.stats()['idle'], ('in_use',): db_pool.stats()['in_use']})
+registry.gauge('videostream_password_hash_jobs', 'Password hashing jobs pending or running.', function=password_hasher.pending)
+
+
+@metrics.before_app_request
+def start_timer():
+    """
+    Notes when the request started, for the request duration histogram.
+    """
+    g.request_started = time.perf_counter()
+
+
+@metrics.after_app_request
+def record_request(response):
+    """
+    Counts the request and records its duration by route.
+
+    Args:
+        response (Response): The response being sent.
+
+    Returns:
+        Response: The response, unchanged.
+    """
+    started = g.pop('request_started', None)
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    requests_total.inc(labels=(route, request.method, response.status_code))
+
+    if started is not None:
+        request_duration.observe(time.perf_counter() - started, labels=(route,))
+
+    return response
+
+
+@metrics.before_request
+def require_token():
+    """
+    Rejects metrics requests without the METRICS_TOKEN bearer token. Without a token the endpoints,
+    which reveal the route layout and query text, are closed unless METRICS_PUBLIC is 1.
+    """
+    if METRICS_TOKEN is None:
+        if not METRICS_PUBLIC:
+            abort(403)
+        return
+
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {METRICS_TOKEN}'):
+        abort(401)
+
+
+@metrics.route('/metrics')
+def prometheus():
+    """
+    Returns every registered metric in the Prometheus text exposition format.
+
+    Returns:
+        A text/plain response for a Prometheus scrape.
+    """
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@metrics.route('/metrics/queries')
+def queries():
+    """
+    Returns the database query statistics per route and socket event.
+
+    Returns:
+        A JSON response with, per scope, the requests, queries per request and the count, errors, rows,
+        mean and p95 duration of every query fingerprint.
+    """
+    return jsonify(query_stats.snapshot())
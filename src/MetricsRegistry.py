@@ -0,0 +1,204 @@
+from bisect import bisect_left
+import math
+
+
+class Counter:
+    """
+    A monotonically increasing value per label set.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Description written on the HELP line.
+        labelnames (tuple): Names of the labels, in the order their values are passed.
+    """
+    type = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+
+    def inc(self, amount: float = 1, labels: tuple = ()):
+        """
+        Increments the value of a label set.
+
+        Args:
+            amount (float, optional): The increment (default: 1).
+            labels (tuple, optional): The label values, in labelnames order (default: no labels).
+        """
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down per label set, or is read from a function at scrape time.
+
+    A gauge with a function costs nothing between scrapes. The function returns a number, or a dict
+    mapping label value tuples to numbers.
+    """
+    type = 'gauge'
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), function=None):
+        super().__init__(name, help, labelnames)
+        self.function = function
+
+    def set(self, value: float, labels: tuple = ()):
+        """
+        Sets the value of a label set.
+
+        Args:
+            value (float): The new value.
+            labels (tuple, optional): The label values, in labelnames order (default: no labels).
+        """
+        self._values[labels] = value
+
+    def dec(self, amount: float = 1, labels: tuple = ()):
+        """
+        Decrements the value of a label set.
+
+        Args:
+            amount (float, optional): The decrement (default: 1).
+            labels (tuple, optional): The label values, in labelnames order (default: no labels).
+        """
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def samples(self):
+        if self.function is None:
+            yield from super().samples()
+            return
+
+        values = self.function()
+        values = values if isinstance(values, dict) else {(): values}
+
+        for labels, value in values.items():
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+
+class CallbackCounter(Gauge):
+    """
+    A counter whose values are read from a function at scrape time, e.g. a cumulative stats() field.
+    """
+    type = 'counter'
+
+
+class Histogram(Counter):
+    """
+    Counts observations into cumulative buckets per label set, with their sum and count.
+
+    Attributes:
+        buckets (tuple): Sorted upper bounds of the buckets, +Inf is implied.
+    """
+    type = 'histogram'
+
+    DEFAULT_BUCKETS: tuple = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: tuple = ()):
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value, e.g. a duration in seconds.
+            labels (tuple, optional): The label values, in labelnames order (default: no labels).
+        """
+        series = self._values.get(labels)
+
+        if series is None:
+            series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self):
+        for labels, (counts, total) in self._values.items():
+            pairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', pairs + (('le', _format_value(bound)),), cumulative
+
+            yield f'{self.name}_sum', pairs, total
+            yield f'{self.name}_count', pairs, cumulative
+
+
+class MetricsRegistry:
+    """
+    A process-wide set of metrics rendered in the Prometheus text exposition format.
+
+    Metrics are created once, usually at import time, and updated on the hot path with a single
+    dictionary update and no locking. Values that already exist elsewhere, such as the connection
+    pool or cache statistics, are registered as function gauges and only read when scraped.
+
+    Methods:
+        counter(name, help, labelnames=()): Returns the counter with this name, creating it if needed.
+        gauge(name, help, labelnames=(), function=None): Returns the gauge with this name, creating it if needed.
+        callback_counter(name, help, function, labelnames=()): Returns a counter read from a function.
+        histogram(name, help, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS): Returns the histogram with this name.
+        render(): Returns every metric in the Prometheus text format.
+    """
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self.__register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: tuple = (), function=None) -> Gauge:
+        return self.__register(Gauge, name, help, labelnames, function=function)
+
+    def callback_counter(self, name: str, help: str, function, labelnames: tuple = ()) -> CallbackCounter:
+        return self.__register(CallbackCounter, name, help, labelnames, function=function)
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = Histogram.DEFAULT_BUCKETS) -> Histogram:
+        return self.__register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format, version 0.0.4.
+
+        Returns:
+            str: The exposition text.
+        """
+        lines = []
+
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+
+            for name, pairs, value in metric.samples():
+                label_text = ','.join(f'{key}="{_escape(str(label))}"' for key, label in pairs)
+                lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text else f'{name} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def __register(self, cls, name: str, help: str, labelnames: tuple, **kwargs):
+        metric = self._metrics.get(name)
+
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        elif type(metric) is not cls:
+            raise ValueError(f"Metric {name} is already registered as a {metric.type}.")
+
+        return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = MetricsRegistry()
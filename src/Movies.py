@@ -1,11 +1,12 @@
-from flask import Blueprint, render_template, flash, redirect, url_for, session, request
+from flask import Blueprint, render_template, flash, redirect, url_for, session, request, make_response
 
 from datetime import datetime, timedelta
 import json
 
-from src.DBMS import DBMS
-from src.DBInterfaces import PostgresDatabase
 from src.CodeManage import CodeManage
+from src.DBMS import DBMS, LIVE_CODE_LIMIT
+from src.Catalog import catalog
+from src.Streaming import hls_url, grant_movie
 from src import login_required
 from flask import redirect, url_for, flash
 
@@ -24,16 +25,13 @@ def available_movies():
             - If neither movie_id and expiration_date_delta nor form_access_code are provided, returns an error message.
 
         If the HTTP request method is not POST:
-            - Retrieves the list of available movies from the database and renders the available_movies.html template.
+            - Retrieves the list of available movies from the catalog cache and renders the available_movies.html template.
+            - Answers 304 Not Modified when the browser already holds the current catalog page.
 
     Raises:
         - If there is an error fetching movies from the database, returns an error message.
         - If there is an error generating or checking the access code, returns an error message.
     """
-    db = DBMS(PostgresDatabase())
-    movies_statement, movies = db.fetch_movies()
-    db.close_connection()
-
     if request.method == "POST":
         movie_id = request.form.get("movie_id")
         form_access_code = request.form.get("access_code")
@@ -43,12 +41,23 @@ def available_movies():
             expiration_date = datetime.utcnow() + timedelta(days=int(expiration_date_delta))
 
             code_manager = CodeManage()
-            access_code = code_manager.generate_access_code(json.loads(session['user'])['user_id'], int(movie_id), expiration_date)
-            if access_code is None:
+
+            statement, access_code = code_manager.generate_access_code(json.loads(session['user'])['user_id'], int(movie_id), expiration_date)
+
+            if statement is False:
+                if access_code == LIVE_CODE_LIMIT:
+                    error, status = (f"You already have {DBMS.MAX_LIVE_CODES_PER_USER} active access codes, "
+                                     f"wait for one to expire before creating another."), 429
+                else:
+                    error, status = "Access Code Creation Error", 500
+
+                movies_statement, movies = catalog.get()
                 if movies_statement is False:
-                    return render_template("available_movies.html", movies=[]), flash(f"Error: {movies}\nError: Access Code Creation Error", category='danger'), 500
+                    flash(f"Error: {movies}\nError: {error}", category='danger')
+                    return render_template("available_movies.html", movies=[]), status
 
-                return render_template("available_movies.html", movies=movies), flash(f"Error: Access Code Creation Error", category='danger'), 500
+                flash(f"Error: {error}", category='danger')
+                return render_template("available_movies.html", movies=movies), status
 
         elif form_access_code:
             code_manager = CodeManage()
@@ -56,14 +65,27 @@ def available_movies():
             if check_code_statement is True:
                 access_code = form_access_code
             else:
-                return render_template("available_movies.html", movies=movies), flash(f"Error: {check_code_data}| Access Code: {form_access_code}", category='danger'), 500
+                movies_statement, movies = catalog.get()
+                return render_template("available_movies.html", movies=movies if movies_statement else []), flash(f"Error: {check_code_data}| Access Code: {form_access_code}", category='danger'), 500
 
         return redirect(url_for('movies.videostream', access_code=access_code)), flash(f"Connecting to stream | Access Code: {access_code}", category='success')
 
+    movies_statement, movies = catalog.get()
+
     if movies_statement is False:
         return render_template("available_movies.html", movies=[]), flash(f"Error: {movies}", category='danger'), 500
 
-    return render_template("available_movies.html", movies=movies)
+    has_flashes = '_flashes' in session  # Rendering consumes the flashed messages.
+
+    response = make_response(render_template("available_movies.html", movies=movies))
+    response.headers['Cache-Control'] = 'private, no-cache'
+
+    if has_flashes:  # The page carries one-off messages, it cannot be revalidated.
+        return response
+
+    response.set_etag(catalog.etag)
+    response.last_modified = catalog.last_modified
+    return response.make_conditional(request)
 
 @movies.route("/videostream/watch/<access_code>")
 @login_required
@@ -79,18 +101,12 @@ def videostream(access_code):
     """
 
     code_manager = CodeManage()
-    statement, check_code = code_manager.check_access_code(access_code)
+    statement, stream = code_manager.check_access_code(access_code)
 
     if statement is False:
-        return redirect(url_for('movies.available_movies')), flash(f"Invalid access code: {access_code} | Error: {access_code}", category='danger'), 400
+        return redirect(url_for('movies.available_movies')), flash(f"Invalid access code: {access_code} | Error: {stream}", category='danger'), 400
 
-    db = DBMS(PostgresDatabase())
-    statement, movie_obj = db.fetch_movie(check_code[1])
-    db.close_connection()
-
-    if statement is False:
-        return redirect(url_for('movies.available_movies')), flash(f"Error: {movie_obj}", category='danger'), 500
-    
     user_id = json.loads(session['user'])['user_id']
+    grant_movie(stream.movie_path, stream.expires_at)
 
-    return render_template("videostream.html", access_code=access_code, movie_path=movie_obj[2], user_id=user_id), 200
+    return render_template("videostream.html", access_code=access_code, movie_path=hls_url(stream.movie_path), user_id=user_id), 200
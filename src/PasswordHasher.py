@@ -0,0 +1,115 @@
+import bcrypt
+
+from eventlet.semaphore import Semaphore
+from eventlet import tpool
+import os
+
+
+class HashingQueueFull(Exception):
+    """
+    Raised when too many hashing jobs are already pending.
+    """
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing in eventlet's native thread pool so it does not block the eventlet hub.
+
+    A bcrypt check is tens of milliseconds of pure CPU. Running it inline in a greenlet freezes every
+    socket event on the worker, so each job is handed to eventlet.tpool and the calling greenlet yields
+    until it finishes. The number of pending jobs is bounded so a login burst cannot queue unbounded work.
+
+    Attributes:
+        log_rounds (int): The bcrypt work factor used for new hashes.
+        max_queue (int): Maximum number of hashing jobs pending or running at the same time.
+        queue_timeout (float): Seconds to wait for a free slot before raising HashingQueueFull.
+
+    Methods:
+        init_app(app): Configures the hasher from the environment.
+        generate_password_hash(password): Hashes a password.
+        check_password_hash(pw_hash, password): Checks a password against a hash.
+        pending(): Returns the number of hashing jobs pending or running.
+    """
+    def __init__(self, log_rounds: int = 12, max_queue: int = 16, queue_timeout: float = 5.0):
+        """
+        Initializes a new PasswordHasher.
+
+        Args:
+            log_rounds (int, optional): The bcrypt work factor (default: 12).
+            max_queue (int, optional): Maximum number of pending hashing jobs (default: 16).
+            queue_timeout (float, optional): Seconds to wait for a free slot (default: 5).
+        """
+        self.configure(log_rounds, max_queue, queue_timeout)
+
+    def configure(self, log_rounds: int, max_queue: int, queue_timeout: float):
+        """
+        Sets the work factor and queue limits.
+
+        Args:
+            log_rounds (int): The bcrypt work factor.
+            max_queue (int): Maximum number of pending hashing jobs.
+            queue_timeout (float): Seconds to wait for a free slot.
+        """
+        self.log_rounds = log_rounds
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = Semaphore(max_queue)
+
+    def init_app(self, app):
+        """
+        Configures the hasher from the BCRYPT_LOG_ROUNDS and HASH_* environment variables.
+
+        Args:
+            app (Flask): The Flask application.
+        """
+        self.configure(
+            log_rounds=int(os.environ.get('BCRYPT_LOG_ROUNDS', self.log_rounds)),
+            max_queue=int(os.environ.get('HASH_MAX_QUEUE', self.max_queue)),
+            queue_timeout=float(os.environ.get('HASH_QUEUE_TIMEOUT', self.queue_timeout))
+        )
+        app.extensions['password_hasher'] = self
+
+    def generate_password_hash(self, password: str) -> str:
+        """
+        Hashes a password with the configured work factor.
+
+        Args:
+            password (str): The password to hash.
+
+        Returns:
+            str: The bcrypt hash.
+        """
+        salt = bcrypt.gensalt(self.log_rounds)
+        return self.__run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def check_password_hash(self, pw_hash: str, password: str) -> bool:
+        """
+        Checks a password against a bcrypt hash.
+
+        Args:
+            pw_hash (str): The stored bcrypt hash.
+            password (str): The password to check.
+
+        Returns:
+            bool: True if the password matches, False otherwise.
+        """
+        return self.__run(bcrypt.checkpw, password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+    def pending(self) -> int:
+        """
+        Returns the number of hashing jobs pending or running.
+
+        Returns:
+            int: Jobs holding a queue slot.
+        """
+        return self.max_queue - self._slots.balance
+
+    def __run(self, func, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HashingQueueFull("Too many sign-in attempts in progress, please try again.")
+
+        try:
+            return tpool.execute(func, *args)
+        finally:
+            self._slots.release()
@@ -0,0 +1,46 @@
+import time
+
+
+class TokenBucket:
+    """
+    A token bucket rate limiter.
+
+    The bucket holds up to capacity tokens and refills at rate tokens per second. Each allowed event
+    consumes one token, so bursts of up to capacity events pass and the sustained rate is bounded.
+
+    Attributes:
+        capacity (float): Maximum number of tokens.
+        rate (float): Tokens added per second.
+        tokens (float): Tokens currently available.
+    """
+    __slots__ = ('capacity', 'rate', 'tokens', 'updated_at')
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initializes a full bucket.
+
+        Args:
+            capacity (float): Maximum number of tokens.
+            rate (float): Tokens added per second.
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def consume(self) -> bool:
+        """
+        Takes one token if available.
+
+        Returns:
+            bool: True if the event is allowed, False if it should be dropped.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
@@ -0,0 +1,222 @@
+import time
+
+
+class PlaybackState:
+    """
+    Authoritative playback state of a room.
+
+    The position is stored together with the server time it was last set at, so the current position
+    of a playing room can be computed at any moment without asking a client.
+
+    Attributes:
+        position (float): Playback position, in seconds, at updated_at.
+        playing (bool): Whether the room is playing.
+        rate (float): Playback rate.
+        updated_at (float): Server time (time.time()) of the last change.
+    """
+    __slots__ = ('position', 'playing', 'rate', 'updated_at')
+
+    def __init__(self) -> None:
+        """
+        Initializes a paused state at the start of the movie.
+        """
+        self.position = 0.0
+        self.playing = False
+        self.rate = 1.0
+        self.updated_at = time.time()
+
+    def update(self, position: float, playing: bool = None, rate: float = None, now: float = None):
+        """
+        Records a new position, and optionally a new play/pause state and rate.
+
+        Args:
+            position (float): The playback position reported by a client.
+            playing (bool, optional): The new play/pause state (default: unchanged).
+            rate (float, optional): The new playback rate (default: unchanged).
+            now (float, optional): Server time of the change (default: time.time()).
+        """
+        self.position = float(position)
+        self.updated_at = time.time() if now is None else now
+
+        if playing is not None:
+            self.playing = playing
+        if rate is not None:
+            self.rate = float(rate)
+
+    def current_position(self, now: float = None) -> float:
+        """
+        Computes the playback position at the given server time.
+
+        Args:
+            now (float, optional): Server time (default: time.time()).
+
+        Returns:
+            float: The current playback position, in seconds.
+        """
+        if not self.playing:
+            return self.position
+
+        now = time.time() if now is None else now
+        return self.position + max(0.0, now - self.updated_at) * self.rate
+
+    def to_dict(self, now: float = None) -> dict:
+        """
+        Serializes the state as sent to clients.
+
+        Args:
+            now (float, optional): Server time (default: time.time()).
+
+        Returns:
+            dict: The current position, play/pause state, rate and server time in milliseconds.
+        """
+        now = time.time() if now is None else now
+        return {
+            'currentTime': self.current_position(now),
+            'playing': self.playing,
+            'playbackRate': self.rate,
+            'server_time': now * 1000,
+        }
+
+
+class Room:
+    """
+    Everything a worker keeps about one watch party, in a single compact record.
+
+    Attributes:
+        code (str): The session code, i.e. the access code the room is named after.
+        members (set): Socket ids of the viewers connected to this worker.
+        state (PlaybackState): The room's playback state, None until the first sync command.
+        pending (tuple): The latest (data, sid) sync_action waiting for the end of the coalescing window, or None.
+        last_relayed (float): Monotonic time of the last relayed sync_action.
+        last_active (float): Monotonic time of the last join, leave or sync command.
+        seq (int): Number of sync commands accepted in the room, sent to clients as room_seq.
+    """
+    __slots__ = ('code', 'members', 'state', 'pending', 'last_relayed', 'last_active', 'seq')
+
+    def __init__(self, code: str, now: float = None) -> None:
+        """
+        Initializes an empty room.
+
+        Args:
+            code (str): The session code.
+            now (float, optional): Monotonic time of creation (default: time.monotonic()).
+        """
+        self.code = code
+        self.members = set()
+        self.state = None
+        self.pending = None
+        self.last_relayed = float('-inf')
+        self.last_active = time.monotonic() if now is None else now
+        self.seq = 0
+
+
+class RoomRegistry:
+    """
+    The rooms of a worker, with the rooms of each socket so a disconnect is O(rooms of that socket).
+
+    A room outlives its last viewer for idle_timeout seconds, so a viewer reconnecting after a network
+    blip finds the playback state again; sweep() then evicts it.
+
+    Attributes:
+        rooms (dict): Maps a session code to its Room.
+        by_sid (dict): Maps a socket id to the set of session codes it joined.
+        evicted (int): Number of rooms evicted by sweep().
+
+    Methods:
+        get(code): Returns a room, or None.
+        room(code): Returns a room, creating it if needed.
+        join(code, sid): Adds a viewer to a room.
+        disconnect(sid): Removes a viewer from every room it joined.
+        sweep(idle_timeout): Evicts the empty rooms idle for longer than idle_timeout seconds.
+        members(): Counts the viewers of each room.
+    """
+    def __init__(self) -> None:
+        self.rooms = {}
+        self.by_sid = {}
+        self.evicted = 0
+
+    def get(self, code: str) -> Room or None:
+        return self.rooms.get(code)
+
+    def room(self, code: str) -> Room:
+        room = self.rooms.get(code)
+
+        if room is None:
+            room = self.rooms[code] = Room(code)
+
+        return room
+
+    def join(self, code: str, sid: str) -> Room:
+        """
+        Adds a viewer to a room, creating the room if needed.
+
+        Args:
+            code (str): The session code.
+            sid (str): The viewer's socket id.
+
+        Returns:
+            Room: The joined room.
+        """
+        room = self.room(code)
+        room.members.add(sid)
+        room.last_active = time.monotonic()
+        self.by_sid.setdefault(sid, set()).add(code)
+        return room
+
+    def disconnect(self, sid: str) -> list:
+        """
+        Removes a viewer from every room it joined.
+
+        Args:
+            sid (str): The viewer's socket id.
+
+        Returns:
+            list: The rooms left without viewers.
+        """
+        emptied = []
+        now = time.monotonic()
+
+        for code in self.by_sid.pop(sid, ()):
+            room = self.rooms.get(code)
+
+            if room is None:
+                continue
+
+            room.members.discard(sid)
+            room.last_active = now
+
+            if not room.members:
+                emptied.append(room)
+
+        return emptied
+
+    def sweep(self, idle_timeout: float, now: float = None) -> int:
+        """
+        Evicts the rooms without viewers whose last activity is older than idle_timeout seconds.
+        Rooms with a sync_action still waiting to be relayed are kept.
+
+        Args:
+            idle_timeout (float): Seconds an empty room is kept.
+            now (float, optional): Monotonic time (default: time.monotonic()).
+
+        Returns:
+            int: The number of rooms evicted.
+        """
+        now = time.monotonic() if now is None else now
+        idle = [code for code, room in self.rooms.items()
+                if not room.members and room.pending is None and now - room.last_active > idle_timeout]
+
+        for code in idle:
+            del self.rooms[code]
+
+        self.evicted += len(idle)
+        return len(idle)
+
+    def members(self) -> dict:
+        """
+        Counts the viewers of each room that has any.
+
+        Returns:
+            dict: Maps a session code to its number of viewers on this worker.
+        """
+        return {code: len(room.members) for code, room in self.rooms.items() if room.members}
@@ -1,58 +1,271 @@
-from flask import Blueprint
+from flask import Blueprint, request
 from flask_socketio import Namespace, join_room, emit
 
+from src.Rooms import PlaybackState, RoomRegistry
+from src.RateLimit import TokenBucket
+from src.Logger import get_logger, log_event
+from src.MetricsRegistry import registry
 from src import socketio
 
+import time, logging, os
+
+logger = get_logger('SocketEvents')
+
 socket_events = Blueprint('socket_events', __name__)
 
+events_received = registry.counter('videostream_socket_events_total', 'Socket events received, by event.', ('event',))
+sync_commands = registry.counter('videostream_sync_commands_total', 'Sync commands, by outcome: relayed at once, coalesced, throttled or dropped.', ('result',))
+
 
 class StreamManager(Namespace):
     """
     Class representing a stream manager.
 
-    This class handles various socket events related to streaming.
+    This class handles various socket events related to streaming, and keeps the authoritative playback
+    state of every room so joiners can be synced without asking another viewer.
+
+    Stale sync commands are dropped by their per-user sequence number, and the fan-out to a room is
+    coalesced: the first command in a quiet room is relayed at once, later ones within
+    SYNC_COALESCE_WINDOW seconds are merged and only the latest is relayed when the window ends.
+    Each user is rate limited with a token bucket; a command over the limit still updates the room
+    state but is never relayed at once, only merged into the pending relay, so the latest state wins.
+
+    Rooms live in a RoomRegistry. Once started with start_sweeper, a background task evicts the rooms
+    left without viewers for ROOM_IDLE_TIMEOUT seconds, so the worker's memory does not grow with the
+    number of watch parties it has ever served.
 
     Attributes:
-        None
+        room_registry (RoomRegistry): The rooms of this worker: viewers, playback state, pending relay and sequence number.
+        buckets (dict): Maps a socket id to its TokenBucket.
+        last_seq (dict): Maps a socket id to the sequence number of its last accepted command.
+        dropped (int): Number of sync commands dropped as stale.
 
     Methods:
         on_join: Handles the 'join' event when a user joins a session.
         on_sync_command: Handles the 'sync_command' event when a sync command is received.
         on_report_current_time: Handles the 'report_current_time' event when the current time is reported.
+        on_clock_sync: Answers a client's clock offset probe with the server time.
+        on_disconnect: Removes a disconnected user from its rooms and forgets its rate limiting state.
+        room_members: Counts the viewers connected to this worker in each room.
+        start_sweeper: Starts the background task evicting idle rooms.
     """
-    
+
+    MAX_CLOCK_SKEW: float = 5.0
+    COALESCE_WINDOW: float = float(os.environ.get('SYNC_COALESCE_WINDOW', 0.2))
+    USER_RATE: float = float(os.environ.get('SYNC_USER_RATE', 5))
+    USER_BURST: float = float(os.environ.get('SYNC_USER_BURST', 10))
+    IDLE_TIMEOUT: float = float(os.environ.get('ROOM_IDLE_TIMEOUT', 300))
+
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        self.room_registry = RoomRegistry()
+        self.buckets = {}
+        self.last_seq = {}
+        self.dropped = 0
+        self._sweeping = False
+
     def on_join(self, data):
         """
         Handles the 'join' event when a user joins a session.
 
+        The joiner immediately receives the room's current playback state, if the room has one.
+
         Args:
             data (dict): The data received from the client.
         """
-        print('on_join', data)
+        log_event(logger, logging.DEBUG, 'join', payload=data)
+        events_received.inc(labels=('join',))
         room_code = data['session_code']
         join_room(room_code)
+
+        room = self.room_registry.join(room_code, request.sid)
+        if room.state is not None:
+            emit('room_state', dict(room.state.to_dict(), room_seq=room.seq))
+
         emit('new_user_joined', {'session_code': room_code}, room=room_code)
 
     def on_sync_command(self, data):
         """
         Handles the 'sync_command' event when a sync command is received.
 
+        The room state is updated for every command that is not stale; the relay to the room is coalesced.
+
         Args:
             data (dict): The data received from the client.
         """
-        print('on_sync_command', data)
+        log_event(logger, logging.DEBUG, 'sync_command', payload=data)
+        events_received.inc(labels=('sync_command',))
         session_code = data['session_code']
-        emit('sync_action', data, room=session_code, include_self=False)
+
+        if self.__is_stale(request.sid, data.get('seq')):
+            self.dropped += 1
+            sync_commands.inc(labels=('dropped',))
+            return
+
+        now = self.__sent_at(data)
+
+        room = self.room_registry.room(session_code)
+        room.last_active = time.monotonic()
+        room.seq += 1
+
+        if room.state is None:
+            room.state = PlaybackState()
+
+        room.state.update(data.get('currentTime', room.state.current_position(now)),
+                          playing=data.get('action') == 'play', rate=data.get('playbackRate'), now=now)
+
+        data['server_time'] = now * 1000
+        data['room_seq'] = room.seq
+        self.__relay(room, data, request.sid, throttled=not self.__consume(request.sid))
 
     def on_report_current_time(self, data):
         """
         Handles the 'report_current_time' event when the current time is reported.
 
+        The report refreshes the room's playback state; it is no longer broadcast, so existing viewers
+        are not made to seek.
+
         Args:
             data (dict): The data received from the client.
         """
-        print('on_report_current_time', data)
+        log_event(logger, logging.DEBUG, 'report_current_time', payload=data)
+        events_received.inc(labels=('report_current_time',))
         session_code = data['session_code']
-        emit('update_time', {'currentTime': data['currentTime']}, room=session_code)
 
-socketio.on_namespace(StreamManager('/StreamManager'))
+        room = self.room_registry.get(session_code)
+        if room is not None and room.state is not None:
+            room.last_active = time.monotonic()
+            room.state.update(data['currentTime'], rate=data.get('playbackRate'))
+
+    def on_clock_sync(self, data):
+        """
+        Handles the 'clock_sync' event, an NTP-style probe used by clients to estimate their clock offset.
+
+        Args:
+            data (dict): The data received from the client, with its send time in 'client_time'.
+
+        Returns:
+            dict: The client's send time and the server time, both in milliseconds, sent as the acknowledgement.
+        """
+        events_received.inc(labels=('clock_sync',))
+        return {'client_time': data.get('client_time'), 'server_time': time.time() * 1000}
+
+    def on_disconnect(self):
+        """
+        Handles a disconnect by removing the user from its rooms and forgetting its rate limiting state.
+        """
+        events_received.inc(labels=('disconnect',))
+        self.room_registry.disconnect(request.sid)
+        self.buckets.pop(request.sid, None)
+        self.last_seq.pop(request.sid, None)
+
+    def room_members(self) -> dict:
+        """
+        Counts the viewers connected to this worker in each room.
+
+        Returns:
+            dict: Maps a session code to its number of connected viewers.
+        """
+        return self.room_registry.members()
+
+    def start_sweeper(self):
+        """
+        Starts the background task evicting the rooms left without viewers for IDLE_TIMEOUT seconds.
+        Does nothing if it already runs or ROOM_IDLE_TIMEOUT is 0.
+        """
+        if self._sweeping or self.IDLE_TIMEOUT <= 0:
+            return
+
+        self._sweeping = True
+        socketio.start_background_task(self.__sweep)
+
+    def __sweep(self):
+        while True:
+            socketio.sleep(min(60.0, self.IDLE_TIMEOUT))
+            evicted = self.room_registry.sweep(self.IDLE_TIMEOUT)
+
+            if evicted:
+                log_event(logger, logging.DEBUG, 'rooms_evicted', evicted=evicted, rooms=len(self.room_registry.rooms))
+
+    def __is_stale(self, sid: str, seq) -> bool:
+        """
+        Returns whether a sync command is older than the user's last accepted one.
+        Commands without a sequence number are never stale.
+        """
+        if not isinstance(seq, int):
+            return False
+
+        if seq <= self.last_seq.get(sid, -1):
+            return True
+
+        self.last_seq[sid] = seq
+        return False
+
+    def __consume(self, sid: str) -> bool:
+        """
+        Returns whether a sync command fits in the user's token bucket.
+        """
+        bucket = self.buckets.get(sid)
+        if bucket is None:
+            bucket = self.buckets[sid] = TokenBucket(self.USER_BURST, self.USER_RATE)
+
+        return bucket.consume()
+
+    def __relay(self, room, data: dict, sid: str, throttled: bool = False):
+        """
+        Relays a sync_action to the room, at once if the room was quiet for a whole window,
+        otherwise merged into the pending one that goes out when the window ends.
+        A throttled command is always merged, and starts a full window if nothing is pending.
+        """
+        now = time.monotonic()
+
+        if room.pending is not None:
+            room.pending = (data, sid)
+            sync_commands.inc(labels=('coalesced',))
+            return
+
+        elapsed = now - room.last_relayed
+
+        if elapsed >= self.COALESCE_WINDOW and not throttled:
+            room.last_relayed = now
+            sync_commands.inc(labels=('relayed',))
+            socketio.emit('sync_action', data, to=room.code, skip_sid=sid, namespace=self.namespace)
+            return
+
+        room.pending = (data, sid)
+        sync_commands.inc(labels=('throttled' if throttled else 'coalesced',))
+        socketio.start_background_task(self.__flush, room, self.COALESCE_WINDOW if throttled else self.COALESCE_WINDOW - elapsed)
+
+    def __flush(self, room, delay: float):
+        socketio.sleep(delay)
+        data, sid = room.pending
+        room.pending = None
+        room.last_relayed = time.monotonic()
+        socketio.emit('sync_action', data, to=room.code, skip_sid=sid, namespace=self.namespace)
+
+    def __sent_at(self, data) -> float:
+        """
+        Returns the server time a client event was sent at, from the sender's clock-corrected 'sent_at'.
+        Falls back to the receive time when it is missing or implausible.
+        """
+        now = time.time()
+        sent_at = data.get('sent_at')
+
+        if isinstance(sent_at, (int, float)) and abs(now - sent_at / 1000) <= self.MAX_CLOCK_SKEW:
+            return min(sent_at / 1000, now)
+
+        return now
+
+stream_manager = StreamManager('/StreamManager')
+socketio.on_namespace(stream_manager)
+
+registry.gauge('videostream_socket_connections', 'Sockets connected to the StreamManager namespace on this worker.',
+               function=lambda: len(socketio.server.manager.rooms.get(stream_manager.namespace, {}).get(None, {})) if socketio.server else 0)
+registry.gauge('videostream_rooms_active', 'Rooms with at least one viewer on this worker.', function=lambda: len(stream_manager.room_members()))
+registry.gauge('videostream_rooms_tracked', 'Rooms kept in memory on this worker, including empty ones not yet evicted.',
+               function=lambda: len(stream_manager.room_registry.rooms))
+registry.callback_counter('videostream_rooms_evicted_total', 'Idle rooms evicted on this worker.', lambda: stream_manager.room_registry.evicted)
+registry.gauge('videostream_room_members', 'Viewers in rooms on this worker.', function=lambda: sum(stream_manager.room_members().values()))
+registry.gauge('videostream_room_members_max', 'Viewers in the largest room on this worker.',
+               function=lambda: max(stream_manager.room_members().values(), default=0))
+
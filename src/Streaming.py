@@ -0,0 +1,161 @@
+from flask import Blueprint, Response, abort, request, session, url_for
+from werkzeug.security import safe_join
+from werkzeug.wsgi import FileWrapper
+
+from datetime import timezone
+
+import mmap, os, time
+
+streaming = Blueprint('streaming', __name__)
+
+MOVIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'movies')
+STATIC_PREFIX = '/static/movies/'
+
+SEGMENT_TYPES = {
+    '.ts': 'video/mp2t',
+    '.m4s': 'video/iso.segment',
+    '.mp4': 'video/mp4',
+    '.aac': 'audio/aac',
+}
+PLAYLIST_TYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+}
+
+SEGMENT_MAX_AGE = 31536000
+PLAYLIST_MAX_AGE = int(os.environ.get('HLS_PLAYLIST_MAX_AGE', 10))
+BLOCK_SIZE = int(os.environ.get('HLS_BLOCK_SIZE', 256 * 1024))
+X_ACCEL_PREFIX = os.environ.get('HLS_X_ACCEL_PREFIX')
+REQUIRE_ACCESS_CODE = os.environ.get('HLS_REQUIRE_ACCESS_CODE', '0') == '1'
+MAX_GRANTS = 20
+
+
+def hls_url(movie_path: str) -> str:
+    """
+    Maps a movie path stored in the movies table to its URL on the HLS blueprint.
+
+    Args:
+        movie_path (str): The stored movie path, e.g. /static/movies/<movie>/master.m3u8.
+
+    Returns:
+        str: The HLS blueprint URL, or the path unchanged if it is not a local movie.
+    """
+    if not movie_path.startswith(STATIC_PREFIX):
+        return movie_path
+
+    return url_for('streaming.hls', filename=movie_path[len(STATIC_PREFIX):])
+
+
+def grant_movie(movie_path: str, expires_at):
+    """
+    Allows the current session to fetch the segments of a movie once its access code was validated,
+    until the code expires.
+
+    Args:
+        movie_path (str): The stored movie path.
+        expires_at (datetime): Expiry of the access code; naive datetimes are taken as UTC.
+    """
+    if not movie_path.startswith(STATIC_PREFIX):
+        return
+
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+    movie = movie_path[len(STATIC_PREFIX):].split('/', 1)[0]
+    grants = [grant for grant in live_grants() if grant[0] != movie]
+    session['hls_grants'] = (grants + [[movie, expires_at.timestamp()]])[-MAX_GRANTS:]
+
+
+def live_grants() -> list:
+    """
+    Returns the session's unexpired [movie, expires_at] grants, dropping the expired ones from the session.
+
+    Returns:
+        list: The live grants, expires_at in Unix seconds.
+    """
+    grants = session.get('hls_grants', [])
+    now = time.time()
+    live = [grant for grant in grants if isinstance(grant, list) and len(grant) == 2 and grant[1] > now]
+
+    if len(live) != len(grants):
+        session['hls_grants'] = live
+
+    return live
+
+
+@streaming.before_app_request
+def block_static_movies():
+    """
+    Keeps the generic static handler from bypassing access code gating.
+    """
+    if REQUIRE_ACCESS_CODE and request.path.startswith(STATIC_PREFIX):
+        abort(404)
+
+
+@streaming.route('/hls/<path:filename>')
+def hls(filename):
+    """
+    Serves HLS playlists and segments.
+
+    Segments never change once encoded, so they get a strong ETag and a one year immutable cache lifetime.
+    Playlists get a short max-age. Range requests are honored. When HLS_X_ACCEL_PREFIX is set the body is
+    handed to the reverse proxy through X-Accel-Redirect so it can use sendfile; otherwise the file is
+    mmap-backed and streamed in HLS_BLOCK_SIZE blocks.
+
+    Parameters:
+    filename (str): Path of the file relative to src/static/movies.
+
+    Returns:
+    response: The file response, 304 if the client copy is current, or 206 for a range request.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+
+    if extension in SEGMENT_TYPES:
+        mimetype, max_age, immutable = SEGMENT_TYPES[extension], SEGMENT_MAX_AGE, True
+    elif extension in PLAYLIST_TYPES:
+        mimetype, max_age, immutable = PLAYLIST_TYPES[extension], PLAYLIST_MAX_AGE, False
+    else:
+        abort(404)
+
+    if REQUIRE_ACCESS_CODE and filename.split('/', 1)[0] not in (movie for movie, _ in live_grants()):
+        abort(403)
+
+    path = safe_join(MOVIES_DIR, filename)
+
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    stat = os.stat(path)
+
+    if X_ACCEL_PREFIX:
+        response = Response(mimetype=mimetype, headers={'X-Accel-Redirect': X_ACCEL_PREFIX + filename})
+    else:
+        file = open(path, 'rb')
+
+        if stat.st_size:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            file.close()
+            file = mapped
+
+        # Eventlet's WSGI server has no wsgi.file_wrapper, so stream large blocks instead of 8 KiB reads.
+        response = Response(FileWrapper(file, BLOCK_SIZE), mimetype=mimetype, direct_passthrough=True)
+        response.content_length = stat.st_size
+
+    response.set_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    response.last_modified = stat.st_mtime
+    response.cache_control.max_age = max_age
+    response.cache_control.immutable = immutable
+
+    if REQUIRE_ACCESS_CODE:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+
+    if X_ACCEL_PREFIX:
+        return response.make_conditional(request)
+
+    response = response.make_conditional(request, accept_ranges=True, complete_length=stat.st_size)
+
+    if response.status_code == 304 or request.method == 'HEAD':
+        response.close()  # No body is sent, release the file now rather than when the response is collected.
+
+    return response
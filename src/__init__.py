@@ -1,8 +1,13 @@
 from flask_socketio import SocketIO
-from flask import Flask, redirect, session
+from flask import Flask, redirect, session, current_app, g, has_app_context
 
 from dotenv import load_dotenv
 
+from src.DBInterfaces import ConnectionPool, DatabaseInterface, PooledPostgresDatabase, UnitOfWork
+from src.PasswordHasher import PasswordHasher
+from src.Instrumentation import QueryStats, InstrumentedDatabase
+from src.Logger import setup_logging
+
 from functools import wraps
 
 import os
@@ -11,6 +16,74 @@ import os
 load_dotenv()
 
 socketio = SocketIO(async_mode='eventlet')
+db_pool = ConnectionPool()
+password_hasher = PasswordHasher()
+query_stats = QueryStats()
+
+
+def open_database() -> DatabaseInterface:
+    """
+    Opens a database handle, checked out from the connection pool by default.
+
+    Inside an app context the DATABASE_FACTORY config value, a callable returning a DatabaseInterface,
+    replaces the pool. Benchmarks and tests use it to count queries or to run without Postgres.
+    Every query run through the handle is recorded in query_stats.
+
+    Returns:
+        DatabaseInterface: The database handle; the caller closes it.
+    """
+    factory = current_app.config.get('DATABASE_FACTORY') if has_app_context() else None
+    database = factory() if factory is not None else PooledPostgresDatabase(db_pool)
+
+    return InstrumentedDatabase(database, query_stats)
+
+
+def get_db() -> UnitOfWork:
+    """
+    Returns the unit of work of the current app context, shared by every DBMS and CodeManage in it.
+
+    The handle is opened by open_database() on the first query only. Commits are batched: the
+    pending work is committed once before the response is sent, and the handle is released when the
+    app context ends, rolled back if it ended with an exception. Users must not close it.
+
+    Returns:
+        UnitOfWork: The app context's database handle.
+    """
+    if 'db' not in g:
+        g.db = UnitOfWork(open_database)
+
+    return g.db
+
+
+def commit_db(response):
+    """
+    Commits the request's pending database work before the response is sent, so a failed commit is an error response.
+
+    Args:
+        response (Response): The response being sent.
+
+    Returns:
+        Response: The response, unchanged.
+    """
+    db = g.get('db')
+
+    if db is not None:
+        db.flush()
+
+    return response
+
+
+def close_db(exception=None):
+    """
+    Releases the app context's database handle, committing or rolling back what is still pending.
+
+    Args:
+        exception (Exception, optional): The exception that ended the app context, if any.
+    """
+    db = g.pop('db', None)
+
+    if db is not None:
+        db.finish(exception)
 
 
 def login_required(f):
@@ -37,23 +110,54 @@ def create_app():
     """
     Creates and configures the Flask application.
 
-    This function initializes a Flask application, sets the SECRET_KEY configuration,
-    registers blueprints for different modules, and initializes the SocketIO extension.
+    This function configures logging, initializes a Flask application, sets the SECRET_KEY configuration,
+    configures the database connection pool, the per-request database handle (see get_db), query statistics,
+    password hasher and access token key, registers blueprints for different modules,
+    and initializes the SocketIO extension. When SOCKETIO_MESSAGE_QUEUE is set, socket emits are shared
+    with the other workers through that queue (redis://, amqp://, kafka://, zmq+... or a local unix:// directory).
+    When ACCESS_CODE_PURGE_INTERVAL is set, expired access codes are purged in the background, and rooms
+    left idle for ROOM_IDLE_TIMEOUT seconds are evicted.
 
     Returns:
         Flask: The configured Flask application.
     """
+    setup_logging()
+
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.environ['FLASK_SECRET']
 
-    from .SocketEvents import socket_events
+    db_pool.init_app(app)
+    password_hasher.init_app(app)
+    query_stats.init_app(app)
+    app.after_request(commit_db)
+    app.teardown_appcontext(close_db)
+
+    from .AccessTokens import access_tokens
+    access_tokens.init_app(app)
+
+    from .SocketEvents import socket_events, stream_manager
     from .Movies import movies
     from .Auth import auth
+    from .Streaming import streaming
+    from .Metrics import metrics
+    from .Housekeeping import housekeeping, start_purge_task
 
     app.register_blueprint(auth, url_prefix='/')
     app.register_blueprint(movies, url_prefix='/')
     app.register_blueprint(socket_events, url_prefix='/socket_events')
+    app.register_blueprint(streaming, url_prefix='/')
+    app.register_blueprint(metrics, url_prefix='/')
+    app.register_blueprint(housekeeping)
+
+    message_queue = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
+    if message_queue and message_queue.startswith('unix://'):
+        from .MessageQueue import UnixSocketManager
+        socketio.init_app(app, client_manager=UnixSocketManager(message_queue))
+    else:
+        socketio.init_app(app, message_queue=message_queue)
 
-    socketio.init_app(app)
+    start_purge_task(app)
+    stream_manager.start_sweeper()
 
     return app
@@ -0,0 +1,113 @@
+"""
+The database the unit tests run against.
+
+By default every test uses an in-memory SQLite database created from schema.sql and seeded with the rows
+of unittest_settings.json, so the suite runs offline. Set TEST_DATABASE=postgres to run the same tests
+against the live server configured by PSQL_HOST, PSQL_USER and PSQL_PASSWORD.
+"""
+from src.DBInterfaces import DatabaseInterface, InMemoryDatabase, PostgresDatabase
+from src import create_app
+
+import bcrypt, json, os
+
+TEST_DATABASE = os.environ.get('TEST_DATABASE', 'memory')
+
+with open('tests/unittest_settings.json', 'r') as f:
+    TEST_USER_ID = json.load(f)['test_user']['user_id']
+
+
+def fixtures(settings: dict) -> dict:
+    """
+    Converts the test settings into fixture rows per table.
+
+    Args:
+        settings (dict): The content of unittest_settings.json.
+
+    Returns:
+        dict: Rows per table, with the test user's password hashed.
+    """
+    user = settings['test_user']
+    password_hash = bcrypt.hashpw(user['password'].encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8')
+
+    return {
+        'users': [{'user_id': user['user_id'], 'username': user['username'], 'password_hash': password_hash}],
+        'movies': [settings['test_movie']],
+        'access_codes': [settings['test_access_code']],
+    }
+
+
+def open_test_database() -> DatabaseInterface:
+    """
+    Opens a handle on the test database, creating and seeding the in-memory one on first use.
+
+    Returns:
+        DatabaseInterface: The database handle; the caller closes it.
+    """
+    if TEST_DATABASE == 'postgres':
+        return PostgresDatabase()
+
+    database = InMemoryDatabase('unittest')
+
+    if not database.execute_query("SELECT name FROM sqlite_master WHERE name = 'users'"):
+        database.load_schema('schema.sql')
+
+        with open('tests/unittest_settings.json', 'r') as f:
+            database.load_fixtures(fixtures(json.load(f)))
+
+    return database
+
+
+def use_test_database(app):
+    """
+    Makes the app open its database handles through open_test_database.
+
+    Args:
+        app (Flask): The app under test.
+    """
+    if TEST_DATABASE != 'postgres':
+        app.config['DATABASE_FACTORY'] = open_test_database
+
+
+def make_test_app(test_case, name: str, extra_fixtures: dict = None):
+    """
+    Creates an app on its own in-memory database, seeded with the test user and movie, for tests that
+    change the data. The database is dropped when the test ends.
+
+    Args:
+        test_case (unittest.TestCase): The running test, used to register the cleanup.
+        name (str): Name of the in-memory database, unique to the test module.
+        extra_fixtures (dict, optional): More rows per table, inserted after the test user and movie.
+
+    Returns:
+        Flask: The app, opening its database handles on the named database.
+    """
+    with open('tests/unittest_settings.json', 'r') as f:
+        rows = fixtures(json.load(f))
+
+    del rows['access_codes']
+
+    for table, table_rows in (extra_fixtures or {}).items():
+        rows[table] = rows.get(table, []) + table_rows
+
+    database = InMemoryDatabase(name)
+    database.load_schema('schema.sql')
+    database.load_fixtures(rows)
+    database.close()
+    test_case.addCleanup(InMemoryDatabase.drop, name)
+
+    app = create_app()
+    app.config['DATABASE_FACTORY'] = lambda: InMemoryDatabase(name)
+    return app
+
+
+def log_in(client, user_id: str = TEST_USER_ID):
+    """
+    Marks a test client's session as logged in.
+
+    Args:
+        client (FlaskClient): The test client.
+        user_id (str, optional): The user to log in as (default: the test user).
+    """
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['user'] = json.dumps({'user_id': user_id, 'username': 'bogan'})
@@ -0,0 +1,111 @@
+from src.AccessTokens import AccessTokens, access_tokens
+from src.CodeManage import CodeManage
+from src.Catalog import catalog
+from src.DBInterfaces import InMemoryDatabase
+from tests.fixtures import make_test_app, log_in, TEST_USER_ID
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import unittest
+
+
+class TestAccessTokens(unittest.TestCase):
+    """
+    A test case class for testing the signed access tokens.
+    """
+    def setUp(self):
+        self.app = make_test_app(self, 'unittest_access_tokens')
+        self.expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+        catalog.invalidate()
+
+    def tearDown(self):
+        catalog.invalidate()
+
+    def test_issue_and_verify(self):
+        """
+        Test case to verify an issued token carries its claims and is 64 characters long.
+
+        Steps:
+        1. Issue a token for movie 1.
+        2. Assert that it is recognized as a token and verifies to the movie, user and expiry.
+        """
+        with self.app.app_context():
+            token = access_tokens.issue(1, TEST_USER_ID, self.expires_at)
+            statement, claims = access_tokens.verify(token)
+
+        self.assertTrue(access_tokens.is_token(token))
+        self.assertTrue(statement)
+        self.assertEqual((claims.movie_id, claims.user_id), (1, TEST_USER_ID))
+        self.assertEqual(claims.expires_at, self.expires_at.replace(microsecond=0))
+
+    def test_rejects_forged_and_expired(self):
+        """
+        Test case to verify tampered, foreign and expired tokens are rejected.
+
+        Steps:
+        1. Flip one character of a valid token and assert that it does not verify.
+        2. Verify a token signed with another secret and assert that it does not verify.
+        3. Issue a token that expired a minute ago and assert that it is reported as expired.
+        """
+        with self.app.app_context():
+            token = access_tokens.issue(1, TEST_USER_ID, self.expires_at)
+            tampered = token[:10] + ('A' if token[10] != 'A' else 'B') + token[11:]
+            self.assertEqual(access_tokens.verify(tampered), (False, "Access code does not exist!"))
+
+            other = AccessTokens()
+            other.init_app(mock.Mock(config={'SECRET_KEY': 'another secret'}, extensions={}))
+            self.assertEqual(access_tokens.verify(other.issue(1, TEST_USER_ID, self.expires_at)), (False, "Access code does not exist!"))
+
+            expired = access_tokens.issue(1, TEST_USER_ID, datetime.now(timezone.utc) - timedelta(minutes=1))
+            self.assertEqual(access_tokens.verify(expired), (False, "Access code has expired."))
+
+    def test_revoke(self):
+        """
+        Test case to verify a revoked token is rejected here and by other workers after their reload.
+
+        Steps:
+        1. Issue a token and load the revocations of a second AccessTokens standing for another worker.
+        2. Revoke the token and assert that it no longer verifies.
+        3. Assert that the second AccessTokens rejects it once its revocations are reloaded.
+        """
+        with self.app.app_context():
+            token = access_tokens.issue(1, TEST_USER_ID, self.expires_at)
+            worker = AccessTokens(revocation_refresh=0)
+            worker.init_app(self.app)
+            self.assertTrue(worker.verify(token)[0])
+
+            self.assertTrue(access_tokens.revoke(token))
+            self.assertEqual(access_tokens.verify(token), (False, "Access code has been revoked."))
+            self.assertEqual(worker.verify(token), (False, "Access code has been revoked."))
+
+    def test_signed_mode_watch_without_queries(self):
+        """
+        Test case to verify signed mode issues tokens and opens the watch page without database queries.
+
+        Steps:
+        1. In signed mode, request an access code for movie 1 and follow the redirect to the watch page.
+        2. Load the watch page again while counting the queries.
+        3. Assert that it answered 200 with the movie's playlist and ran no query.
+        """
+        client = self.app.test_client()
+        log_in(client)
+
+        with mock.patch.object(CodeManage, 'MODE', 'signed'):
+            response = client.post('/videostream/available_movies', data={'movie_id': 1, 'expiration_date': 1})
+
+        self.assertEqual(response.status_code, 302)
+        token = response.headers['Location'].rsplit('/', 1)[1]
+        self.assertTrue(access_tokens.is_token(token))
+        self.assertEqual(client.get(f'/videostream/watch/{token}').status_code, 200)
+
+        with mock.patch.object(InMemoryDatabase, 'execute_query', autospec=True,
+                               side_effect=InMemoryDatabase.execute_query) as execute_query:
+            response = client.get(f'/videostream/watch/{token}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'/hls/movie_1/master.m3u8', response.data)
+        self.assertEqual(execute_query.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+from src.Cache import TTLCache
+
+import unittest, time
+
+
+class TestTTLCache(unittest.TestCase):
+    """
+    A test case class for testing the functionality of the TTLCache class.
+    """
+    def test_get_hit_and_miss(self):
+        """
+        Test case to verify hits and misses are counted.
+
+        Steps:
+        1. Create a cache and store one entry.
+        2. Read the stored key and an unknown key.
+        3. Assert the returned values and the hit/miss counters.
+        """
+        cache = TTLCache()
+        cache.set("code", (True, "data"))
+
+        self.assertEqual(cache.get("code"), (True, "data"))
+        self.assertEqual(cache.get("unknown"), None)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_entry_expires(self):
+        """
+        Test case to verify an entry is not returned after its ttl.
+
+        Steps:
+        1. Store an entry with a very short ttl.
+        2. Wait for it to expire.
+        3. Assert that it is no longer returned.
+        """
+        cache = TTLCache()
+        cache.set("code", (True, "data"), ttl=0.01)
+        time.sleep(0.02)
+
+        self.assertEqual(cache.get("code"), None)
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_least_recently_used_eviction(self):
+        """
+        Test case to verify the least recently used entry is evicted when the cache is full.
+
+        Steps:
+        1. Create a cache of size two and store two entries.
+        2. Read the first entry, then store a third one.
+        3. Assert that the second entry was evicted.
+        """
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+from src.Catalog import MovieCatalog, catalog
+from src.DBInterfaces import InMemoryDatabase
+from tests.fixtures import make_test_app, log_in
+
+from unittest import mock
+import unittest
+
+
+class TestMovieCatalog(unittest.TestCase):
+    """
+    A test case class for testing the movie catalog cache and the conditional movies page.
+    """
+    def setUp(self):
+        self.app = make_test_app(self, 'unittest_catalog')
+        self.database = InMemoryDatabase('unittest_catalog')
+        catalog.invalidate()
+
+    def tearDown(self):
+        catalog.invalidate()
+
+    def add_movie(self, movie_id: int):
+        self.database.execute_query("INSERT INTO movies (movie_id, movie_title, movie_path, movie_thumbnail, created_at) "
+                                    "VALUES (%s, %s, %s, %s, %s)", (movie_id, f'Movie {movie_id}', f'/static/movies/movie_{movie_id}/master.m3u8', '',
+                                                                    f'2024-02-0{movie_id} 10:00:00'), fetch=None)
+        self.database.commit()
+
+    def client(self):
+        client = self.app.test_client()
+        log_in(client)
+        return client
+
+    def test_reloads_on_version_change(self):
+        """
+        Test case to verify the table is only reloaded when its version changes.
+
+        Steps:
+        1. Load a catalog that checks the version on every call.
+        2. Get it again and assert that only the version was queried and the ETag is unchanged.
+        3. Add a movie, get the catalog and assert that it was reloaded with the new movie and a new ETag.
+        """
+        movies_catalog = MovieCatalog(refresh_interval=0)
+
+        with self.app.app_context():
+            self.assertEqual([movie.movie_id for movie in movies_catalog.get()[1]], [1])
+            etag = movies_catalog.etag
+
+            with mock.patch('src.DBMS.DBMS.fetch_movies') as fetch_movies:
+                self.assertTrue(movies_catalog.get()[0])
+            fetch_movies.assert_not_called()
+            self.assertEqual(movies_catalog.etag, etag)
+
+            self.add_movie(2)
+            self.assertEqual([movie.movie_id for movie in movies_catalog.get()[1]], [1, 2])
+
+        self.assertNotEqual(movies_catalog.etag, etag)
+        self.assertEqual(movies_catalog.last_modified.isoformat(), '2024-02-02T10:00:00+00:00')
+
+    def test_etag_includes_app_version(self):
+        """
+        Test case to verify the same movies give a different ETag under another app version.
+
+        Steps:
+        1. Load two catalogs of the same table with different app versions.
+        2. Assert that their ETags differ.
+        """
+        with self.app.app_context():
+            first, second = MovieCatalog(app_version='1'), MovieCatalog(app_version='2')
+            first.get()
+            second.get()
+
+        self.assertNotEqual(first.etag, second.etag)
+
+    def test_movies_page_is_conditional(self):
+        """
+        Test case to verify the movies page carries validators and answers 304 when the browser's copy is current.
+
+        Steps:
+        1. Load the movies page and assert that it has the catalog's ETag and Last-Modified.
+        2. Load it with If-None-Match set to that ETag and assert that it answers 304 without a body.
+        3. Add a movie, reload the catalog and assert that the same If-None-Match now gets the full page.
+        """
+        client = self.client()
+
+        response = client.get('/videostream/available_movies')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag()[0], catalog.etag)
+        self.assertEqual(response.headers['Last-Modified'], 'Wed, 03 Jan 2024 11:06:14 GMT')
+        etag = response.headers['ETag']
+
+        response = client.get('/videostream/available_movies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        self.add_movie(2)
+        catalog.invalidate()
+        response = client.get('/videostream/available_movies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Movie 2', response.data)
+
+    def test_no_etag_with_flashes(self):
+        """
+        Test case to verify a movies page carrying flashed messages is never revalidated.
+
+        Steps:
+        1. Load the movies page to learn its ETag.
+        2. Flash a message, then load the page with If-None-Match set to that ETag.
+        3. Assert that the full page with the message is returned, without an ETag or Last-Modified.
+        """
+        client = self.client()
+        etag = client.get('/videostream/available_movies').headers['ETag']
+
+        with client.session_transaction() as session:
+            session['_flashes'] = [('success', 'Signed in in successfully!')]
+
+        response = client.get('/videostream/available_movies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Signed in in successfully!', response.data)
+        self.assertNotIn('ETag', response.headers)
+        self.assertNotIn('Last-Modified', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+from src.CodeGenerator import CodeGenerator, code_generator
+from src.CodeManage import CodeManage
+from src.DBInterfaces import InMemoryDatabase
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import string, unittest
+
+USER_ID = 'd7e2d62b-8cf3-445e-9c09-8eb748763096'
+
+
+class TestCodeGenerator(unittest.TestCase):
+    """
+    A test case class for testing the access code generator.
+    """
+    def test_length_and_alphabet(self):
+        """
+        Test case to verify codes have the configured length and only use the configured alphabet.
+
+        Steps:
+        1. Create a generator with a length of 12, a 3 character alphabet and batches of 4 codes.
+        2. Generate 50 codes, spanning several refills.
+        3. Assert that every code has 12 characters from the alphabet.
+        """
+        generator = CodeGenerator(length=12, alphabet='abc', batch_size=4)
+
+        for code in (generator.generate() for _ in range(50)):
+            self.assertEqual(len(code), 12)
+            self.assertLessEqual(set(code), set('abc'))
+
+    def test_uniform(self):
+        """
+        Test case to verify characters are drawn without modulo bias.
+
+        Steps:
+        1. Create a generator with the 100 printable characters, for which a plain byte % 100 would be biased.
+        2. Generate 200000 characters and count each one.
+        3. Assert that every character count is within 15% of the expected 2000.
+        """
+        generator = CodeGenerator(length=50, alphabet=string.printable, batch_size=500)
+        counts = Counter(''.join(generator.generate() for _ in range(4000)))
+
+        self.assertEqual(len(counts), 100)
+        for count in counts.values():
+            self.assertLess(abs(count - 2000), 300)
+
+    def test_invalid_settings(self):
+        """
+        Test case to verify invalid lengths and alphabets are rejected.
+
+        Steps:
+        1. Assert that a length of 0 or above 50 raises ValueError.
+        2. Assert that a single character, repeated or non-ASCII alphabet raises ValueError.
+        """
+        for length in (0, 51):
+            with self.assertRaises(ValueError):
+                CodeGenerator(length=length)
+
+        for alphabet in ('a', 'aab', 'abcé'):
+            with self.assertRaises(ValueError):
+                CodeGenerator(alphabet=alphabet)
+
+    def test_retry_on_collision(self):
+        """
+        Test case to verify a code that already exists is replaced by a fresh one.
+
+        Steps:
+        1. Seed an in-memory database with a user and the code 'TAKEN00000'.
+        2. Make the generator return 'TAKEN00000' and then 'FRESH00000'.
+        3. Assert that generate_access_code returns (True, 'FRESH00000'), logs the collision, and the existing code is untouched.
+        """
+        database = InMemoryDatabase('unittest_code_generator')
+        database.load_schema('schema.sql')
+        expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+        database.load_fixtures({
+            'users': [{'user_id': USER_ID, 'username': 'bogan', 'password_hash': 'x'}],
+            'movies': [{'movie_id': 1, 'movie_title': 'Miata Video', 'movie_path': '/static/movies/movie_1/master.m3u8',
+                        'movie_thumbnail': ''}],
+            'access_codes': [{'code_id': 'TAKEN00000', 'movie_id': 1, 'user_id': USER_ID, 'expires_at': expires_at}],
+        })
+
+        try:
+            with mock.patch.object(code_generator, 'generate', side_effect=['TAKEN00000', 'FRESH00000']), \
+                    self.assertLogs('videostream.CodeManage', 'WARNING') as logs:
+                code_manager = CodeManage(InMemoryDatabase('unittest_code_generator'))
+                self.assertEqual(code_manager.generate_access_code(USER_ID, 1, expires_at + timedelta(days=1)), (True, 'FRESH00000'))
+
+            self.assertEqual([record.getMessage() for record in logs.records], ['access_code_collision'])
+
+            rows = database.execute_query("SELECT code_id, expires_at FROM access_codes ORDER BY code_id")
+            self.assertEqual([row[0] for row in rows], ['FRESH00000', 'TAKEN00000'])
+            self.assertEqual(rows[1][1], expires_at)
+        finally:
+            InMemoryDatabase.drop('unittest_code_generator')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 from src.CodeManage import CodeManage
+from src.DBMS import DBMS, Stream
+from tests.fixtures import open_test_database
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 import unittest, json
 
 
@@ -26,14 +29,15 @@ class TestCodeManage(unittest.TestCase):
         6. Assert that the access code is an instance of a string.
         7. Assert that the length of the access code is 10.
         """
-        code_manager = CodeManage()
+        code_manager = CodeManage(open_test_database())
 
         user_id =self.test_settings['test_user']["user_id"]  # Real User ID.
         movie_id = self.test_settings['test_movie']["movie_id"]  # Real Movie ID.
         expiration_date = datetime.utcnow() + timedelta(days=1)
 
-        access_code = code_manager.generate_access_code(user_id, movie_id, expiration_date)
+        statement, access_code = code_manager.generate_access_code(user_id, movie_id, expiration_date)
 
+        self.assertEqual(statement, True)
         self.assertIsInstance(access_code, str)
         self.assertEqual(len(access_code), 10)
     
@@ -46,17 +50,17 @@ class TestCodeManage(unittest.TestCase):
         2. Set a fake user ID and a real movie ID.
         3. Set the expiration date to be one day from the current UTC datetime.
         4. Call the generate_access_code method with the user ID, movie ID, and expiration date.
-        5. Assert that the generated access code is None.
+        5. Assert that the statement is False.
         """
-        code_manager = CodeManage()
+        code_manager = CodeManage(open_test_database())
 
         user_id = "58d3c9da-748E-40df-bde9-29179b400f8F"  # Fake user ID
         movie_id = self.test_settings['test_movie']["movie_id"]  # Real Movie ID.
         expiration_date = datetime.utcnow() + timedelta(days=1)
 
-        access_code = code_manager.generate_access_code(user_id, movie_id, expiration_date)
+        statement, _ = code_manager.generate_access_code(user_id, movie_id, expiration_date)
 
-        self.assertEqual(access_code, None)
+        self.assertEqual(statement, False)
 
     def test_check_access_code_false(self):
         """
@@ -68,10 +72,86 @@ class TestCodeManage(unittest.TestCase):
         3. Verify that the statement returned is False.
         4. Verify that the data returned is "Access code has expired."
         """
-        code_manager = CodeManage()
+        code_manager = CodeManage(open_test_database())
         statement, data = code_manager.check_access_code(self.test_settings['test_access_code']["code_id"])  # Expired access code.
         self.assertEqual(statement, False)
         self.assertEqual(data, "Access code has expired.")
 
+
+class TestCodeManageCache(unittest.TestCase):
+    """
+    A test case class for testing which access code checks CodeManage answers from its cache.
+    """
+    def setUp(self):
+        CodeManage.cache.clear()
+        self.code_manager = CodeManage(mock.Mock())
+        self.now = 1000.0
+        patcher = mock.patch('src.Cache.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        CodeManage.cache.clear()
+
+    def check(self, result, access_code: str = 'CACHETEST1') -> int:
+        """
+        Checks a code while the database answers result, and returns the number of queries made.
+        """
+        with mock.patch.object(DBMS, 'fetch_stream', return_value=result) as fetch_stream:
+            self.code_manager.check_access_code(access_code)
+
+        return fetch_stream.call_count
+
+    def test_invalid_code_cached_for_negative_ttl(self):
+        """
+        Test case to verify an unknown code is cached for ACCESS_CODE_NEGATIVE_TTL seconds only.
+
+        Steps:
+        1. Check an unknown code and assert that the database was queried.
+        2. Check it again just before the negative TTL ends and assert that the cached answer was used.
+        3. Check it once the negative TTL ended and assert that the database was queried again.
+        """
+        negative_ttl = CodeManage._CodeManage__NEGATIVE_TTL
+        result = False, "Access code does not exist!"
+
+        self.assertEqual(self.check(result), 1)
+        self.now += negative_ttl - 0.1
+        self.assertEqual(self.check(result), 0)
+        self.assertEqual(self.code_manager.check_access_code('CACHETEST1'), result)
+        self.now += 0.2
+        self.assertEqual(self.check(result), 1)
+
+    def test_database_errors_not_cached(self):
+        """
+        Test case to verify a failed query is not cached.
+
+        Steps:
+        1. Check a code twice while the database raises an error.
+        2. Assert that both checks queried the database.
+        """
+        result = False, RuntimeError('connection lost')
+
+        self.assertEqual(self.check(result), 1)
+        self.assertEqual(self.check(result), 1)
+
+    def test_valid_code_not_cached_past_expiry(self):
+        """
+        Test case to verify a valid code is not served from the cache after it expires, even within the cache TTL.
+
+        Steps:
+        1. Check a valid code that expires in 10 seconds, shorter than the cache TTL.
+        2. Check it again 9 seconds later and assert that the cached answer was used.
+        3. Check it again 11 seconds after the first check and assert that the database was queried again.
+        """
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+        result = True, Stream('CACHETEST1', 1, '/static/movies/movie_1/master.m3u8', expires_at)
+        self.assertGreater(CodeManage.cache.ttl, 11)
+
+        self.assertEqual(self.check(result), 1)
+        self.now += 9
+        self.assertEqual(self.check(result), 0)
+        self.now += 2
+        self.assertEqual(self.check(result), 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,168 @@
+from src.DBInterfaces import ConnectionPool, PooledPostgresDatabase, PoolTimeout
+
+import psycopg2, unittest
+
+
+class FakeConnection:
+    """
+    A minimal stand-in for a psycopg2 connection.
+    """
+    def __init__(self) -> None:
+        self.closed = 0
+        self.rollbacks = 0
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursor:
+    """
+    A cursor of a FakePreparingConnection, recording the statements it executes.
+    """
+    def __init__(self, executed: list) -> None:
+        self.executed = executed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakePreparingConnection(FakeConnection):
+    """
+    A FakeConnection that keeps track of its prepared statements, like PreparingConnection.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.prepared = set()
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self.executed)
+
+
+class TestConnectionPool(unittest.TestCase):
+    """
+    A test case class for testing the functionality of the ConnectionPool class.
+    """
+    def test_checkout_reuses_connection(self):
+        """
+        Test case to verify a returned connection is reused instead of opening a new one.
+
+        Steps:
+        1. Create a pool with a fake connection factory.
+        2. Borrow and return a connection twice.
+        3. Assert that both borrows got the same connection and only one was created.
+        """
+        pool = ConnectionPool(connect=FakeConnection)
+
+        first = PooledPostgresDatabase(pool)
+        connection = first.connection
+        first.close()
+
+        second = PooledPostgresDatabase(pool)
+        self.assertIs(second.connection, connection)
+        second.close()
+
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(pool.stats()['checkouts'], 2)
+
+    def test_checkin_rolls_back_open_transaction(self):
+        """
+        Test case to verify a connection returned inside a transaction is rolled back.
+
+        Steps:
+        1. Borrow a connection and mark it as in a transaction.
+        2. Return it to the pool.
+        3. Assert that it was rolled back.
+        """
+        pool = ConnectionPool(connect=FakeConnection)
+        database = PooledPostgresDatabase(pool)
+        connection = database.connection
+        connection.status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        database.close()
+        database.close()  # Closing twice must not return the connection twice.
+
+        self.assertEqual(connection.rollbacks, 1)
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    def test_checkout_timeout(self):
+        """
+        Test case to verify checkout raises PoolTimeout once the pool is exhausted.
+
+        Steps:
+        1. Create a pool of size one with a short timeout.
+        2. Borrow its only connection.
+        3. Assert that a second borrow raises PoolTimeout and is counted.
+        """
+        pool = ConnectionPool(max_size=1, timeout=0.01, connect=FakeConnection)
+        database = PooledPostgresDatabase(pool)
+
+        with self.assertRaises(PoolTimeout):
+            PooledPostgresDatabase(pool)
+
+        self.assertEqual(pool.stats()['timeouts'], 1)
+        self.assertEqual(pool.stats()['waits'], 1)
+        database.close()
+
+    def test_idle_eviction(self):
+        """
+        Test case to verify idle connections are closed after max_idle seconds.
+
+        Steps:
+        1. Create a pool with max_idle of zero.
+        2. Borrow and return a connection, then borrow again.
+        3. Assert that the first connection was closed and a new one was created.
+        """
+        pool = ConnectionPool(max_idle=0, connect=FakeConnection)
+        database = PooledPostgresDatabase(pool)
+        connection = database.connection
+        database.close()
+
+        database = PooledPostgresDatabase(pool)
+        self.assertTrue(connection.closed)
+        self.assertIsNot(database.connection, connection)
+        self.assertEqual(pool.stats()['evicted'], 1)
+        database.close()
+
+    def test_execute_prepared_once_per_connection(self):
+        """
+        Test case to verify a statement is prepared once per connection and executed by name afterwards.
+
+        Steps:
+        1. Borrow a connection that tracks prepared statements.
+        2. Run the same prepared query twice.
+        3. Assert that PREPARE ran once with numbered parameters, followed by two EXECUTEs.
+        """
+        pool = ConnectionPool(connect=FakePreparingConnection)
+        database = PooledPostgresDatabase(pool)
+
+        for movie_id in (1, 2):
+            database.execute_prepared('fetch_movie', "SELECT movie_path FROM movies WHERE movie_id = %s AND movie_title = %s",
+                                      (movie_id, 'title'), fetch='one')
+
+        self.assertEqual(database.connection.executed, [
+            ("PREPARE fetch_movie AS SELECT movie_path FROM movies WHERE movie_id = $1 AND movie_title = $2", None),
+            ("EXECUTE fetch_movie(%s, %s)", (1, 'title')),
+            ("EXECUTE fetch_movie(%s, %s)", (2, 'title')),
+        ])
+        database.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
-from src.DBInterfaces import PostgresDatabase
 from src.DBMS import DBMS
+from tests.fixtures import open_test_database
 
 from datetime import datetime, timedelta
 import unittest, uuid, json
@@ -23,7 +23,7 @@ class TestDBMS(unittest.TestCase):
         3. Assert that the returned data is None.
         4. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         data = dbms.check_username("testtesto")
         self.assertEqual(data, None)
         dbms.close_connection()
@@ -39,7 +39,7 @@ class TestDBMS(unittest.TestCase):
         4. Verify that the data returned by the method is "bogan".
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         data = dbms.check_username(self.test_settings['test_user']["username"])
 
         self.assertEqual(data[1], self.test_settings['test_user']["username"])
@@ -57,7 +57,7 @@ class TestDBMS(unittest.TestCase):
         4. Assert that the statement is True.
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, data = dbms.login_user(self.test_settings['test_user']["username"], self.test_settings['test_user']["password"])
         self.assertEqual(statement, True)
         dbms.close_connection()
@@ -73,7 +73,7 @@ class TestDBMS(unittest.TestCase):
         4. Assert that the statement is False.
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, _ = dbms.login_user("testosfogdsfg", "1234")
         self.assertEqual(statement, False)
         dbms.close_connection()
@@ -89,7 +89,7 @@ class TestDBMS(unittest.TestCase):
         4. Verify that the data returned is "Username already exists."
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, data = dbms.register_user(self.test_settings['test_user']["username"], self.test_settings['test_user']["password"])
         self.assertEqual(statement, False)
         self.assertEqual(data, "Username already exists.")
@@ -108,11 +108,11 @@ class TestDBMS(unittest.TestCase):
         4. Assert that the returned statement is False.
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         expiration_date = datetime.utcnow() + timedelta(days=1)
         random_uuid = str(uuid.uuid4())
 
-        statement = dbms.insert_access_code("egdsfvdsgewc", 1, random_uuid, expiration_date)
+        statement, _ = dbms.insert_access_code("egdsfvdsgewc", 1, random_uuid, expiration_date)
         self.assertEqual(statement, False)
         dbms.close_connection()
 
@@ -126,7 +126,7 @@ class TestDBMS(unittest.TestCase):
         3. Retrieve the statement returned by the method.
         4. Assert that the statement is False.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, _ = dbms.fetch_access_code("sfhsdgfasdasfafgdswgw")
         self.assertEqual(statement, False)
 
@@ -142,7 +142,7 @@ class TestDBMS(unittest.TestCase):
         5. Close the database connection.
         """
 
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, data = dbms.fetch_movies()
         self.assertEqual(statement, True)
         self.assertIsInstance(data, list)
@@ -159,7 +159,7 @@ class TestDBMS(unittest.TestCase):
         4. Assert that the data returned by the method is an instance of tuple.
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, data = dbms.fetch_movie(self.test_settings['test_movie']["movie_id"])
         self.assertEqual(statement, True)
         self.assertIsInstance(data, tuple)
@@ -176,12 +176,49 @@ class TestDBMS(unittest.TestCase):
         4. Verify that the data returned is "Movie does not exist."
         5. Close the database connection.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement, data = dbms.fetch_movie(385237432432)
         self.assertEqual(statement, False)
         self.assertEqual(data, "Movie does not exist.")
         dbms.close_connection()
 
+    def test_fetch_stream(self):
+        """
+        Test case for the fetch_stream method of the DBMS class with a valid access code.
+
+        Steps:
+        1. Create an instance of the DBMS class.
+        2. Insert an access code for the test user and movie, expiring in one day.
+        3. Call the fetch_stream method with the new access code.
+        4. Assert that the statement is True and the movie path is the test movie's.
+        5. Close the database connection.
+        """
+        dbms = DBMS(open_test_database())
+        access_code = uuid.uuid4().hex[:10]
+        dbms.insert_access_code(access_code, self.test_settings['test_movie']["movie_id"],
+                                self.test_settings['test_user']["user_id"], datetime.utcnow() + timedelta(days=1))
+
+        statement, data = dbms.fetch_stream(access_code)
+        self.assertEqual(statement, True)
+        self.assertEqual(data.movie_path, self.test_settings['test_movie']["movie_path"])
+        dbms.close_connection()
+
+    def test_fetch_stream_expired(self):
+        """
+        Test case for the fetch_stream method of the DBMS class with an expired access code.
+
+        Steps:
+        1. Create an instance of the DBMS class.
+        2. Call the fetch_stream method with the expired test access code.
+        3. Assert that the statement is False and the data is "Access code has expired."
+        4. Close the database connection.
+        """
+        dbms = DBMS(open_test_database())
+        statement, data = dbms.fetch_stream(self.test_settings['test_access_code']["code_id"])
+        self.assertEqual(statement, False)
+        self.assertEqual(data, "Access code has expired.")
+        dbms.close_connection()
+
     def test_close_connection(self):
         """
         Test case for the close_connection method of the DBMS class.
@@ -192,7 +229,7 @@ class TestDBMS(unittest.TestCase):
         3. Assert that the return value is None.
         4. Call the close_connection method again.
         """
-        dbms = DBMS(PostgresDatabase())
+        dbms = DBMS(open_test_database())
         statement = dbms.close_connection()
         self.assertEqual(statement, None)
         dbms.close_connection()
@@ -1,4 +1,5 @@
 from app import app
+from tests.fixtures import use_test_database
 
 import unittest, json, random, string
 
@@ -11,6 +12,7 @@ class FlaskIntegrationTesting(unittest.TestCase):
 
     def setUp(self):
         app.config['TESTING'] = True
+        use_test_database(app)
         self.app = app.test_client()
 
     def test_login_user_true(self):
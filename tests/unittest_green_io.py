@@ -0,0 +1,145 @@
+from app import app
+from src.DBInterfaces import PostgresDatabase, eventlet_wait_callback, use_green_io
+from src import socketio
+
+import eventlet, os, psycopg2.extensions, socket, unittest, uuid
+
+NAMESPACE = '/StreamManager'
+
+
+class FakeConnection:
+    """
+    A connection whose poll reports POLL_READ until its socket is readable.
+    """
+    def __init__(self, sock):
+        self.sock = sock
+        self.polls = 0
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def poll(self):
+        self.polls += 1
+        self.sock.setblocking(False)
+
+        try:
+            self.sock.recv(1)
+            return psycopg2.extensions.POLL_OK
+        except BlockingIOError:
+            return psycopg2.extensions.POLL_READ
+
+
+class TestGreenIO(unittest.TestCase):
+    """
+    A test case class for testing that database waits yield to the eventlet hub.
+    """
+    def test_wait_callback_yields(self):
+        """
+        Test case to verify the wait callback lets other greenlets run while the connection waits.
+
+        Steps:
+        1. Wait on a fake connection whose socket becomes readable after 0.1 seconds.
+        2. Meanwhile count the ticks of a greenlet sleeping 0.01 seconds at a time.
+        3. Assert that the ticker ran during the wait and that poll was called again once readable.
+        """
+        reader, writer = socket.socketpair()
+        connection = FakeConnection(reader)
+        ticks = []
+
+        def tick():
+            while True:
+                ticks.append(1)
+                eventlet.sleep(0.01)
+
+        def wake():
+            eventlet.sleep(0.1)
+            writer.send(b'x')
+
+        ticker = eventlet.spawn(tick)
+        eventlet.spawn(wake)
+
+        try:
+            eventlet_wait_callback(connection)
+        finally:
+            ticker.kill()
+            reader.close()
+            writer.close()
+
+        self.assertGreater(len(ticks), 3)
+        self.assertEqual(connection.polls, 2)
+
+    def test_socket_events_flow_during_slow_poll(self):
+        """
+        Test case to verify a socket round trip completes while a query is still waiting, without a Postgres server.
+
+        Steps:
+        1. In a separate greenlet, wait on a fake connection whose socket only becomes readable after 0.5 seconds.
+        2. While it waits, connect a socket client and send a clock_sync probe.
+        3. Assert that the acknowledgement arrived while the query was still in flight, then let the query finish.
+        """
+        reader, writer = socket.socketpair()
+        connection = FakeConnection(reader)
+
+        def wake():
+            eventlet.sleep(0.5)
+            writer.send(b'x')
+
+        query = eventlet.spawn(eventlet_wait_callback, connection)
+        eventlet.spawn(wake)
+        eventlet.sleep(0.05)
+
+        try:
+            client = socketio.test_client(app, namespace=NAMESPACE)
+            reply = client.emit('clock_sync', {'client_time': 123}, namespace=NAMESPACE, callback=True)
+
+            self.assertEqual(reply['client_time'], 123)
+            self.assertFalse(query.dead)
+            self.assertEqual(connection.polls, 1)
+
+            query.wait()
+            self.assertEqual(connection.polls, 2)
+            client.disconnect(NAMESPACE)
+        finally:
+            reader.close()
+            writer.close()
+
+    @unittest.skipUnless(os.environ.get('PSQL_HOST'), "Needs a Postgres server configured by PSQL_HOST.")
+    def test_socket_events_flow_during_slow_query(self):
+        """
+        Test case to verify socket events are served while another greenlet waits on a slow query.
+
+        Steps:
+        1. Install the wait callback and run SELECT pg_sleep(1) in a separate greenlet.
+        2. While it runs, connect a socket client, join a room and send a play command.
+        3. Assert that the client received its room state before the query finished.
+        """
+        use_green_io()
+
+        def slow_query():
+            database = PostgresDatabase()
+            try:
+                database.execute_query("SELECT pg_sleep(1)")
+            finally:
+                database.close()
+
+        query = eventlet.spawn(slow_query)
+        eventlet.sleep(0.1)
+
+        session_code = 'test-' + uuid.uuid4().hex[:10]
+        first = socketio.test_client(app, namespace=NAMESPACE)
+        first.emit('join', {'session_code': session_code}, namespace=NAMESPACE)
+        first.emit('sync_command', {'session_code': session_code, 'action': 'play', 'currentTime': 5.0}, namespace=NAMESPACE)
+        second = socketio.test_client(app, namespace=NAMESPACE)
+        second.emit('join', {'session_code': session_code}, namespace=NAMESPACE)
+
+        states = [event for event in second.get_received(NAMESPACE) if event['name'] == 'room_state']
+        self.assertEqual(len(states), 1)
+        self.assertFalse(query.dead)
+
+        query.wait()
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+from src.Housekeeping import purge_expired_codes
+from src.CodeManage import CodeManage
+from src.DBInterfaces import InMemoryDatabase
+from src.DBMS import DBMS, LIVE_CODE_LIMIT
+from tests.fixtures import make_test_app, log_in, TEST_USER_ID
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import unittest
+
+
+class TestHousekeeping(unittest.TestCase):
+    """
+    A test case class for testing the expired access code purge and the live code cap.
+    """
+    def setUp(self):
+        now = datetime.now(timezone.utc)
+        self.app = make_test_app(self, 'unittest_housekeeping', {
+            'access_codes': [{'code_id': f'EXPIRED{i:03}', 'movie_id': 1, 'user_id': TEST_USER_ID,
+                              'expires_at': now - timedelta(days=1)} for i in range(5)] +
+                            [{'code_id': f'LIVE{i:03}', 'movie_id': 1, 'user_id': TEST_USER_ID,
+                              'expires_at': now + timedelta(days=1)} for i in range(2)],
+        })
+
+    def codes(self) -> list:
+        database = InMemoryDatabase('unittest_housekeeping')
+        return sorted(row[0] for row in database.execute_query("SELECT code_id FROM access_codes"))
+
+    def test_purge_expired_codes(self):
+        """
+        Test case to verify the purge deletes only expired codes, in batches, and evicts them from the cache.
+
+        Steps:
+        1. Cache one of the expired codes.
+        2. Purge with a batch size of 2 and assert that the 5 expired codes were deleted in 3 batches.
+        3. Assert that only the live codes are left and the expired code is no longer cached.
+        """
+        CodeManage.cache.set('EXPIRED000', (False, "Access code has expired."))
+
+        with self.app.app_context(), mock.patch.object(DBMS, 'purge_expired_access_codes',
+                                                       autospec=True, side_effect=DBMS.purge_expired_access_codes) as purge:
+            self.assertEqual(purge_expired_codes(batch_size=2), 5)
+
+        self.assertEqual(purge.call_count, 3)
+        self.assertEqual(self.codes(), ['LIVE000', 'LIVE001'])
+        self.assertIsNone(CodeManage.cache.get('EXPIRED000'))
+
+    def test_purge_max_batches(self):
+        """
+        Test case to verify the purge stops after max_batches.
+
+        Steps:
+        1. Purge with a batch size of 2 and at most 1 batch.
+        2. Assert that 2 codes were deleted and 3 expired codes are left.
+        """
+        with self.app.app_context():
+            self.assertEqual(purge_expired_codes(batch_size=2, max_batches=1), 2)
+
+        self.assertEqual(len([code for code in self.codes() if code.startswith('EXPIRED')]), 3)
+
+    def test_live_code_cap(self):
+        """
+        Test case to verify users cannot hold more than MAX_LIVE_CODES_PER_USER unexpired codes.
+
+        Steps:
+        1. Set the cap to 3; the user holds 2 live and 5 expired codes.
+        2. Assert that one more code is inserted, locking the user's row before counting its codes.
+        3. Assert that the next one is refused with LIVE_CODE_LIMIT.
+        4. Assert that codes for a missing user are rejected.
+        """
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+        with mock.patch.object(DBMS, 'MAX_LIVE_CODES_PER_USER', 3):
+            database = InMemoryDatabase('unittest_housekeeping')
+            db = DBMS(database)
+
+            with mock.patch.object(database, 'execute_prepared', wraps=database.execute_prepared) as execute_prepared:
+                self.assertEqual(db.insert_access_code('LIVE002', 1, TEST_USER_ID, expires_at), (True, 'LIVE002'))
+
+            self.assertEqual([call.args[0] for call in execute_prepared.call_args_list],
+                             ['lock_user', 'count_live_codes', 'insert_access_code'])
+            self.assertIn('FOR UPDATE', execute_prepared.call_args_list[0].args[1])
+
+            self.assertEqual(db.insert_access_code('LIVE003', 1, TEST_USER_ID, expires_at), (False, LIVE_CODE_LIMIT))
+
+            statement, _ = db.insert_access_code('NOUSER000', 1, '00000000-0000-0000-0000-000000000000', expires_at)
+            self.assertFalse(statement)
+            db.close_connection()
+
+        self.assertNotIn('LIVE003', self.codes())
+
+    def test_live_code_cap_message(self):
+        """
+        Test case to verify a user at the cap is told why no access code was created.
+
+        Steps:
+        1. Set the cap to 2; the user already holds 2 live codes.
+        2. Log in and request an access code.
+        3. Assert that the page answers 429 with the cap message and no code was inserted.
+        """
+        client = self.app.test_client()
+        log_in(client)
+
+        with mock.patch.object(DBMS, 'MAX_LIVE_CODES_PER_USER', 2):
+            response = client.post('/videostream/available_movies', data={'movie_id': 1, 'expiration_date': 1})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(b'You already have 2 active access codes', response.data)
+        self.assertEqual(len(self.codes()), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+from src.Instrumentation import QueryStats, InstrumentedDatabase, fingerprint
+from src.DBInterfaces import InMemoryDatabase
+
+from unittest import mock
+import unittest
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    A test case class for testing the query instrumentation.
+    """
+    def setUp(self):
+        self.database = InMemoryDatabase('unittest_instrumentation')
+        self.database.load_schema('schema.sql')
+
+    def tearDown(self):
+        InMemoryDatabase.drop('unittest_instrumentation')
+
+    def test_fingerprint(self):
+        """
+        Test case to verify queries differing only in literals share a fingerprint.
+
+        Steps:
+        1. Fingerprint a query with placeholders and the same query with literals and extra whitespace.
+        2. Assert that both fingerprints are equal.
+        """
+        self.assertEqual(fingerprint("SELECT * FROM movies WHERE movie_id = %s"),
+                         fingerprint("SELECT *  FROM movies\n WHERE movie_id = 42"))
+        self.assertEqual(fingerprint("SELECT * FROM users WHERE username = 'bogan'"),
+                         "SELECT * FROM users WHERE username = ?")
+
+    def test_records_queries_and_errors(self):
+        """
+        Test case to verify executions, rows and errors are recorded per fingerprint.
+
+        Steps:
+        1. Run the same query twice with different parameters through an InstrumentedDatabase.
+        2. Run an invalid query and assert that it raises.
+        3. Assert the count, rows and errors of both fingerprints.
+        """
+        stats = QueryStats()
+        database = InstrumentedDatabase(self.database, stats)
+
+        database.execute_query("SELECT * FROM movies WHERE movie_id = %s", (1,))
+        database.execute_query("SELECT * FROM movies WHERE movie_id = %s", (2,))
+        with self.assertRaises(Exception):
+            database.execute_query("SELECT * FROM missing_table")
+
+        queries = stats.snapshot()['background']['queries']
+        self.assertEqual(queries["SELECT * FROM movies WHERE movie_id = ?"]['count'], 2)
+        self.assertEqual(queries["SELECT * FROM movies WHERE movie_id = ?"]['rows'], 0)
+        self.assertEqual(queries["SELECT * FROM missing_table"]['errors'], 1)
+
+    def test_slow_query_logged(self):
+        """
+        Test case to verify queries over the threshold are logged.
+
+        Steps:
+        1. Create statistics with a threshold of 0 ms and 1 ms.
+        2. Record a 5 ms query in both.
+        3. Assert that only the enabled threshold logged a slow_query event.
+        """
+        with mock.patch('src.Instrumentation.log_event') as log_event:
+            QueryStats(slow_query_ms=0).record("SELECT 1", 0.005, 1)
+            self.assertFalse(log_event.called)
+
+            QueryStats(slow_query_ms=1).record("SELECT 1", 0.005, 1)
+            self.assertEqual(log_event.call_args.args[2], 'slow_query')
+
+    def test_unmatched_requests_share_one_scope(self):
+        """
+        Test case to verify requests to unknown URLs do not create a scope each.
+
+        Steps:
+        1. Reset the query statistics and request 50 distinct unknown URLs.
+        2. Assert that they were all counted in the single 'unmatched' scope.
+        """
+        from src import create_app, query_stats
+
+        client = create_app().test_client()
+        query_stats.reset()
+
+        for i in range(50):
+            self.assertEqual(client.get(f'/nope/{i}').status_code, 404)
+
+        snapshot = query_stats.snapshot()
+        self.assertEqual(list(snapshot), ['unmatched'])
+        self.assertEqual(snapshot['unmatched']['requests'], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
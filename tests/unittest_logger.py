@@ -0,0 +1,112 @@
+from src.Logger import JsonFormatter, get_logger, log_event, setup_logging
+from src import Logger
+
+from logging.handlers import QueueHandler, QueueListener
+from unittest import mock
+import io, json, logging, time, unittest
+
+
+class TestLogger(unittest.TestCase):
+    """
+    A test case class for testing the structured JSON logging.
+    """
+    def setUp(self):
+        self.logger = get_logger('LoggerTest')
+        self.logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.logger.setLevel(logging.NOTSET)
+
+    def test_json_formatter(self):
+        """
+        Test case to verify a record is formatted as one JSON line with its event and fields.
+
+        Steps:
+        1. Format a record carrying an event and structured fields, one of them not JSON serializable.
+        2. Assert that the line parses to the level, logger, event and fields, the odd one as its str().
+        3. Format a plain record and assert that its message is used as the event.
+        """
+        record = self.logger.makeRecord(self.logger.name, logging.INFO, __file__, 1, 'sync_command', None, None,
+                                        extra={'event': 'sync_command', 'fields': {'seq': 3, 'room': {'a'}}})
+        line = JsonFormatter().format(record)
+
+        self.assertNotIn('\n', line)
+        self.assertEqual(json.loads(line), {'time': record.created, 'level': 'INFO', 'logger': 'videostream.LoggerTest',
+                                            'event': 'sync_command', 'seq': 3, 'room': "{'a'}"})
+
+        record = self.logger.makeRecord(self.logger.name, logging.WARNING, __file__, 1, 'plain %s', ('message',), None)
+        self.assertEqual(json.loads(JsonFormatter().format(record))['event'], 'plain message')
+
+    def test_log_event_fast_path(self):
+        """
+        Test case to verify disabled levels are skipped before anything is logged, and payload dicts are copied.
+
+        Steps:
+        1. Log an event at a level the logger does not enable and assert that nothing was logged.
+        2. Log an enabled event with a dict payload, change the dict, and assert that the logged copy kept the old value.
+        """
+        logger = mock.Mock()
+        logger.isEnabledFor.return_value = False
+        log_event(logger, logging.DEBUG, 'sync_command', payload={'seq': 1})
+        logger.log.assert_not_called()
+
+        payload = {'seq': 1}
+
+        with mock.patch.object(self.logger, 'log') as log:
+            log_event(self.logger, logging.DEBUG, 'sync_command', payload=payload)
+            payload['seq'] = 2
+
+        self.assertEqual(log.call_args.kwargs['extra'], {'event': 'sync_command', 'fields': {'payload': {'seq': 1}}})
+
+    def test_log_event_sampling(self):
+        """
+        Test case to verify events listed in LOG_SAMPLE_RATES are logged for their fraction of calls only.
+
+        Steps:
+        1. Sample the 'hot' event at 0.25.
+        2. Log it with random draws below and above the rate; assert that only the draw below was logged.
+        3. Assert that other events are always logged.
+        """
+        with mock.patch.dict(Logger._sample_rates, {'hot': 0.25}), mock.patch.object(self.logger, 'log') as log, \
+                mock.patch('src.Logger.random.random', side_effect=[0.1, 0.9]):
+            log_event(self.logger, logging.INFO, 'hot', draw=0.1)
+            log_event(self.logger, logging.INFO, 'hot', draw=0.9)
+            log_event(self.logger, logging.INFO, 'cold')
+
+        self.assertEqual([call.args[1] for call in log.call_args_list], ['hot', 'cold'])
+        self.assertEqual(log.call_args_list[0].kwargs['extra']['fields'], {'draw': 0.1})
+
+    def test_setup_logging_uses_queue(self):
+        """
+        Test case to verify records go through a QueueHandler and are written as JSON by the QueueListener.
+
+        Steps:
+        1. Set up logging twice and assert that the videostream logger has a single QueueHandler and does not propagate.
+        2. Point the listener's stream handler to a buffer and log an event.
+        3. Assert that the listener thread wrote it to the buffer as a JSON line.
+        """
+        setup_logging()
+        setup_logging()
+        root = logging.getLogger('videostream')
+
+        self.assertEqual(sum(isinstance(handler, QueueHandler) for handler in root.handlers), 1)
+        self.assertFalse(root.propagate)
+        self.assertIsInstance(Logger._listener, QueueListener)
+
+        handler = Logger._listener.handlers[0]
+        self.assertIsInstance(handler.formatter, JsonFormatter)
+        stream = io.StringIO()
+
+        with mock.patch.object(handler, 'stream', stream):
+            log_event(self.logger, logging.INFO, 'queued', value=1)
+            deadline = time.monotonic() + 2
+
+            while not stream.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(json.loads(stream.getvalue())['event'], 'queued')
+        self.assertEqual(json.loads(stream.getvalue())['value'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+from src.DBInterfaces import InMemoryDatabase
+
+from datetime import datetime, timedelta, timezone
+import unittest
+
+
+class TestInMemoryDatabase(unittest.TestCase):
+    """
+    A test case class for testing the functionality of the InMemoryDatabase class.
+    """
+    def setUp(self):
+        self.database = InMemoryDatabase('unittest_memory_database')
+        self.database.load_schema('schema.sql')
+
+    def tearDown(self):
+        InMemoryDatabase.drop('unittest_memory_database')
+
+    def test_schema_and_placeholders(self):
+        """
+        Test case to verify schema.sql loads and %s queries run.
+
+        Steps:
+        1. Insert a movie through a %s query without its movie_id.
+        2. Fetch it back by title.
+        3. Assert that the serial id was assigned and created_at defaulted to a datetime.
+        """
+        self.database.execute_query("INSERT INTO movies (movie_title, movie_path, movie_thumbnail) VALUES (%s, %s, %s)",
+                                    ("Title", "/static/movies/movie_1/master.m3u8", "thumb.jpg"), fetch=None)
+        movie = self.database.execute_query("SELECT * FROM movies WHERE movie_title = %s", ("Title",), fetch='one')
+
+        self.assertEqual(movie[0], 1)
+        self.assertIsInstance(movie[4], datetime)
+
+    def test_timestamps(self):
+        """
+        Test case to verify timestamps round-trip and compare against now().
+
+        Steps:
+        1. Load a user and an access code expiring in one hour.
+        2. Assert that expires_at is read back as an aware UTC datetime.
+        3. Assert that now() sees the code as not expired.
+        """
+        expires_at = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=1)
+        self.database.load_fixtures({
+            'users': [{'user_id': 'user', 'username': 'user', 'password_hash': 'hash'}],
+            'movies': [{'movie_id': 1, 'movie_path': 'path', 'movie_thumbnail': 'thumb'}],
+            'access_codes': [{'code_id': 'code', 'movie_id': 1, 'user_id': 'user', 'expires_at': expires_at}],
+        })
+
+        code = self.database.execute_query("SELECT * FROM access_codes WHERE code_id = %s", ("code",), fetch='one')
+        live = self.database.execute_query("SELECT code_id FROM access_codes WHERE expires_at > now()")
+
+        self.assertEqual(code[4], expires_at)
+        self.assertEqual(live, [("code",)])
+
+    def test_close_rolls_back(self):
+        """
+        Test case to verify uncommitted changes are discarded when a handle closes.
+
+        Steps:
+        1. Insert a user without committing and close the handle.
+        2. Open a new handle on the same database.
+        3. Assert that the user is not there.
+        """
+        self.database.execute_query("INSERT INTO users (user_id, username, password_hash) VALUES (%s, %s, %s)",
+                                    ("user", "user", "hash"), fetch=None)
+        self.database.close()
+        self.database.close()
+
+        database = InMemoryDatabase('unittest_memory_database')
+        self.assertEqual(database.execute_query("SELECT * FROM users"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+from src.MessageQueue import UnixSocketManager
+
+import eventlet
+import os, pickle, shutil, tempfile, unittest
+
+
+class TestUnixSocketManager(unittest.TestCase):
+    """
+    A test case class for testing the Unix socket message queue shared by the workers of one host.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.url = 'unix://' + self.directory
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_emit_reaches_other_manager(self):
+        """
+        Test case to verify an emit on one manager is published to another manager sharing the directory.
+
+        Steps:
+        1. Create two managers on the same temporary directory and start listening on the second one.
+        2. Emit a sync action to a room through the first manager.
+        3. Assert that the second manager received the message with the event, data, room and sender's host_id.
+        4. Assert that the first manager did not publish the message to itself.
+        """
+        sender = UnixSocketManager(self.url)
+        receiver = UnixSocketManager(self.url)
+        listening = receiver._listen()
+        received = eventlet.spawn(next, listening)
+        eventlet.sleep(0.01)
+
+        sender.emit('sync_action', {'currentTime': 4.0}, namespace='/StreamManager', room='room-1')
+
+        with eventlet.Timeout(2):
+            message = pickle.loads(received.wait())
+
+        self.assertEqual((message['event'], message['data'], message['room']), ('sync_action', {'currentTime': 4.0}, 'room-1'))
+        self.assertEqual(message['host_id'], sender.host_id)
+        self.assertFalse(os.path.exists(sender.path))
+        listening.close()
+
+    def test_oversize_message_is_dropped(self):
+        """
+        Test case to verify a message larger than MAX_MESSAGE_SIZE is logged and dropped instead of failing the emit.
+
+        Steps:
+        1. Create two managers on the same temporary directory and start listening on the second one.
+        2. Emit a payload larger than MAX_MESSAGE_SIZE and assert that it does not raise and logs message_dropped.
+        3. Emit a small message and assert that it is the first one the second manager receives.
+        """
+        sender = UnixSocketManager(self.url)
+        receiver = UnixSocketManager(self.url)
+        listening = receiver._listen()
+        received = eventlet.spawn(next, listening)
+        eventlet.sleep(0.01)
+
+        with self.assertLogs('videostream.MessageQueue', 'WARNING') as logs:
+            sender.emit('sync_action', 'x' * UnixSocketManager.MAX_MESSAGE_SIZE, namespace='/StreamManager')
+
+        self.assertEqual([record.getMessage() for record in logs.records], ['message_dropped'])
+
+        sender.emit('sync_action', {'currentTime': 4.0}, namespace='/StreamManager')
+
+        with eventlet.Timeout(2):
+            message = pickle.loads(received.wait())
+
+        self.assertEqual(message['data'], {'currentTime': 4.0})
+        listening.close()
+
+    def test_directory_is_private(self):
+        """
+        Test case to verify the queue directory is created private and a shared one is refused.
+
+        Steps:
+        1. Create a manager on a missing directory and assert that it was created with mode 0700.
+        2. Open the directory to everyone and assert that a new manager refuses it.
+        3. Assert that the default directory is specific to the current user.
+        """
+        queue_dir = os.path.join(self.directory, 'queue')
+        UnixSocketManager('unix://' + queue_dir)
+        self.assertEqual(os.stat(queue_dir).st_mode & 0o777, 0o700)
+
+        os.chmod(queue_dir, 0o777)
+
+        with self.assertRaises(PermissionError):
+            UnixSocketManager('unix://' + queue_dir)
+
+        self.assertTrue(UnixSocketManager.DEFAULT_DIRECTORY.endswith(f'videostream-mq-{os.getuid()}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
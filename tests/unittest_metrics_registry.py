@@ -0,0 +1,111 @@
+from src.MetricsRegistry import MetricsRegistry
+
+from unittest import mock
+import unittest
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """
+    A test case class for testing the functionality of the MetricsRegistry class.
+    """
+    def test_counter_and_gauge(self):
+        """
+        Test case to verify counters and gauges render with their labels.
+
+        Steps:
+        1. Increment a labelled counter twice and set a gauge.
+        2. Register a gauge read from a function.
+        3. Assert the rendered samples and TYPE lines.
+        """
+        registry = MetricsRegistry()
+        events = registry.counter('events_total', 'Events.', ('event',))
+        events.inc(labels=('join',))
+        events.inc(2, labels=('join',))
+        registry.gauge('rooms', 'Rooms.').set(3)
+        registry.gauge('members', 'Members.', function=lambda: 7)
+
+        text = registry.render()
+
+        self.assertIn('# TYPE events_total counter', text)
+        self.assertIn('events_total{event="join"} 3', text)
+        self.assertIn('rooms 3', text)
+        self.assertIn('members 7', text)
+
+    def test_histogram(self):
+        """
+        Test case to verify histogram buckets are cumulative.
+
+        Steps:
+        1. Create a histogram with buckets 0.1 and 1.
+        2. Observe 0.05, 0.5 and 5.
+        3. Assert the cumulative bucket counts, the sum and the count.
+        """
+        registry = MetricsRegistry()
+        histogram = registry.histogram('duration_seconds', 'Durations.', buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+
+        text = registry.render()
+
+        self.assertIn('duration_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('duration_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('duration_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('duration_seconds_sum 5.55', text)
+        self.assertIn('duration_seconds_count 3', text)
+
+    def test_register_twice(self):
+        """
+        Test case to verify a name returns the same metric, and cannot change type.
+
+        Steps:
+        1. Register a counter twice under the same name.
+        2. Assert that both calls return the same counter.
+        3. Assert that registering the name as a gauge raises ValueError.
+        """
+        registry = MetricsRegistry()
+
+        self.assertIs(registry.counter('events_total', 'Events.'), registry.counter('events_total', 'Events.'))
+        with self.assertRaises(ValueError):
+            registry.gauge('events_total', 'Events.')
+
+
+class TestMetricsAccess(unittest.TestCase):
+    """
+    A test case class for testing who can read the metrics endpoints.
+    """
+    def setUp(self):
+        from src import create_app
+
+        self.client = create_app().test_client()
+
+    def test_closed_by_default(self):
+        """
+        Test case to verify the metrics endpoints are closed without METRICS_TOKEN or METRICS_PUBLIC.
+
+        Steps:
+        1. Request /metrics and /metrics/queries with neither setting.
+        2. Assert that both answer 403.
+        """
+        with mock.patch('src.Metrics.METRICS_TOKEN', None), mock.patch('src.Metrics.METRICS_PUBLIC', False):
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.assertEqual(self.client.get('/metrics/queries').status_code, 403)
+
+    def test_token_and_public(self):
+        """
+        Test case to verify the bearer token and METRICS_PUBLIC open the endpoints.
+
+        Steps:
+        1. With a token set, assert that a request without it gets 401 and one with it gets 200.
+        2. With METRICS_PUBLIC and no token, assert that a plain request gets 200.
+        """
+        with mock.patch('src.Metrics.METRICS_TOKEN', 'secret'):
+            self.assertEqual(self.client.get('/metrics/queries').status_code, 401)
+            self.assertEqual(self.client.get('/metrics/queries', headers={'Authorization': 'Bearer secret'}).status_code, 200)
+
+        with mock.patch('src.Metrics.METRICS_TOKEN', None), mock.patch('src.Metrics.METRICS_PUBLIC', True):
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
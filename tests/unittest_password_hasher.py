@@ -0,0 +1,88 @@
+from app import app
+from src.PasswordHasher import PasswordHasher, HashingQueueFull
+from src import password_hasher
+from tests.fixtures import use_test_database
+
+from eventlet.semaphore import Semaphore
+from unittest import mock
+import bcrypt, json, unittest, uuid
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """
+    A test case class for testing the password hasher and its bounded queue.
+    """
+    def setUp(self):
+        self.hasher = PasswordHasher(log_rounds=4, max_queue=1, queue_timeout=0.01)
+
+    def test_hash_and_check(self):
+        """
+        Test case to verify a hash checks against its password only, and that bcrypt runs in the thread pool.
+
+        Steps:
+        1. Hash a password while recording the calls to tpool.execute.
+        2. Assert that the hash uses the configured work factor and that bcrypt was run through tpool.
+        3. Assert that the password checks against the hash and another password does not.
+        4. Assert that no job is left holding a queue slot.
+        """
+        with mock.patch('src.PasswordHasher.tpool.execute', side_effect=lambda func, *args: func(*args)) as execute:
+            pw_hash = self.hasher.generate_password_hash('hunter22')
+
+        self.assertEqual(execute.call_args[0][0], bcrypt.hashpw)
+        self.assertTrue(pw_hash.startswith('$2b$04$'))
+        self.assertTrue(self.hasher.check_password_hash(pw_hash, 'hunter22'))
+        self.assertFalse(self.hasher.check_password_hash(pw_hash, 'hunter23'))
+        self.assertEqual(self.hasher.pending(), 0)
+
+    def test_queue_full(self):
+        """
+        Test case to verify a job is refused once every queue slot is taken.
+
+        Steps:
+        1. Take the hasher's only queue slot.
+        2. Assert that hashing and checking raise HashingQueueFull after the queue timeout.
+        3. Release the slot and assert that hashing works again.
+        """
+        self.hasher._slots.acquire()
+        self.assertEqual(self.hasher.pending(), 1)
+
+        with self.assertRaises(HashingQueueFull):
+            self.hasher.generate_password_hash('hunter22')
+
+        with self.assertRaises(HashingQueueFull):
+            self.hasher.check_password_hash('$2b$04$' + 'a' * 53, 'hunter22')
+
+        self.hasher._slots.release()
+        self.assertTrue(self.hasher.generate_password_hash('hunter22'))
+
+    def test_login_and_signup_when_queue_full(self):
+        """
+        Test case to verify sign-in and sign-up report a full hashing queue instead of failing.
+
+        Steps:
+        1. Leave the app's password hasher without a free queue slot.
+        2. Log in as the test user and assert that the queue full message is shown and no session is opened.
+        3. Sign up a new user and assert that the same message is shown and no session is opened.
+        """
+        app.config['TESTING'] = True
+        use_test_database(app)
+        client = app.test_client()
+
+        with open('tests/unittest_settings.json', 'r') as f:
+            user = json.load(f)['test_user']
+
+        with mock.patch.object(password_hasher, '_slots', Semaphore(0)), mock.patch.object(password_hasher, 'queue_timeout', 0.01):
+            login = client.post('/login', data={'username': user['username'], 'password': user['password']})
+            signup = client.post('/signup', data={'username': 'user_' + uuid.uuid4().hex[:8], 'password1': 'hunter22',
+                                                  'password2': 'hunter22'})
+
+        for response in (login, signup):
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'Too many sign-in attempts in progress, please try again.', response.data)
+
+            with client.session_transaction() as session:
+                self.assertIsNone(session.get('logged_in'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+from src.RateLimit import TokenBucket
+
+from unittest import mock
+import unittest
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    A test case class for testing the token bucket rate limiter.
+    """
+    def test_burst_then_refill(self):
+        """
+        Test case to verify a bucket allows a burst of capacity events, then refills at its rate.
+
+        Steps:
+        1. Create a bucket of capacity 3 refilling 2 tokens per second on a frozen clock.
+        2. Assert that three events pass and the fourth is refused.
+        3. Advance the clock by half a second and assert that exactly one more event passes.
+        4. Advance the clock by a minute and assert that the bucket holds no more than its capacity.
+        """
+        with mock.patch('src.RateLimit.time.monotonic', return_value=100.0) as monotonic:
+            bucket = TokenBucket(3, 2)
+            self.assertEqual([bucket.consume() for _ in range(4)], [True, True, True, False])
+
+            monotonic.return_value = 100.5
+            self.assertEqual([bucket.consume() for _ in range(2)], [True, False])
+
+            monotonic.return_value = 160.5
+            self.assertEqual([bucket.consume() for _ in range(4)], [True, True, True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
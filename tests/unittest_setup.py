@@ -0,0 +1,89 @@
+from unittest import mock
+import contextlib, io, json, os, shutil, sys, tempfile, unittest
+
+import setup
+
+FFPROBE_OUTPUT = json.dumps({'streams': [{'codec_type': 'video', 'codec_name': 'h264', 'profile': 'High', 'level': 31,
+                                          'width': 1280, 'height': 720, 'avg_frame_rate': '25/1'}]})
+
+
+class TestSetup(unittest.TestCase):
+    """
+    A test case class for testing the HLS conversion script.
+    """
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.root)
+        self.movie_dir = os.path.join('src', 'static', 'movies', 'movie')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def encode(self, height: int):
+        output_dir = setup.rendition_dir(self.movie_dir, height)
+        os.makedirs(output_dir)
+
+        with open(os.path.join(output_dir, 'output.m3u8'), 'w') as f:
+            f.write('#EXTM3U\n#EXT-X-TARGETDURATION:10\n#EXTINF:10.0,\nsegment_000.ts\n#EXT-X-ENDLIST\n')
+        with open(os.path.join(output_dir, 'segment_000.ts'), 'wb') as f:
+            f.write(b'\0' * 1000)
+        open(os.path.join(output_dir, setup.COMPLETE_MARKER), 'w').close()
+
+    def run_main(self, *args):
+        with mock.patch.object(sys, 'argv', ['setup.py', '--skip-install', *args]), contextlib.redirect_stdout(io.StringIO()):
+            setup.main()
+
+    def test_failed_forced_encode_clears_markers(self):
+        """
+        Test case to verify a forced re-encode that fails leaves its renditions marked incomplete.
+
+        Steps:
+        1. Encode the 1080p and 720p renditions and mark them complete.
+        2. Run setup with --force while ffmpeg fails, and assert that it exits with an error.
+        3. Assert that neither rendition is still marked complete, so they are not listed nor skipped later.
+        """
+        for height in (1080, 720):
+            self.encode(height)
+
+        with mock.patch.object(setup, 'get_movie_resolution', return_value='1920x1080'), \
+                mock.patch.object(setup, 'has_audio', return_value=False), \
+                mock.patch.object(setup, 'get_movie_duration', return_value=10.0), \
+                mock.patch.object(setup, 'run_with_progress', return_value=1) as run_with_progress, \
+                self.assertRaises(SystemExit):
+            self.run_main('--force', '--ladder', '1080,720', 'movie.mp4')
+
+        run_with_progress.assert_called_once()
+        self.assertEqual(setup.completed_renditions(self.movie_dir), [])
+
+    def test_master_only_uses_renditions(self):
+        """
+        Test case to verify --master-only rebuilds master.m3u8 from the encoded renditions without the source.
+
+        Steps:
+        1. Run setup with --master-only for a movie that was never encoded; assert that it exits and creates nothing.
+        2. Encode the 720p rendition, leaving no source movie, and run setup with --master-only again.
+        3. Assert that ffprobe was never run on the source and master.m3u8 lists the 720p rendition.
+        """
+        with self.assertRaises(SystemExit):
+            self.run_main('--master-only', 'movie.mp4')
+
+        self.assertFalse(os.path.exists('src'))
+        self.encode(720)
+
+        with mock.patch.object(setup, 'get_movie_resolution') as get_movie_resolution, \
+                mock.patch.object(setup.subprocess, 'run', return_value=mock.Mock(stdout=FFPROBE_OUTPUT)):
+            self.run_main('--master-only', 'movie.mp4')
+
+        get_movie_resolution.assert_not_called()
+
+        with open(os.path.join(self.movie_dir, 'master.m3u8')) as f:
+            master = f.read()
+
+        self.assertIn('RESOLUTION=1280x720', master)
+        self.assertIn('720p/output.m3u8', master)
+
+
+if __name__ == '__main__':
+    unittest.main()
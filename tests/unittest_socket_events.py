@@ -0,0 +1,242 @@
+from app import app
+from src.SocketEvents import StreamManager, stream_manager
+from src.Rooms import RoomRegistry
+from src import socketio
+
+import unittest, uuid, time
+
+NAMESPACE = '/StreamManager'
+
+
+class TestStreamManager(unittest.TestCase):
+    """
+    A test case class for testing the StreamManager socket events.
+    """
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.session_code = 'test-' + uuid.uuid4().hex[:10]
+
+    def connect(self):
+        client = socketio.test_client(app, namespace=NAMESPACE)
+        client.emit('join', {'session_code': self.session_code}, namespace=NAMESPACE)
+        return client
+
+    @staticmethod
+    def events(client, name):
+        return [event['args'][0] for event in client.get_received(NAMESPACE) if event['name'] == name]
+
+    def test_joiner_receives_room_state(self):
+        """
+        Test case to verify a joiner receives the room's playback state without a peer round-trip.
+
+        Steps:
+        1. Connect a first client and send a play command at 42 seconds.
+        2. Connect a second client to the same room.
+        3. Assert that the second client received a playing room_state at 42 seconds or later.
+        """
+        first = self.connect()
+        first.emit('sync_command', {'session_code': self.session_code, 'action': 'play', 'currentTime': 42.0}, namespace=NAMESPACE)
+
+        second = self.connect()
+        states = self.events(second, 'room_state')
+
+        self.assertEqual(len(states), 1)
+        self.assertEqual(states[0]['playing'], True)
+        self.assertGreaterEqual(states[0]['currentTime'], 42.0)
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_join_does_not_make_viewers_seek(self):
+        """
+        Test case to verify existing viewers receive no seek when someone joins.
+
+        Steps:
+        1. Connect a first client and send a pause command.
+        2. Connect a second client and report a current time from it.
+        3. Assert that the first client received no sync_action or update_time events.
+        """
+        first = self.connect()
+        first.emit('sync_command', {'session_code': self.session_code, 'action': 'pause', 'currentTime': 10.0}, namespace=NAMESPACE)
+        first.get_received(NAMESPACE)
+
+        second = self.connect()
+        second.emit('report_current_time', {'session_code': self.session_code, 'currentTime': 11.0}, namespace=NAMESPACE)
+
+        received = [event['name'] for event in first.get_received(NAMESPACE)]
+        self.assertNotIn('sync_action', received)
+        self.assertNotIn('update_time', received)
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_first_joiner_receives_no_state(self):
+        """
+        Test case to verify a joiner of an unused room receives no room_state.
+
+        Steps:
+        1. Connect a client to a fresh room.
+        2. Assert that it received no room_state event.
+        """
+        client = self.connect()
+        self.assertEqual(self.events(client, 'room_state'), [])
+        client.disconnect(NAMESPACE)
+
+    def test_clock_sync(self):
+        """
+        Test case to verify the clock_sync acknowledgement carries the server time.
+
+        Steps:
+        1. Connect a client and emit clock_sync with a client time.
+        2. Assert that the acknowledgement echoes the client time and carries the current server time.
+        """
+        client = self.connect()
+        reply = client.emit('clock_sync', {'client_time': 123}, namespace=NAMESPACE, callback=True)
+
+        self.assertEqual(reply['client_time'], 123)
+        self.assertAlmostEqual(reply['server_time'] / 1000, time.time(), delta=1)
+        client.disconnect(NAMESPACE)
+
+    def test_sync_action_is_stamped_with_sent_at(self):
+        """
+        Test case to verify relayed sync actions carry the sender's clock-corrected send time.
+
+        Steps:
+        1. Connect two clients to the same room.
+        2. Send a play command stamped half a second in the past from the first client.
+        3. Assert that the second client receives it with that server_time.
+        """
+        first = self.connect()
+        second = self.connect()
+        second.get_received(NAMESPACE)
+
+        sent_at = time.time() * 1000 - 500
+        first.emit('sync_command', {'session_code': self.session_code, 'action': 'play', 'currentTime': 5.0, 'sent_at': sent_at}, namespace=NAMESPACE)
+        actions = self.events(second, 'sync_action')
+
+        self.assertEqual(len(actions), 1)
+        self.assertEqual(actions[0]['server_time'], sent_at)
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_sync_burst_is_coalesced(self):
+        """
+        Test case to verify a burst of sync commands is relayed as the first one plus the latest one.
+
+        Steps:
+        1. Connect two clients to the same room.
+        2. Send five sync commands from the first client in quick succession.
+        3. Wait for the coalescing window to end.
+        4. Assert that the second client received two sync actions, the last one being the latest command.
+        """
+        first = self.connect()
+        second = self.connect()
+        second.get_received(NAMESPACE)
+
+        for seq in range(5):
+            first.emit('sync_command', {'session_code': self.session_code, 'action': 'play', 'currentTime': float(seq), 'seq': seq}, namespace=NAMESPACE)
+
+        socketio.sleep(StreamManager.COALESCE_WINDOW * 2)
+        actions = self.events(second, 'sync_action')
+
+        self.assertEqual([action['currentTime'] for action in actions], [0.0, 4.0])
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_stale_sync_command_is_dropped(self):
+        """
+        Test case to verify a sync command with an old sequence number is dropped.
+
+        Steps:
+        1. Connect two clients to the same room.
+        2. Send a command with seq 5, wait a window, then one with seq 3.
+        3. Assert that only the first command was relayed.
+        """
+        first = self.connect()
+        second = self.connect()
+        second.get_received(NAMESPACE)
+
+        first.emit('sync_command', {'session_code': self.session_code, 'action': 'play', 'currentTime': 1.0, 'seq': 5}, namespace=NAMESPACE)
+        socketio.sleep(StreamManager.COALESCE_WINDOW * 2)
+        first.emit('sync_command', {'session_code': self.session_code, 'action': 'pause', 'currentTime': 2.0, 'seq': 3}, namespace=NAMESPACE)
+        socketio.sleep(StreamManager.COALESCE_WINDOW * 2)
+
+        actions = self.events(second, 'sync_action')
+        self.assertEqual([action['seq'] for action in actions], [5])
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_sync_commands_over_limit_are_folded(self):
+        """
+        Test case to verify commands over a user's rate limit still update the room and the latest one is relayed.
+
+        Steps:
+        1. Connect two clients to the same room.
+        2. Send more than USER_BURST sync commands from the first client in quick succession.
+        3. Wait for the coalescing window to end.
+        4. Assert that the last sync action received is the final command and that the room state holds its position.
+        """
+        first = self.connect()
+        second = self.connect()
+        second.get_received(NAMESPACE)
+        count = int(StreamManager.USER_BURST) + 5
+
+        for seq in range(count):
+            first.emit('sync_command', {'session_code': self.session_code, 'action': 'pause', 'currentTime': float(seq), 'seq': seq}, namespace=NAMESPACE)
+
+        socketio.sleep(StreamManager.COALESCE_WINDOW * 2)
+        actions = self.events(second, 'sync_action')
+
+        self.assertEqual(actions[-1]['seq'], count - 1)
+        self.assertEqual(stream_manager.room_registry.get(self.session_code).state.position, float(count - 1))
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+
+    def test_disconnect_leaves_room(self):
+        """
+        Test case to verify a disconnect removes the viewer from its room and the empty room is evicted once idle.
+
+        Steps:
+        1. Connect two clients to the same room and assert that the room has two members.
+        2. Disconnect both and assert that the room is empty but still tracked.
+        3. Sweep with an idle timeout of 0 and assert that the room is gone.
+        """
+        first = self.connect()
+        second = self.connect()
+        self.assertEqual(stream_manager.room_members()[self.session_code], 2)
+
+        first.disconnect(NAMESPACE)
+        second.disconnect(NAMESPACE)
+        self.assertNotIn(self.session_code, stream_manager.room_members())
+        self.assertIn(self.session_code, stream_manager.room_registry.rooms)
+
+        stream_manager.room_registry.sweep(0, now=time.monotonic() + 1)
+        self.assertNotIn(self.session_code, stream_manager.room_registry.rooms)
+
+    def test_sweep_keeps_busy_rooms(self):
+        """
+        Test case to verify the sweep only evicts rooms that are empty, idle and have nothing to relay.
+
+        Steps:
+        1. Create a room with a member, an empty room with a pending relay, an empty recent room and an empty idle room.
+        2. Sweep with an idle timeout of 60 seconds, 120 seconds later for all but the recent room.
+        3. Assert that only the empty idle room was evicted.
+        """
+        rooms = RoomRegistry()
+        rooms.join('member', 'sid-1')
+        rooms.room('pending').pending = ({}, 'sid-2')
+        rooms.room('idle')
+        now = time.monotonic() + 120
+        rooms.room('recent').last_active = now
+
+        self.assertEqual(rooms.sweep(60, now=now), 1)
+        self.assertEqual(sorted(rooms.rooms), ['member', 'pending', 'recent'])
+        self.assertEqual(rooms.disconnect('sid-1')[0].code, 'member')
+
+
+if __name__ == '__main__':
+    unittest.main()
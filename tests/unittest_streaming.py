@@ -0,0 +1,153 @@
+from src import create_app
+
+from unittest import mock
+import mmap, os, shutil, tempfile, time, unittest
+
+SEGMENT = bytes(range(256)) * 4
+PLAYLIST = b'#EXTM3U\n#EXT-X-VERSION:3\n'
+
+
+class TestStreaming(unittest.TestCase):
+    """
+    A test case class for testing the HLS blueprint.
+    """
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        movies_dir = os.path.join(self.root, 'movies')
+        os.makedirs(os.path.join(movies_dir, 'movie_1'))
+
+        with open(os.path.join(movies_dir, 'movie_1', 'master.m3u8'), 'wb') as f:
+            f.write(PLAYLIST)
+        with open(os.path.join(movies_dir, 'movie_1', 'segment_0.ts'), 'wb') as f:
+            f.write(SEGMENT)
+        with open(os.path.join(self.root, 'secret.ts'), 'wb') as f:
+            f.write(b'secret')
+
+        patcher = mock.patch('src.Streaming.MOVIES_DIR', movies_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = create_app().test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_cache_headers(self):
+        """
+        Test case to verify segments are cached as immutable and playlists only briefly.
+
+        Steps:
+        1. Fetch a segment and assert that it is returned whole with a one year immutable public lifetime and an ETag.
+        2. Fetch the playlist and assert that it has a short max-age and is not immutable.
+        """
+        response = self.client.get('/hls/movie_1/segment_0.ts')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, SEGMENT)
+        self.assertEqual(response.mimetype, 'video/mp2t')
+        self.assertEqual(response.cache_control.max_age, 31536000)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertTrue(response.cache_control.public)
+        self.assertIsNotNone(response.get_etag()[0])
+
+        response = self.client.get('/hls/movie_1/master.m3u8')
+        self.assertEqual(response.data, PLAYLIST)
+        self.assertEqual(response.mimetype, 'application/vnd.apple.mpegurl')
+        self.assertEqual(response.cache_control.max_age, 10)
+        self.assertFalse(response.cache_control.immutable)
+
+    def test_range_and_not_modified(self):
+        """
+        Test case to verify range requests get a 206 and a current copy gets a 304.
+
+        Steps:
+        1. Request bytes 100-199 of a segment and assert a 206 with those bytes and the full length in Content-Range.
+        2. Request the segment with If-None-Match set to its ETag and assert a 304 without a body.
+        3. Assert that the file mapped for the 304 and for a HEAD request was released when the response was made.
+        """
+        response = self.client.get('/hls/movie_1/segment_0.ts', headers={'Range': 'bytes=100-199'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.data, SEGMENT[100:200])
+        self.assertEqual(response.headers['Content-Range'], f'bytes 100-199/{len(SEGMENT)}')
+
+        etag = self.client.get('/hls/movie_1/segment_0.ts').headers['ETag']
+        mapped = []
+        real_mmap = mmap.mmap
+
+        def record_mmap(*args, **kwargs):
+            mapped.append(real_mmap(*args, **kwargs))
+            return mapped[-1]
+
+        with mock.patch('src.Streaming.mmap.mmap', side_effect=record_mmap):
+            response = self.client.get('/hls/movie_1/segment_0.ts', headers={'If-None-Match': etag}, buffered=False)
+            self.assertEqual(response.status_code, 304)
+            self.assertTrue(mapped[-1].closed)
+
+            response = self.client.head('/hls/movie_1/segment_0.ts', buffered=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content_length, len(SEGMENT))
+            self.assertTrue(mapped[-1].closed)
+
+        self.assertEqual(len(mapped), 2)
+
+    def test_x_accel_redirect(self):
+        """
+        Test case to verify the body is left to the reverse proxy when HLS_X_ACCEL_PREFIX is set.
+
+        Steps:
+        1. Set the X-Accel-Redirect prefix and fetch a segment.
+        2. Assert that the response names the file under the prefix, has no body and keeps the cache headers.
+        """
+        with mock.patch('src.Streaming.X_ACCEL_PREFIX', '/protected_movies/'):
+            response = self.client.get('/hls/movie_1/segment_0.ts')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Accel-Redirect'], '/protected_movies/movie_1/segment_0.ts')
+        self.assertEqual(response.data, b'')
+        self.assertTrue(response.cache_control.immutable)
+
+    def test_grant_gating(self):
+        """
+        Test case to verify that with HLS_REQUIRE_ACCESS_CODE only granted sessions are served, privately.
+
+        Steps:
+        1. Require access codes and fetch a segment without a grant; assert a 403.
+        2. Assert that the generic static handler does not serve the movies either.
+        3. Grant the movie to the session and assert that the segment is served with a private cache lifetime.
+        4. Let the grant expire and assert that the segment is refused and the grant dropped from the session.
+        """
+        with mock.patch('src.Streaming.REQUIRE_ACCESS_CODE', True):
+            self.assertEqual(self.client.get('/hls/movie_1/segment_0.ts').status_code, 403)
+            self.assertEqual(self.client.get('/static/movies/movie_1/segment_0.ts').status_code, 404)
+
+            with self.client.session_transaction() as session:
+                session['hls_grants'] = [['movie_1', time.time() + 60]]
+
+            response = self.client.get('/hls/movie_1/segment_0.ts')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.cache_control.private)
+            self.assertFalse(response.cache_control.public)
+
+            with self.client.session_transaction() as session:
+                session['hls_grants'] = [['movie_1', time.time() - 1]]
+
+            self.assertEqual(self.client.get('/hls/movie_1/segment_0.ts').status_code, 403)
+
+            with self.client.session_transaction() as session:
+                self.assertEqual(session['hls_grants'], [])
+
+    def test_unknown_files_not_found(self):
+        """
+        Test case to verify paths escaping the movies directory, unknown types and missing files get a 404.
+
+        Steps:
+        1. Fetch a segment outside the movies directory through an encoded '..' and assert a 404.
+        2. Fetch a file with an extension that is not HLS and a missing segment; assert a 404 for both.
+        """
+        self.assertEqual(self.client.get('/hls/movie_1/..%2F..%2Fsecret.ts').status_code, 404)
+        self.assertEqual(self.client.get('/hls/..%2Fsecret.ts').status_code, 404)
+        self.assertEqual(self.client.get('/hls/movie_1/notes.txt').status_code, 404)
+        self.assertEqual(self.client.get('/hls/movie_1/segment_9.ts').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+from src.DBInterfaces import InMemoryDatabase, UnitOfWork
+from src.CodeManage import CodeManage
+from tests.fixtures import make_test_app, log_in, TEST_USER_ID
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import unittest
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """
+    A test case class for testing the per-request database handle.
+    """
+    def setUp(self):
+        self.opened = []
+        self.app = make_test_app(self, 'unittest_unit_of_work')
+        self.app.config['DATABASE_FACTORY'] = self.open_database
+        CodeManage.cache.clear()
+
+    def tearDown(self):
+        CodeManage.cache.clear()
+
+    def open_database(self):
+        database = InMemoryDatabase('unittest_unit_of_work')
+        self.opened.append(database)
+        return database
+
+    def test_commits_batched(self):
+        """
+        Test case to verify commits are deferred to flush and that finish releases the handle.
+
+        Steps:
+        1. Create a unit of work over a mock database and assert that nothing is opened before the first query.
+        2. Run a query and commit twice; assert that the database was not committed yet.
+        3. Finish the unit and assert that it committed once and closed the database.
+        4. Repeat with an exception and assert that it rolled back instead.
+        """
+        for exception, committed, rolled_back in ((None, 1, 0), (RuntimeError(), 0, 1)):
+            database = mock.Mock()
+            unit = UnitOfWork(lambda: database)
+            unit.commit()
+            self.assertIsNone(unit.database)
+
+            unit.execute_query("SELECT 1")
+            unit.commit()
+            unit.commit()
+            unit.close()
+            self.assertEqual(database.commit.call_count, 0)
+            database.close.assert_not_called()
+
+            unit.finish(exception)
+            self.assertEqual(database.commit.call_count, committed)
+            self.assertEqual(database.rollback.call_count, rolled_back)
+            database.close.assert_called_once()
+
+    def test_failed_query_keeps_committed_work(self):
+        """
+        Test case to verify a failed statement rolls back only the uncommitted work and leaves the unit usable.
+
+        Steps:
+        1. Insert an access code through a unit of work and commit it.
+        2. Insert a second code without committing it, then run an invalid query and assert that it raises.
+        3. Assert that the committed code survived and the uncommitted one was rolled back.
+        4. Finish the unit and assert that the committed code is visible on another handle.
+        """
+        unit = UnitOfWork(self.open_database)
+        expires_at = datetime.now(timezone.utc) + timedelta(days=1)
+        insert = "INSERT INTO access_codes (code_id, movie_id, user_id, expires_at) VALUES (%s, %s, %s, %s)"
+        unit.execute_query(insert, ('COMMITTED', 1, TEST_USER_ID, expires_at), fetch=None)
+        unit.commit()
+        unit.execute_query(insert, ('UNCOMMITTED', 1, TEST_USER_ID, expires_at), fetch=None)
+
+        with self.assertRaises(Exception):
+            unit.execute_query("SELECT * FROM missing_table")
+
+        self.assertFalse(unit.pending)
+        self.assertEqual(unit.execute_query("SELECT code_id FROM access_codes"), [('COMMITTED',)])
+        unit.finish()
+
+        self.assertEqual(InMemoryDatabase('unittest_unit_of_work').execute_query("SELECT code_id FROM access_codes"),
+                         [('COMMITTED',)])
+
+    def test_one_handle_per_request(self):
+        """
+        Test case to verify a request opens at most one handle, and none when answered from memory.
+
+        Steps:
+        1. Log in and POST a request for an access code; assert that one handle was opened and the code committed.
+        2. Open the watch page twice; assert that the first load opened one handle and the cached one none.
+        """
+        client = self.app.test_client()
+        log_in(client)
+
+        response = client.post('/videostream/available_movies', data={'movie_id': 1, 'expiration_date': 1})
+        access_code = response.headers['Location'].rsplit('/', 1)[1]
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(InMemoryDatabase('unittest_unit_of_work').execute_query(
+            "SELECT code_id FROM access_codes")[0][0], access_code)
+
+        self.opened.clear()
+        self.assertEqual(client.get(f'/videostream/watch/{access_code}').status_code, 200)
+        self.assertEqual(len(self.opened), 1)
+
+        self.opened.clear()
+        self.assertEqual(client.get(f'/videostream/watch/{access_code}').status_code, 200)
+        self.assertEqual(len(self.opened), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
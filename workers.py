@@ -0,0 +1,40 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run several app workers on consecutive ports, sharing socket rooms through a message queue.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes (default: CPU count).")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface the workers listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=5001, help="Port of the first worker, the others use the following ports (default: 5001).")
+    parser.add_argument("--message-queue", default=os.environ.get('SOCKETIO_MESSAGE_QUEUE', 'unix://'),
+                        help="SOCKETIO_MESSAGE_QUEUE shared by the workers (default: $SOCKETIO_MESSAGE_QUEUE or unix://, a private directory in the temp dir).")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workers = []
+
+    for index in range(args.workers):
+        env = dict(os.environ, HOST=args.host, PORT=str(args.port + index), FLASK_DEBUG='0',
+                   SOCKETIO_MESSAGE_QUEUE=args.message_queue)
+        workers.append(subprocess.Popen([sys.executable, "app.py"], env=env))
+        print(f"Worker {index} listening on http://{args.host}:{args.port + index}")
+
+    def stop(signum, frame):
+        for worker in workers:
+            worker.terminate()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    exit_codes = [worker.wait() for worker in workers]
+    sys.exit(max(exit_codes, key=abs))
+
+
+if __name__ == '__main__':
+    main()